@@ -0,0 +1,126 @@
+"""baseline schema
+
+Tables as they were before migrations were introduced. Databases created by
+Base.metadata.create_all already have them, so each table is only created
+when missing and existing deployments can run alembic upgrade head as is.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 04:56:04.773782
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INTERVIEW_TYPES = ('TECHNICAL', 'BEHAVIORAL', 'SYSTEM_DESIGN', 'CASE_STUDY', 'HR_SCREENING', 'FINAL_ROUND', 'PHONE_SCREEN', 'OTHER')
+INTERVIEW_STATUSES = ('UPCOMING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED')
+PREP_SESSION_STATUSES = ('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'SKIPPED')
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('full_name', sa.String(), nullable=True),
+            sa.Column('hashed_password', sa.String(), nullable=True),
+            sa.Column('google_id', sa.String(), nullable=True),
+            sa.Column('google_access_token', sa.Text(), nullable=True),
+            sa.Column('google_refresh_token', sa.Text(), nullable=True),
+            sa.Column('google_token_expiry', sa.DateTime(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+        op.create_index('ix_users_google_id', 'users', ['google_id'], unique=True)
+    
+    if 'interviews' not in existing:
+        op.create_table(
+            'interviews',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('company', sa.String(), nullable=False),
+            sa.Column('position', sa.String(), nullable=False),
+            sa.Column('interview_type', sa.Enum(*INTERVIEW_TYPES, name='interviewtype'), nullable=False),
+            sa.Column('status', sa.Enum(*INTERVIEW_STATUSES, name='interviewstatus'), nullable=True),
+            sa.Column('scheduled_date', sa.DateTime(), nullable=False),
+            sa.Column('duration_minutes', sa.Integer(), nullable=True),
+            sa.Column('location', sa.String(), nullable=True),
+            sa.Column('meeting_link', sa.String(), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('recruiter_email', sa.String(), nullable=True),
+            sa.Column('gmail_message_id', sa.String(), nullable=True),
+            sa.Column('calendar_event_id', sa.String(), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_interviews_id', 'interviews', ['id'])
+    
+    if 'questions' not in existing:
+        op.create_table(
+            'questions',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interviews.id'), nullable=False),
+            sa.Column('question_text', sa.Text(), nullable=False),
+            sa.Column('category', sa.String(), nullable=True),
+            sa.Column('difficulty', sa.String(), nullable=True),
+            sa.Column('hints', sa.JSON(), nullable=True),
+            sa.Column('sample_answer', sa.Text(), nullable=True),
+            sa.Column('order_index', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_questions_id', 'questions', ['id'])
+    
+    if 'prep_sessions' not in existing:
+        op.create_table(
+            'prep_sessions',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interviews.id'), nullable=False),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('scheduled_start', sa.DateTime(), nullable=False),
+            sa.Column('scheduled_end', sa.DateTime(), nullable=False),
+            sa.Column('actual_start', sa.DateTime(), nullable=True),
+            sa.Column('actual_end', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.Enum(*PREP_SESSION_STATUSES, name='prepsessionstatus'), nullable=True),
+            sa.Column('calendar_event_id', sa.String(), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_prep_sessions_id', 'prep_sessions', ['id'])
+    
+    if 'performance' not in existing:
+        op.create_table(
+            'performance',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interviews.id'), nullable=False, unique=True),
+            sa.Column('prep_hours', sa.Integer(), nullable=True),
+            sa.Column('confidence_level', sa.Integer(), nullable=True),
+            sa.Column('outcome', sa.String(), nullable=True),
+            sa.Column('feedback', sa.Text(), nullable=True),
+            sa.Column('questions_practiced', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_performance_id', 'performance', ['id'])
+
+
+def downgrade():
+    for table in ('performance', 'prep_sessions', 'questions', 'interviews', 'users'):
+        op.drop_table(table)
+    for enum in ('prepsessionstatus', 'interviewstatus', 'interviewtype'):
+        op.execute(f"DROP TYPE IF EXISTS {enum}")
@@ -0,0 +1,29 @@
+"""add gmail sync checkpoint
+
+users.gmail_history_id and users.gmail_last_sync for incremental Gmail sync.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 04:56:05.479374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IF NOT EXISTS: the app's create_all may already have built a fresh users table with them
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS gmail_history_id VARCHAR")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS gmail_last_sync TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade():
+    op.drop_column('users', 'gmail_last_sync')
+    op.drop_column('users', 'gmail_history_id')
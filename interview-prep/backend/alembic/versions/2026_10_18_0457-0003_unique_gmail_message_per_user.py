@@ -0,0 +1,68 @@
+"""unique gmail message per user
+
+Merges interviews that were synced more than once from the same Gmail
+message, then adds the unique (user_id, gmail_message_id) index that Gmail
+sync's INSERT ... ON CONFLICT relies on. The oldest interview of each
+duplicate group is kept; questions and prep sessions of the others are moved
+onto it, and their performance record too unless it already has one.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 04:57:16.132221
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TEMPORARY TABLE interview_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id, user_id FROM (
+            SELECT id, user_id, min(id) OVER (PARTITION BY user_id, gmail_message_id) AS keep_id
+            FROM interviews
+            WHERE gmail_message_id IS NOT NULL
+        ) grouped
+        WHERE id <> keep_id
+    """)
+    op.execute("UPDATE questions SET interview_id = d.keep_id FROM interview_duplicates d WHERE questions.interview_id = d.id")
+    op.execute("UPDATE prep_sessions SET interview_id = d.keep_id FROM interview_duplicates d WHERE prep_sessions.interview_id = d.id")
+    # performance.interview_id is unique: keep the survivor's record, else the oldest duplicate's
+    op.execute("""
+        DELETE FROM performance USING interview_duplicates d
+        WHERE performance.interview_id = d.id
+          AND EXISTS (
+              SELECT 1 FROM performance other
+              LEFT JOIN interview_duplicates other_d ON other_d.id = other.interview_id
+              WHERE coalesce(other_d.keep_id, other.interview_id) = d.keep_id
+                AND (other.interview_id = d.keep_id OR other.id < performance.id)
+          )
+    """)
+    op.execute("UPDATE performance SET interview_id = d.keep_id FROM interview_duplicates d WHERE performance.interview_id = d.id")
+    
+    # Analytics rollups (added later in the series) may count the merged rows; drop them to be rebuilt on read
+    for table in ('user_stats', 'trend_buckets'):
+        op.execute(f"""
+            DO $$ BEGIN
+                IF to_regclass('{table}') IS NOT NULL THEN
+                    DELETE FROM {table} WHERE user_id IN (SELECT user_id FROM interview_duplicates);
+                END IF;
+            END $$
+        """)
+    
+    op.execute("DELETE FROM interviews USING interview_duplicates d WHERE interviews.id = d.id")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_interviews_user_gmail_message "
+        "ON interviews (user_id, gmail_message_id)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_interviews_user_gmail_message', table_name='interviews')
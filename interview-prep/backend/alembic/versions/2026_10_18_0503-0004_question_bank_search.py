@@ -0,0 +1,58 @@
+"""question bank search
+
+The shared question_bank table, plus a generated search_vector column with a
+GIN index so lookups preselect candidates by position instead of reading the
+most-served rows of the whole interview type.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 05:03:12.418822
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = "to_tsvector('english', coalesce(position, '') || ' ' || coalesce(category, '') || ' ' || question_text)"
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if 'question_bank' not in existing:
+        op.create_table(
+            'question_bank',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('normalized_hash', sa.String(64), nullable=False),
+            sa.Column('interview_type', postgresql.ENUM(name='interviewtype', create_type=False), nullable=False),
+            sa.Column('position', sa.String(), nullable=True),
+            sa.Column('question_text', sa.Text(), nullable=False),
+            sa.Column('category', sa.String(), nullable=True),
+            sa.Column('difficulty', sa.String(), nullable=True),
+            sa.Column('hints', sa.JSON(), nullable=True),
+            sa.Column('sample_answer', sa.Text(), nullable=True),
+            sa.Column('times_served', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_question_bank_id', 'question_bank', ['id'])
+        op.create_index('ix_question_bank_interview_type', 'question_bank', ['interview_type'])
+        op.create_index('ix_question_bank_type_hash', 'question_bank', ['interview_type', 'normalized_hash'], unique=True)
+    
+    # IF NOT EXISTS: a table built by the app's create_all may already have both
+    op.execute(
+        "ALTER TABLE question_bank ADD COLUMN IF NOT EXISTS search_vector TSVECTOR "
+        f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_question_bank_search ON question_bank USING gin (search_vector)")
+
+
+def downgrade():
+    op.drop_index('ix_question_bank_search', table_name='question_bank')
+    op.drop_column('question_bank', 'search_vector')
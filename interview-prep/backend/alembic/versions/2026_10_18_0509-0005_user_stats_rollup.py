@@ -0,0 +1,45 @@
+"""user stats rollup
+
+Per-user analytics rollup read by the dashboard. Rows are built lazily from
+raw interviews on a user's first read, then kept current by flush deltas.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 05:09:41.206115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if 'user_stats' in existing:
+        # Built by create_all under code that started rows from a user's first change
+        # rather than from all of their interviews; drop them so reads rebuild them
+        op.execute("DELETE FROM user_stats")
+        return
+    
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_interviews', sa.Integer(), nullable=False),
+        sa.Column('completed_interviews', sa.Integer(), nullable=False),
+        sa.Column('total_prep_hours', sa.Integer(), nullable=False),
+        sa.Column('confidence_sum', sa.Integer(), nullable=False),
+        sa.Column('confidence_count', sa.Integer(), nullable=False),
+        sa.Column('passed_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('user_stats')
@@ -0,0 +1,49 @@
+"""trend buckets
+
+Weekly and monthly per-type analytics series read by /api/analytics/trends.
+Like user_stats, a user's buckets are built on first read and then kept
+current by flush deltas.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 05:10:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if 'trend_buckets' in existing:
+        # Same as user_stats in 0005: rows may be partial, and reads rebuild them
+        op.execute("DELETE FROM trend_buckets")
+        return
+    
+    op.create_table(
+        'trend_buckets',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('period', sa.String(8), nullable=False),
+        sa.Column('bucket_start', sa.Date(), nullable=False),
+        sa.Column('interview_type', postgresql.ENUM(name='interviewtype', create_type=False), nullable=False),
+        sa.Column('total_interviews', sa.Integer(), nullable=False),
+        sa.Column('completed_interviews', sa.Integer(), nullable=False),
+        sa.Column('total_prep_hours', sa.Integer(), nullable=False),
+        sa.Column('confidence_sum', sa.Integer(), nullable=False),
+        sa.Column('confidence_count', sa.Integer(), nullable=False),
+        sa.Column('passed_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'period', 'bucket_start', 'interview_type'),
+    )
+
+
+def downgrade():
+    op.drop_table('trend_buckets')
@@ -0,0 +1,36 @@
+"""pagination indexes
+
+Composite (user_id, date, id) indexes that keyset pagination of interviews
+and prep sessions walks, so deep pages are index range scans.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 05:19:26.904317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IF NOT EXISTS: the app's create_all may already have built them on fresh tables
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_interviews_user_date_id "
+        "ON interviews (user_id, scheduled_date, id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_prep_sessions_user_start_id "
+        "ON prep_sessions (user_id, scheduled_start, id)"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_prep_sessions_user_start_id', table_name='prep_sessions')
+    op.drop_index('ix_interviews_user_date_id', table_name='interviews')
@@ -0,0 +1,28 @@
+"""prep session calendar etag
+
+prep_sessions.calendar_etag, the event ETag that rescheduling sends as
+If-Match so edits made directly in the calendar are not overwritten.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 05:30:12.418206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IF NOT EXISTS: the app's create_all may already have built a fresh prep_sessions table with it
+    op.execute("ALTER TABLE prep_sessions ADD COLUMN IF NOT EXISTS calendar_etag VARCHAR")
+
+
+def downgrade():
+    op.drop_column('prep_sessions', 'calendar_etag')
@@ -1,17 +1,25 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.database import get_db, get_async_db
+from app.passwords import pwd_context
 from app.config import settings
 from app import models, schemas
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Columns kept in models.user_cache; secrets (password hash, Google tokens) are never cached
+CACHED_USER_COLUMNS = (
+    "id", "email", "full_name", "google_id", "is_active",
+    "gmail_history_id", "gmail_last_sync", "created_at", "updated_at",
+)
+CACHED_DATETIME_COLUMNS = {"gmail_last_sync", "created_at", "updated_at"}
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -19,7 +27,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
+    """Hash a password (blocking; request handlers use app.passwords instead)"""
     return pwd_context.hash(password)
 
 
@@ -35,31 +43,108 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
-    """Get the current authenticated user"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token(token: str) -> schemas.TokenData:
+    """Read the user id (or, for old tokens, the email) from a JWT, raising 401 if it is invalid"""
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        subject: str = payload.get("sub")
+        if subject is None:
             raise credentials_exception
-        token_data = schemas.TokenData(email=email)
+        if subject.isdigit():
+            token_data = schemas.TokenData(user_id=int(subject))
+        else:
+            # Tokens issued before the subject carried the user id
+            token_data = schemas.TokenData(email=subject)
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    return token_data
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+    """Get the current authenticated user"""
+    token_data = decode_token(token)
+    if token_data.user_id is not None:
+        user = get_user_by_id(db, token_data.user_id)
+    else:
+        user = db.query(models.User).filter(models.User.email == token_data.email).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """Get the current authenticated user on the event loop, for async route handlers"""
+    token_data = decode_token(token)
+    if token_data.user_id is not None:
+        cached = _cached_user(token_data.user_id)
+        if cached is not None:
+            return await db.merge(cached, load=False)
+        user = await db.get(models.User, token_data.user_id)
+        if user is not None:
+            _cache_user(user)
+    else:
+        result = await db.execute(select(models.User).filter(models.User.email == token_data.email))
+        user = result.scalars().first()
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def get_user_by_id(db: Session, user_id: int) -> Optional[models.User]:
+    """Load a user by primary key, using the user cache to skip the SELECT"""
+    cached = _cached_user(user_id)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    
+    user = db.get(models.User, user_id)
+    if user is not None:
+        _cache_user(user)
+    return user
+
+
+def _cached_user(user_id: int) -> Optional[models.User]:
+    """A detached User built from the user cache, or None on a miss"""
+    cached = models.user_cache.get(str(user_id))
+    if cached is None:
+        return None
+    user = models.User(**{
+        column: datetime.fromisoformat(value) if column in CACHED_DATETIME_COLUMNS and value else value
+        for column, value in cached.items()
+    })
+    # Attach without a SELECT; columns left out of the cache are expired and load on first access
+    make_transient_to_detached(user)
+    return user
+
+
+def _cache_user(user: models.User):
+    models.user_cache.set(str(user.id), {
+        column: value.isoformat() if isinstance(value, datetime) else value
+        for column, value in ((column, getattr(user, column)) for column in CACHED_USER_COLUMNS)
+    })
+
+
 def get_current_active_user(current_user: models.User = Depends(get_current_user)) -> models.User:
     """Get the current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+
+async def get_current_active_user_async(current_user: models.User = Depends(get_current_user_async)) -> models.User:
+    """Get the current active user, for async route handlers"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """In-process LRU cache with per-entry TTL"""
+    
+    def __init__(self, namespace: str, max_entries: int = 1024, ttl_seconds: int = 300):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        expires_at = time.monotonic() + (ttl_seconds or self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries)
+        }
+
+
+class RedisCache:
+    """Redis-backed cache shared across API processes and workers"""
+    
+    def __init__(self, namespace: str, url: str, ttl_seconds: int = 300):
+        import redis
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.client = redis.Redis.from_url(url)
+    
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        try:
+            self.client.set(self._key(key), json.dumps(value, default=str), ex=ttl_seconds or self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {e}")
+    
+    def delete(self, key: str):
+        try:
+            self.client.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+_caches: Dict[str, Any] = {}
+
+
+def get_cache(namespace: str, backend: Optional[str] = None, ttl_seconds: int = 300, max_entries: int = 1024):
+    """Get (or create) the cache for a namespace, using CACHE_BACKEND unless overridden"""
+    if namespace not in _caches:
+        backend = backend or settings.CACHE_BACKEND
+        if backend == "redis":
+            _caches[namespace] = RedisCache(namespace, settings.REDIS_URL, ttl_seconds)
+        else:
+            _caches[namespace] = MemoryCache(namespace, max_entries, ttl_seconds)
+    return _caches[namespace]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters for every cache created in this process"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
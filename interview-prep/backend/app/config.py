@@ -16,16 +16,33 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_REDIRECT_URI: str = "http://localhost:3000/auth/callback"
     
+    # Gmail
+    GMAIL_BATCH_SIZE: int = 50  # Messages fetched per batch HTTP request (max 100)
+    GMAIL_BODY_MAX_BYTES: int = 32 * 1024  # Body bytes decoded per email; the rest is never decoded
+    
+    # Calendar (prep blocks are placed inside these UTC hours when free)
+    PREP_PREFERRED_START_HOUR: int = 19
+    PREP_PREFERRED_END_HOUR: int = 22
+    
+    # Bulk import/export
+    BULK_BATCH_SIZE: int = 500  # Rows inserted per statement / fetched per export batch
+    
     # JWT
     SECRET_KEY: str = "default-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (bcrypt cost is per environment; lower it in dev/test)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
     # App Settings
     APP_NAME: str = "Interview Prep Tool"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
     FRONTEND_URL: str = "http://localhost:3000"
+    QUERY_BUDGET_PER_REQUEST: int = 20  # Requests issuing more SQL statements are logged as likely N+1
     
     # Mock Mode
     MOCK_MODE: bool = True
@@ -33,6 +50,20 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Caching ("memory" for in-process LRU, "redis" to share via REDIS_URL)
+    CACHE_BACKEND: str = "memory"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Shared question bank lookup
+    QUESTION_BANK_CANDIDATES: int = 500
+    QUESTION_BANK_MIN_SCORE: float = 0.2
+    
+    # Background jobs (eager mode runs tasks in-process without Redis)
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,8 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from app.cache import cache_stats
 from app.config import settings
+from app import passwords
+from app.pagination import NEXT_CURSOR_HEADER
+from app.query_counter import QUERY_COUNT_HEADER, count_queries
 from app.database import engine, Base
-from app.routers import auth, interviews, prep_sessions, analytics
+from app.routers import auth, interviews, prep_sessions, analytics, jobs
+from app.services.ai_service import ai_service
+from app.services.gmail_service import fetch_stats
 import logging
 
 # Configure logging
@@ -28,13 +34,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER],
 )
 
+
+@app.middleware("http")
+async def query_count_middleware(request: Request, call_next):
+    """Count SQL queries per request; report them in debug mode and log requests over budget"""
+    with count_queries() as counter:
+        response = await call_next(request)
+    
+    if settings.DEBUG:
+        response.headers[QUERY_COUNT_HEADER] = str(counter.count)
+    if counter.count > settings.QUERY_BUDGET_PER_REQUEST:
+        logging.warning(
+            f"{request.method} {request.url.path} issued {counter.count} queries "
+            f"(budget {settings.QUERY_BUDGET_PER_REQUEST}); possible N+1"
+        )
+    return response
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(interviews.router)
 app.include_router(prep_sessions.router)
 app.include_router(analytics.router)
+app.include_router(jobs.router)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release worker processes and the OpenAI connection pools on shutdown"""
+    passwords.shutdown()
+    await ai_service.aclose()
 
 
 @app.get("/")
@@ -50,7 +82,7 @@ def root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "cache": cache_stats(), "gmail_fetch": fetch_stats()}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""
+Maintenance commands
+
+Usage:
+    python -m app.manage rebuild-user-stats [--user-id ID]
+    python -m app.manage check-user-stats [--user-id ID]
+"""
+import argparse
+import sys
+from app.database import SessionLocal
+from app import models
+from app.services.analytics_service import AnalyticsService
+
+
+def _user_ids(db, user_id=None):
+    if user_id is not None:
+        return [user_id]
+    return [row.id for row in db.query(models.User.id).order_by(models.User.id)]
+
+
+def rebuild_user_stats(user_id=None) -> int:
+    """Recompute user_stats and trend_buckets rollups from raw interview and performance rows"""
+    db = SessionLocal()
+    try:
+        analytics = AnalyticsService(db)
+        user_ids = _user_ids(db, user_id)
+        for uid in user_ids:
+            analytics.rebuild_user_stats(uid)
+        db.commit()
+        print(f"Rebuilt user_stats and trend_buckets for {len(user_ids)} users")
+        return 0
+    finally:
+        db.close()
+
+
+def check_user_stats(user_id=None) -> int:
+    """Report users whose rollup disagrees with a full recompute"""
+    db = SessionLocal()
+    try:
+        analytics = AnalyticsService(db)
+        mismatched = 0
+        for uid in _user_ids(db, user_id):
+            diff = analytics.check_user_stats(uid)
+            if diff:
+                mismatched += 1
+                details = ", ".join(f"{field}: rollup={stored} actual={actual}" for field, (stored, actual) in diff.items())
+                print(f"user {uid}: {details}")
+        print(f"{mismatched} users with inconsistent rollups")
+        return 1 if mismatched else 0
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Interview Prep maintenance commands")
+    parser.add_argument("command", choices=["rebuild-user-stats", "check-user-stats"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    if args.command == "rebuild-user-stats":
+        return rebuild_user_stats(args.user_id)
+    return check_user_stats(args.user_id)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Enum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Text, Enum, JSON, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session, relationship
 from datetime import datetime
+from app.cache import get_cache
+from app.config import settings
 from app.database import Base
 import enum
 
@@ -41,6 +45,8 @@ class User(Base):
     google_access_token = Column(Text, nullable=True)
     google_refresh_token = Column(Text, nullable=True)
     google_token_expiry = Column(DateTime, nullable=True)
+    gmail_history_id = Column(String, nullable=True)  # Checkpoint for incremental Gmail sync
+    gmail_last_sync = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -76,6 +82,11 @@ class Interview(Base):
     questions = relationship("Question", back_populates="interview", cascade="all, delete-orphan")
     prep_sessions = relationship("PrepSession", back_populates="interview", cascade="all, delete-orphan")
     performance = relationship("Performance", back_populates="interview", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_interviews_user_gmail_message", "user_id", "gmail_message_id", unique=True),
+        Index("ix_interviews_user_date_id", "user_id", "scheduled_date", "id"),
+    )
 
 
 class Question(Base):
@@ -95,6 +106,36 @@ class Question(Base):
     interview = relationship("Interview", back_populates="questions")
 
 
+class QuestionBankEntry(Base):
+    """Deduplicated question shared across interviews, served before calling the LLM"""
+    __tablename__ = "question_bank"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    normalized_hash = Column(String(64), nullable=False)
+    interview_type = Column(Enum(InterviewType), nullable=False, index=True)
+    position = Column(String, nullable=True)
+    question_text = Column(Text, nullable=False)
+    category = Column(String, nullable=True)
+    difficulty = Column(String, nullable=True)
+    hints = Column(JSON, nullable=True)
+    sample_answer = Column(Text, nullable=True)
+    times_served = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Full-text document for preselecting candidates by position before TF-IDF scoring
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(position, '') || ' ' || coalesce(category, '') || ' ' || question_text)",
+            persisted=True
+        )
+    )
+    
+    __table_args__ = (
+        Index("ix_question_bank_type_hash", "interview_type", "normalized_hash", unique=True),
+        Index("ix_question_bank_search", "search_vector", postgresql_using="gin"),
+    )
+
+
 class PrepSession(Base):
     __tablename__ = "prep_sessions"
     
@@ -108,6 +149,7 @@ class PrepSession(Base):
     actual_end = Column(DateTime, nullable=True)
     status = Column(Enum(PrepSessionStatus), default=PrepSessionStatus.SCHEDULED)
     calendar_event_id = Column(String, nullable=True)
+    calendar_etag = Column(String, nullable=True)  # ETag of the event as last written, for conditional updates
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -115,6 +157,10 @@ class PrepSession(Base):
     # Relationships
     user = relationship("User", back_populates="prep_sessions")
     interview = relationship("Interview", back_populates="prep_sessions")
+    
+    __table_args__ = (
+        Index("ix_prep_sessions_user_start_id", "user_id", "scheduled_start", "id"),
+    )
 
 
 class Performance(Base):
@@ -133,3 +179,64 @@ class Performance(Base):
     # Relationships
     interview = relationship("Interview", back_populates="performance")
 
+
+class UserStats(Base):
+    """Per-user analytics rollup, maintained incrementally on Interview/Performance flushes"""
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_interviews = Column(Integer, nullable=False, default=0)
+    completed_interviews = Column(Integer, nullable=False, default=0)
+    total_prep_hours = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Integer, nullable=False, default=0)
+    confidence_count = Column(Integer, nullable=False, default=0)
+    passed_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TrendBucket(Base):
+    """Weekly/monthly per-type analytics series, maintained incrementally like UserStats"""
+    __tablename__ = "trend_buckets"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(8), primary_key=True)  # week, month
+    bucket_start = Column(Date, primary_key=True)
+    interview_type = Column(Enum(InterviewType), primary_key=True)
+    total_interviews = Column(Integer, nullable=False, default=0)
+    completed_interviews = Column(Integer, nullable=False, default=0)
+    total_prep_hours = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Integer, nullable=False, default=0)
+    confidence_count = Column(Integer, nullable=False, default=0)
+    passed_count = Column(Integer, nullable=False, default=0)
+
+
+# Short-lived cache of user rows keyed by id, read by app.auth. The invalidation
+# listeners live here rather than in app.auth so that every process writing users,
+# the Celery worker included, drops stale entries.
+user_cache = get_cache("users", ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """Drop a user from the user cache"""
+    user_cache.delete(str(user_id))
+
+
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("user_cache_invalidations", set()).add(target.id)
+
+
+event.listen(User, "after_update", _mark_user_changed)
+event.listen(User, "after_delete", _mark_user_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_after_commit(session):
+    for user_id in session.info.pop("user_cache_invalidations", set()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_invalidations(session):
+    session.info.pop("user_cache_invalidations", None)
@@ -0,0 +1,98 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple, Type
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode a (sort value, id) position as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{sort_value.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor; anything else is a 400"""
+    try:
+        sort_value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        position = datetime.fromisoformat(sort_value), int(row_id)
+        # Sort values are stored as naive UTC, so encode_cursor never writes an offset
+        if position[0].tzinfo is not None:
+            raise ValueError("Cursor has a UTC offset")
+        return position
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel], required: Tuple[str, ...]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= parameter against a response schema"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    # The sort columns are always selected so the next cursor can be built
+    return list(dict.fromkeys([*required, *requested]))
+
+
+def paginate(
+    query: Query,
+    model,
+    sort_column,
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    fields: Optional[List[str]] = None
+):
+    """
+    Keyset-paginate a query ordered by (sort_column, id)
+    
+    Args:
+        query: Filtered query over model
+        model: Mapped class being listed
+        sort_column: Column the listing is ordered by (ties broken by id)
+        response: Response to attach the next cursor header to
+        limit: Page size
+        cursor: Cursor from a previous page's X-Next-Cursor header
+        skip: Legacy offset, used only when no cursor is given
+        fields: Columns to select; None returns full objects
+    
+    Returns:
+        ORM objects, or a JSONResponse of plain rows when fields is set
+    """
+    if fields:
+        query = query.with_entities(*(getattr(model, field) for field in fields))
+    
+    query = query.order_by(sort_column, model.id)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, model.id) > tuple_(sort_value, row_id))
+    elif skip:
+        query = query.offset(skip)
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, sort_column.key), last.id)
+    
+    if fields:
+        return JSONResponse(jsonable_encoder([dict(row._mapping) for row in rows]), headers=headers)
+    
+    response.headers.update(headers)
+    return rows
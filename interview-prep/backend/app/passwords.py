@@ -0,0 +1,78 @@
+"""
+Password hashing off the event loop
+
+bcrypt is ~250 ms of CPU per call at the default cost, so hashing runs in a small
+dedicated process pool. Callers beyond PASSWORD_HASH_MAX_PENDING get a 503 instead
+of queueing behind a login burst and starving every other endpoint.
+"""
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.config import settings
+
+# Pinning min/max rounds to the configured cost makes verify_and_update flag hashes made at any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def hash_password_sync(password: str) -> str:
+    """Hash a password in the current process"""
+    return pwd_context.hash(password)
+
+
+def verify_and_update_sync(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also returns a new hash if the stored one uses an outdated cost"""
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        return _executor
+
+
+async def _run(func, *args):
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending.release()
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password in the password process pool"""
+    return await _run(hash_password_sync, password)
+
+
+async def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify (and possibly re-hash) a password in the password process pool"""
+    return await _run(verify_and_update_sync, password, hashed_password)
+
+
+def shutdown():
+    """Stop the password process pool"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
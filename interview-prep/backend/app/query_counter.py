@@ -0,0 +1,55 @@
+"""
+Per-request SQL query counting, used to catch N+1 query patterns
+
+Every statement executed on any engine increments the counter active in the
+current context. The HTTP middleware opens one counter per request; tests can
+wrap a block in query_budget(n) to fail when it issues more than n queries.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCounter:
+    """Mutable counter, so increments made in threadpool workers are visible to the request"""
+    
+    def __init__(self):
+        self.count = 0
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block issues more queries than its budget allows"""
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+@contextmanager
+def count_queries():
+    """Count the queries issued inside the block"""
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Fail if the block issues more than max_queries queries"""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise QueryBudgetExceeded(f"Issued {counter.count} queries, budget is {max_queries}")
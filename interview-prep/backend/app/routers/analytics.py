@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.database import get_db
 from app import models, schemas, auth
-from datetime import datetime, timedelta
+from app.services.analytics_service import AnalyticsService
+from datetime import date, datetime
+from typing import Optional
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
@@ -14,64 +15,18 @@ def get_dashboard_stats(
     db: Session = Depends(get_db)
 ):
     """Get dashboard statistics for the current user"""
-    
-    # Total interviews
-    total_interviews = db.query(func.count(models.Interview.id)).filter(
-        models.Interview.user_id == current_user.id
-    ).scalar()
-    
-    # Upcoming interviews
-    upcoming_interviews = db.query(func.count(models.Interview.id)).filter(
-        models.Interview.user_id == current_user.id,
-        models.Interview.status == models.InterviewStatus.UPCOMING,
-        models.Interview.scheduled_date > datetime.utcnow()
-    ).scalar()
-    
-    # Completed interviews
-    completed_interviews = db.query(func.count(models.Interview.id)).filter(
-        models.Interview.user_id == current_user.id,
-        models.Interview.status == models.InterviewStatus.COMPLETED
-    ).scalar()
-    
-    # Total prep hours
-    total_prep_hours = db.query(func.sum(models.Performance.prep_hours)).filter(
-        models.Performance.interview_id.in_(
-            db.query(models.Interview.id).filter(
-                models.Interview.user_id == current_user.id
-            )
-        )
-    ).scalar() or 0
-    
-    # Average confidence
-    avg_confidence = db.query(func.avg(models.Performance.confidence_level)).filter(
-        models.Performance.interview_id.in_(
-            db.query(models.Interview.id).filter(
-                models.Interview.user_id == current_user.id
-            )
-        )
-    ).scalar()
-    
-    # Success rate (passed / total completed)
-    passed_count = db.query(func.count(models.Performance.id)).filter(
-        models.Performance.interview_id.in_(
-            db.query(models.Interview.id).filter(
-                models.Interview.user_id == current_user.id,
-                models.Interview.status == models.InterviewStatus.COMPLETED
-            )
-        ),
-        models.Performance.outcome == 'passed'
-    ).scalar()
-    
-    success_rate = (passed_count / completed_interviews * 100) if completed_interviews > 0 else None
-    
-    return schemas.DashboardStats(
-        total_interviews=total_interviews,
-        upcoming_interviews=upcoming_interviews,
-        completed_interviews=completed_interviews,
-        total_prep_hours=total_prep_hours,
-        avg_confidence=float(avg_confidence) if avg_confidence else None,
-        success_rate=success_rate
-    )
+    return AnalyticsService(db).get_dashboard_stats(current_user.id)
+
+
+@router.get("/trends", response_model=schemas.TrendsResponse)
+def get_trends(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get weekly and monthly interview trends per interview type"""
+    return AnalyticsService(db).get_trends(current_user.id, start_date, end_date)
 
 
 @router.get("/performance/{interview_id}", response_model=schemas.PerformanceResponse)
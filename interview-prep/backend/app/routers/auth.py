@@ -1,11 +1,13 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from app.database import get_db
-from app import models, schemas, auth
+from app.database import get_db, get_async_db
+from app import models, schemas, auth, passwords
 from app.config import settings
 import logging
 
@@ -14,11 +16,11 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if existing_user:
+    result = await db.execute(select(models.User).filter(models.User.email == user.email))
+    if result.scalars().first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -28,19 +30,20 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db_user = models.User(
         email=user.email,
         full_name=user.full_name,
-        hashed_password=auth.get_password_hash(user.password) if user.password else None
+        hashed_password=await passwords.hash_password(user.password) if user.password else None
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Login with email and password"""
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    result = await db.execute(select(models.User).filter(models.User.email == form_data.username))
+    user = result.scalars().first()
     
     if not user or not user.hashed_password:
         raise HTTPException(
@@ -49,16 +52,22 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not auth.verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await passwords.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently re-hash when BCRYPT_ROUNDS has changed since the hash was made
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": str(user.id)}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -162,7 +171,7 @@ def google_callback(code: str, db: Session = Depends(get_db)):
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth.create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
+            data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
         return {"access_token": access_token, "token_type": "bearer"}
@@ -1,46 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from app.config import settings
+from app.database import get_db, get_async_db, AsyncSessionLocal
 from app import models, schemas, auth
-from app.services.gmail_service import GmailService
-from app.services.calendar_service import CalendarService
-from app.services.ai_service import AIService
-from google.oauth2.credentials import Credentials
+from app.pagination import paginate, parse_fields
+from app.services.ai_service import ai_service
+from app.services.bulk_io import (
+    BulkInterviewImporter,
+    iter_csv_records,
+    iter_lines,
+    iter_ndjson_records,
+    stream_interviews
+)
+from app.services.calendar_service import to_naive_utc
+from app.services.interview_service import InterviewService, build_questions
+from app.services.question_bank_service import AsyncQuestionBankService, QuestionBankService
+from app.worker import enqueue, sync_from_gmail_task, generate_questions_task, schedule_prep_task
 from datetime import datetime
+import json
 import logging
 
 router = APIRouter(prefix="/api/interviews", tags=["interviews"])
 logger = logging.getLogger(__name__)
 
 
-def get_user_credentials(user: models.User) -> Credentials:
-    """Get Google credentials for user"""
-    if not user.google_access_token:
-        return None
-    
-    return Credentials(
-        token=user.google_access_token,
-        refresh_token=user.google_refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=user.google_id,
-        client_secret=""
-    )
-
-
 @router.get("/", response_model=List[schemas.InterviewResponse])
 def get_interviews(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status_filter: Optional[models.InterviewStatus] = Query(None, alias="status"),
+    interview_type: Optional[models.InterviewType] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
     current_user: models.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all interviews for the current user"""
-    interviews = db.query(models.Interview).filter(
+    """Get interviews for the current user, ordered by date; pass X-Next-Cursor back as cursor for the next page"""
+    query = db.query(models.Interview).filter(
         models.Interview.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    )
+    if status_filter:
+        query = query.filter(models.Interview.status == status_filter)
+    if interview_type:
+        query = query.filter(models.Interview.interview_type == interview_type)
+    if date_from:
+        query = query.filter(models.Interview.scheduled_date >= date_from)
+    if date_to:
+        query = query.filter(models.Interview.scheduled_date <= date_to)
     
-    return interviews
+    return paginate(
+        query,
+        models.Interview,
+        models.Interview.scheduled_date,
+        response,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        fields=parse_fields(fields, schemas.InterviewResponse, ("id", "scheduled_date"))
+    )
+
+
+@router.post("/bulk")
+async def import_interviews(
+    request: Request,
+    current_user: models.User = Depends(auth.get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Import interviews from a streamed NDJSON or CSV body; invalid rows are reported, not inserted"""
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        parse_records = iter_csv_records
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        parse_records = iter_ndjson_records
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv"
+        )
+    
+    importer = BulkInterviewImporter(db, current_user.id, settings.BULK_BATCH_SIZE)
+    try:
+        async for row_number, record in parse_records(iter_lines(request.stream())):
+            await importer.add(row_number, record)
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be UTF-8 encoded"
+        )
+    
+    return await importer.finish()
+
+
+@router.get("/bulk")
+def export_interviews(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Stream all of the current user's interviews as NDJSON or CSV"""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_interviews(current_user.id, export_format, settings.BULK_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="interviews.{export_format}"'}
+    )
 
 
 @router.get("/{interview_id}", response_model=schemas.InterviewWithQuestions)
@@ -49,8 +119,13 @@ def get_interview(
     current_user: models.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get a specific interview with questions"""
-    interview = db.query(models.Interview).filter(
+    """Get a specific interview with questions, prep sessions and performance"""
+    # Load every relationship up front: one query per collection instead of one per lazy access
+    interview = db.query(models.Interview).options(
+        selectinload(models.Interview.questions),
+        selectinload(models.Interview.prep_sessions),
+        joinedload(models.Interview.performance)
+    ).filter(
         models.Interview.id == interview_id,
         models.Interview.user_id == current_user.id
     ).first()
@@ -82,7 +157,7 @@ def create_interview(
     return db_interview
 
 
-@router.put("/{interview_id}", response_model=schemas.InterviewResponse)
+@router.put("/{interview_id}", response_model=schemas.InterviewUpdateResponse)
 def update_interview(
     interview_id: int,
     interview_update: schemas.InterviewUpdate,
@@ -103,14 +178,28 @@ def update_interview(
     
     # Update fields
     update_data = interview_update.dict(exclude_unset=True)
+    if update_data.get("scheduled_date"):
+        # Stored dates are naive UTC; an offset in the request would make the shift below fail
+        update_data["scheduled_date"] = to_naive_utc(update_data["scheduled_date"])
+    previous_date = db_interview.scheduled_date
     for field, value in update_data.items():
         setattr(db_interview, field, value)
     
     db_interview.updated_at = datetime.utcnow()
     db.commit()
+    
+    # Keep prep sessions at the same distance from the interview. The calendar is
+    # only patched once the new date is committed.
+    calendar_failures = []
+    if update_data.get("scheduled_date") and db_interview.scheduled_date != previous_date:
+        calendar_failures = InterviewService(db).reschedule_prep(
+            db_interview, current_user, db_interview.scheduled_date - previous_date
+        )["calendar_failures"]
     db.refresh(db_interview)
     
-    return db_interview
+    response = schemas.InterviewUpdateResponse.model_validate(db_interview)
+    response.calendar_failures = calendar_failures
+    return response
 
 
 @router.delete("/{interview_id}")
@@ -137,18 +226,23 @@ def delete_interview(
     return {"message": "Interview deleted successfully"}
 
 
-@router.post("/{interview_id}/questions", response_model=List[schemas.QuestionResponse])
-def generate_questions(
+@router.post("/{interview_id}/questions", response_model=Union[List[schemas.QuestionResponse], schemas.JobResponse])
+async def generate_questions(
     interview_id: int,
     num_questions: int = 10,
-    current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    background: bool = False,
+    use_cache: bool = True,
+    current_user: models.User = Depends(auth.get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate AI-powered questions for an interview"""
-    interview = db.query(models.Interview).filter(
-        models.Interview.id == interview_id,
-        models.Interview.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.Interview).filter(
+            models.Interview.id == interview_id,
+            models.Interview.user_id == current_user.id
+        )
+    )
+    interview = result.scalars().first()
     
     if not interview:
         raise HTTPException(
@@ -156,83 +250,147 @@ def generate_questions(
             detail="Interview not found"
         )
     
-    # Generate questions using AI
-    ai_service = AIService()
-    questions_data = ai_service.generate_questions(
-        interview_type=interview.interview_type,
-        position=interview.position,
-        company=interview.company,
-        num_questions=num_questions
-    )
+    if background:
+        job = enqueue(generate_questions_task, current_user.id, interview_id, num_questions, use_cache)
+        return schemas.JobResponse(job_id=job.id, status=job.status)
     
-    # Save questions to database
-    db_questions = []
-    for idx, q_data in enumerate(questions_data):
-        db_question = models.Question(
-            interview_id=interview_id,
-            question_text=q_data['question_text'],
-            category=q_data['category'],
-            difficulty=q_data['difficulty'],
-            hints=q_data['hints'],
-            sample_answer=q_data['sample_answer'],
-            order_index=idx
+    # Serve matching questions from the shared bank, then generate only the shortfall
+    questions_data = []
+    if use_cache:
+        questions_data = await AsyncQuestionBankService(db).find_questions(
+            interview.interview_type, interview.position, num_questions, interview_id
         )
-        db.add(db_question)
-        db_questions.append(db_question)
     
-    db.commit()
+    shortfall = num_questions - len(questions_data)
+    if shortfall > 0:
+        # Generate questions on the event loop instead of holding a threadpool thread
+        generated = await ai_service.agenerate_questions(
+            interview_type=interview.interview_type,
+            position=interview.position,
+            company=interview.company,
+            num_questions=shortfall,
+            use_cache=use_cache
+        )
+        await db.run_sync(
+            lambda session: QuestionBankService(session).add_questions(
+                generated, interview.interview_type, interview.position
+            )
+        )
+        questions_data += generated
+    
+    db_questions = build_questions(interview_id, questions_data)
+    db.add_all(db_questions)
+    await db.commit()
     for q in db_questions:
-        db.refresh(q)
+        await db.refresh(q)
     
     return db_questions
 
 
+@router.post("/{interview_id}/questions/stream")
+async def stream_questions(
+    interview_id: int,
+    num_questions: int = 10,
+    use_cache: bool = True,
+    current_user: models.User = Depends(auth.get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream AI-generated questions as server-sent events, saving each one as it arrives"""
+    result = await db.execute(
+        select(models.Interview).filter(
+            models.Interview.id == interview_id,
+            models.Interview.user_id == current_user.id
+        )
+    )
+    interview = result.scalars().first()
+    
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    interview_type, position, company = interview.interview_type, interview.position, interview.company
+    
+    async def event_stream():
+        # The request-scoped session is closed before the body streams, so use a dedicated one
+        async with AsyncSessionLocal() as session:
+            count = 0
+            
+            async def save(q_data: dict) -> str:
+                db_question = build_questions(interview_id, [q_data], start_index=count)[0]
+                session.add(db_question)
+                await session.commit()
+                await session.refresh(db_question)
+                payload = schemas.QuestionResponse.model_validate(db_question).model_dump_json()
+                return f"event: question\ndata: {payload}\n\n"
+            
+            banked = []
+            if use_cache:
+                banked = await AsyncQuestionBankService(session).find_questions(
+                    interview_type, position, num_questions, interview_id
+                )
+            for q_data in banked:
+                yield await save(q_data)
+                count += 1
+            
+            generated = []
+            if count < num_questions:
+                async for q_data in ai_service.astream_questions(
+                    interview_type=interview_type,
+                    position=position,
+                    company=company,
+                    num_questions=num_questions - count,
+                    use_cache=use_cache
+                ):
+                    generated.append(q_data)
+                    yield await save(q_data)
+                    count += 1
+            
+            if generated:
+                await session.run_sync(
+                    lambda sync_session: QuestionBankService(sync_session).add_questions(
+                        generated, interview_type, position
+                    )
+                )
+                await session.commit()
+            
+            yield f"event: done\ndata: {json.dumps({'count': count})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/sync-from-gmail")
 def sync_interviews_from_gmail(
+    background: bool = False,
     current_user: models.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Sync interviews from Gmail"""
-    credentials = get_user_credentials(current_user)
-    gmail_service = GmailService(credentials)
-    
-    emails = gmail_service.get_interview_emails()
-    
-    synced_count = 0
-    for email_data in emails:
-        # Check if interview already exists
-        existing = db.query(models.Interview).filter(
-            models.Interview.gmail_message_id == email_data['message_id']
-        ).first()
-        
-        if not existing and email_data.get('interview_date'):
-            interview = models.Interview(
-                user_id=current_user.id,
-                company=email_data['company'],
-                position=email_data['position'],
-                interview_type=email_data['interview_type'],
-                scheduled_date=email_data['interview_date'],
-                meeting_link=email_data.get('meeting_link'),
-                recruiter_email=email_data['sender'],
-                gmail_message_id=email_data['message_id'],
-                description=email_data['body'][:500]
-            )
-            db.add(interview)
-            synced_count += 1
+    if background:
+        job = enqueue(sync_from_gmail_task, current_user.id)
+        return schemas.JobResponse(job_id=job.id, status=job.status)
     
-    db.commit()
-    
-    return {"message": f"Synced {synced_count} interviews from Gmail"}
+    return InterviewService(db).sync_from_gmail(current_user)
 
 
 @router.post("/{interview_id}/schedule-prep")
 def schedule_prep_sessions(
     interview_id: int,
     days_before: int = 3,
+    preferred_start_hour: int = Query(settings.PREP_PREFERRED_START_HOUR, ge=0, le=23),
+    preferred_end_hour: int = Query(settings.PREP_PREFERRED_END_HOUR, ge=1, le=24),
+    background: bool = False,
     current_user: models.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Schedule prep sessions for an interview"""
+    """Schedule prep sessions for an interview in free time within the preferred UTC hours"""
+    if preferred_start_hour >= preferred_end_hour:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="preferred_start_hour must be before preferred_end_hour"
+        )
+    
     interview = db.query(models.Interview).filter(
         models.Interview.id == interview_id,
         models.Interview.user_id == current_user.id
@@ -244,39 +402,12 @@ def schedule_prep_sessions(
             detail="Interview not found"
         )
     
-    credentials = get_user_credentials(current_user)
-    calendar_service = CalendarService(credentials)
-    
-    interview_title = f"{interview.company} - {interview.position}"
-    event_ids = calendar_service.schedule_prep_blocks(
-        interview_date=interview.scheduled_date,
-        interview_title=interview_title,
-        days_before=days_before
-    )
-    
-    # Create prep session records
-    from datetime import timedelta
-    prep_sessions = []
-    for day, event_id in enumerate(event_ids, start=1):
-        prep_date = interview.scheduled_date - timedelta(days=days_before - day + 1)
-        prep_start = prep_date.replace(hour=19, minute=0, second=0, microsecond=0)
-        prep_end = prep_start + timedelta(minutes=90)
-        
-        prep_session = models.PrepSession(
-            user_id=current_user.id,
-            interview_id=interview_id,
-            title=f"Prep Session #{day} - {interview_title}",
-            scheduled_start=prep_start,
-            scheduled_end=prep_end,
-            calendar_event_id=event_id
+    if background:
+        job = enqueue(
+            schedule_prep_task, current_user.id, interview_id, days_before, preferred_start_hour, preferred_end_hour
         )
-        db.add(prep_session)
-        prep_sessions.append(prep_session)
+        return schemas.JobResponse(job_id=job.id, status=job.status)
     
-    db.commit()
-    
-    return {
-        "message": f"Scheduled {len(prep_sessions)} prep sessions",
-        "sessions": len(prep_sessions)
-    }
-
+    return InterviewService(db).schedule_prep(
+        interview, current_user, days_before, preferred_start_hour, preferred_end_hour
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from celery.result import AsyncResult
+from app import models, schemas, auth
+from app.worker import celery_app, get_job_owner
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=schemas.JobResponse)
+def get_job_status(
+    job_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get the status and result of a background job"""
+    # Unknown IDs and other users' jobs look the same, whatever state the job is in
+    if get_job_owner(job_id) != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    job = AsyncResult(job_id, app=celery_app)
+    
+    if job.successful():
+        return schemas.JobResponse(job_id=job_id, status=job.status, result=job.result)
+    
+    if job.failed():
+        # The exception text can carry SQL or upstream responses, so only say that it failed
+        return schemas.JobResponse(job_id=job_id, status=job.status, error="Job failed")
+    
+    return schemas.JobResponse(job_id=job_id, status=job.status)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app import models, schemas, auth
+from app.pagination import paginate, parse_fields
 from datetime import datetime
 
 router = APIRouter(prefix="/api/prep-sessions", tags=["prep_sessions"])
@@ -10,17 +11,41 @@ router = APIRouter(prefix="/api/prep-sessions", tags=["prep_sessions"])
 
 @router.get("/", response_model=List[schemas.PrepSessionResponse])
 def get_prep_sessions(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status_filter: Optional[models.PrepSessionStatus] = Query(None, alias="status"),
+    interview_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
     current_user: models.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all prep sessions for the current user"""
-    sessions = db.query(models.PrepSession).filter(
+    """Get prep sessions for the current user, ordered by start time; pass X-Next-Cursor back as cursor for the next page"""
+    query = db.query(models.PrepSession).filter(
         models.PrepSession.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    )
+    if status_filter:
+        query = query.filter(models.PrepSession.status == status_filter)
+    if interview_id:
+        query = query.filter(models.PrepSession.interview_id == interview_id)
+    if date_from:
+        query = query.filter(models.PrepSession.scheduled_start >= date_from)
+    if date_to:
+        query = query.filter(models.PrepSession.scheduled_start <= date_to)
     
-    return sessions
+    return paginate(
+        query,
+        models.PrepSession,
+        models.PrepSession.scheduled_start,
+        response,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        fields=parse_fields(fields, schemas.PrepSessionResponse, ("id", "scheduled_start"))
+    )
 
 
 @router.get("/{session_id}", response_model=schemas.PrepSessionResponse)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Any
 from app.models import InterviewType, InterviewStatus, PrepSessionStatus
 
 
@@ -30,6 +30,7 @@ class Token(BaseModel):
 
 
 class TokenData(BaseModel):
+    user_id: Optional[int] = None
     email: Optional[str] = None
 
 
@@ -77,6 +78,11 @@ class InterviewResponse(InterviewBase):
         from_attributes = True
 
 
+class InterviewUpdateResponse(InterviewResponse):
+    # Prep sessions left at their old time because their calendar event could not be moved
+    calendar_failures: List[int] = []
+
+
 # Question Schemas
 class QuestionBase(BaseModel):
     question_text: str
@@ -168,6 +174,8 @@ class PerformanceResponse(PerformanceBase):
 # Interview with Questions
 class InterviewWithQuestions(InterviewResponse):
     questions: List[QuestionResponse] = []
+    prep_sessions: List[PrepSessionResponse] = []
+    performance: Optional[PerformanceResponse] = None
 
 
 # Dashboard Stats
@@ -179,3 +187,26 @@ class DashboardStats(BaseModel):
     avg_confidence: Optional[float]
     success_rate: Optional[float]
 
+
+# Trend Schemas
+class TrendPoint(BaseModel):
+    bucket_start: date
+    interview_type: InterviewType
+    interviews: int
+    completed_interviews: int
+    prep_hours: int
+    avg_confidence: Optional[float]
+    pass_rate: Optional[float]
+
+
+class TrendsResponse(BaseModel):
+    weekly: List[TrendPoint]
+    monthly: List[TrendPoint]
+
+
+# Background Job Schemas
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -1,5 +1,8 @@
-from typing import List, Dict
-from openai import OpenAI
+import hashlib
+import json
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from openai import OpenAI, AsyncOpenAI
+from app.cache import get_cache
 from app.config import settings
 from app.models import InterviewType
 import logging
@@ -7,52 +10,219 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class JSONArrayStreamParser:
+    """Incrementally extract complete objects from a streamed top-level JSON array"""
+    
+    def __init__(self):
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._buffer: List[str] = []
+    
+    def feed(self, text: str) -> List[Dict[str, any]]:
+        """Consume a chunk of text and return any objects it completed"""
+        objects = []
+        for char in text:
+            if not self._started:
+                # Skip any preamble (prose, code fences) before the array opens
+                self._started = char == '['
+                continue
+            
+            if self._depth == 0:
+                # Between array elements: only an opening brace matters
+                if char == '{':
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+            
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        objects.append(json.loads(''.join(self._buffer)))
+                    except ValueError as e:
+                        logger.warning(f"Skipping malformed streamed question: {e}")
+                    self._buffer = []
+        return objects
+
+
 class AIService:
-    """Service for AI-powered question generation and analysis"""
+    """
+    Service for AI-powered question generation and analysis
+    
+    Use the shared ai_service instance: each AIService owns HTTP connection
+    pools that are only released by aclose().
+    """
     
     def __init__(self):
         self.client = OpenAI(
             api_key=settings.OPENAI_API_KEY,
             base_url=settings.OPENAI_BASE_URL
         )
+        # Async client for event-loop route handlers, so LLM calls don't pin threadpool threads
+        self.async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL
+        )
         self.model = settings.OPENAI_MODEL
+        self.cache = get_cache(
+            "llm",
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES
+        )
     
     def generate_questions(
         self,
         interview_type: InterviewType,
         position: str,
         company: str,
-        num_questions: int = 10
+        num_questions: int = 10,
+        use_cache: bool = True
     ) -> List[Dict[str, any]]:
         """Generate tailored interview questions using AI"""
-        
-        prompt = self._build_prompt(interview_type, position, company, num_questions)
+        cache_key, request, cached = self._prepare_questions(
+            interview_type, position, company, num_questions, use_cache
+        )
+        if cached is not None:
+            return cached
         
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert interview coach who creates highly relevant, tailored interview questions. Return questions in a structured JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
+                **request
             )
-            
-            # Parse the response
-            questions = self._parse_questions(response.choices[0].message.content)
-            return questions
+            return self._store_questions(cache_key, response.choices[0].message.content)
         
         except Exception as e:
             logger.error(f"Error generating questions: {e}")
             return self._get_fallback_questions(interview_type)
     
+    async def agenerate_questions(
+        self,
+        interview_type: InterviewType,
+        position: str,
+        company: str,
+        num_questions: int = 10,
+        use_cache: bool = True
+    ) -> List[Dict[str, any]]:
+        """Generate tailored interview questions using the async client"""
+        cache_key, request, cached = self._prepare_questions(
+            interview_type, position, company, num_questions, use_cache
+        )
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.async_client.chat.completions.create(
+                **request
+            )
+            return self._store_questions(cache_key, response.choices[0].message.content)
+        
+        except Exception as e:
+            logger.error(f"Error generating questions: {e}")
+            return self._get_fallback_questions(interview_type)
+    
+    async def astream_questions(
+        self,
+        interview_type: InterviewType,
+        position: str,
+        company: str,
+        num_questions: int = 10,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, any]]:
+        """Stream questions one at a time as each JSON object in the completion closes"""
+        cache_key, request, cached = self._prepare_questions(
+            interview_type, position, company, num_questions, use_cache
+        )
+        if cached is not None:
+            for question in cached:
+                yield question
+            return
+        
+        questions = []
+        parser = JSONArrayStreamParser()
+        completed = False
+        try:
+            stream = await self.async_client.chat.completions.create(stream=True, **request)
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for q in parser.feed(chunk.choices[0].delta.content):
+                    question = self._normalize_question(q)
+                    questions.append(question)
+                    yield question
+            completed = True
+        except Exception as e:
+            logger.error(f"Error streaming questions: {e}")
+        
+        if questions:
+            # A cut-off stream would otherwise be served as the full answer until the entry expires
+            if completed and len(questions) >= num_questions:
+                self.cache.set(cache_key, questions)
+            return
+        
+        for question in self._get_fallback_questions(interview_type):
+            yield question
+    
+    def _prepare_questions(
+        self,
+        interview_type: InterviewType,
+        position: str,
+        company: str,
+        num_questions: int,
+        use_cache: bool
+    ) -> Tuple[str, Dict[str, any], Optional[List[Dict[str, any]]]]:
+        """Build the completion request and its cache key, with the cached questions if there are any"""
+        request = self._question_request(self._build_prompt(interview_type, position, company, num_questions))
+        cache_key = self._cache_key(request)
+        return cache_key, request, self.cache.get(cache_key) if use_cache else None
+    
+    def _store_questions(self, cache_key: str, response_text: str) -> List[Dict[str, any]]:
+        """Parse a completion into questions, caching them if any were found"""
+        questions = self._parse_questions(response_text)
+        if questions:
+            self.cache.set(cache_key, questions)
+        return questions
+    
+    async def aclose(self):
+        """Close both clients' connection pools"""
+        self.client.close()
+        await self.async_client.close()
+    
+    def _cache_key(self, request: Dict[str, any]) -> str:
+        """Content-addressed key over model, prompt and sampling params"""
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+    
+    def _question_request(self, prompt: str) -> Dict[str, any]:
+        """Build the chat completion arguments for question generation"""
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert interview coach who creates highly relevant, tailored interview questions. Return questions in a structured JSON format."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
+    
     def _build_prompt(
         self,
         interview_type: InterviewType,
@@ -105,21 +275,22 @@ Make the questions specific, relevant, and appropriately challenging for the pos
             json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
             if json_match:
                 questions_data = json.loads(json_match.group())
-                return [
-                    {
-                        'question_text': q.get('question_text', ''),
-                        'category': q.get('category', 'General'),
-                        'difficulty': q.get('difficulty', 'Medium'),
-                        'hints': q.get('hints', []),
-                        'sample_answer': q.get('sample_answer', '')
-                    }
-                    for q in questions_data
-                ]
+                return [self._normalize_question(q) for q in questions_data]
         except Exception as e:
             logger.error(f"Error parsing questions: {e}")
         
         return []
     
+    def _normalize_question(self, q: Dict[str, any]) -> Dict[str, any]:
+        """Fill in defaults for a parsed question object"""
+        return {
+            'question_text': q.get('question_text', ''),
+            'category': q.get('category', 'General'),
+            'difficulty': q.get('difficulty', 'Medium'),
+            'hints': q.get('hints', []),
+            'sample_answer': q.get('sample_answer', '')
+        }
+    
     def _get_fallback_questions(self, interview_type: InterviewType) -> List[Dict[str, any]]:
         """Return fallback questions if AI generation fails"""
         
@@ -180,7 +351,8 @@ Make the questions specific, relevant, and appropriately challenging for the pos
             InterviewType.SYSTEM_DESIGN: system_design_questions,
         }
         
-        return question_map.get(interview_type, technical_questions)
+        # Flag canned questions so they are not stored in the shared question bank
+        return [{**q, 'fallback': True} for q in question_map.get(interview_type, technical_questions)]
     
     def analyze_performance(self, user_responses: List[str]) -> Dict[str, any]:
         """Analyze user's practice responses and provide feedback"""
@@ -215,3 +387,6 @@ Format as JSON."""
             logger.error(f"Error analyzing performance: {e}")
             return {"analysis": "Unable to generate analysis at this time."}
 
+
+# Shared by every request and task so connection pools are reused; closed on app shutdown
+ai_service = AIService()
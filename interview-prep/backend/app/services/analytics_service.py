@@ -0,0 +1,433 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+from sqlalchemy import event, func, case, cast, and_, select, delete, inspect, Date
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.dialects.postgresql import insert
+from app import models, schemas
+from app.cache import get_cache
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+dashboard_cache = get_cache("dashboard", ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+class AnalyticsService:
+    """Service for per-user interview analytics"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_dashboard_stats(self, user_id: int) -> schemas.DashboardStats:
+        """Get dashboard statistics, served from cache until the user's data changes"""
+        cached = dashboard_cache.get(str(user_id))
+        if cached is not None:
+            return schemas.DashboardStats(**cached)
+        
+        stats = self._dashboard_from_rollup(user_id)
+        dashboard_cache.set(str(user_id), stats.model_dump())
+        return stats
+    
+    def _dashboard_from_rollup(self, user_id: int) -> schemas.DashboardStats:
+        """Build dashboard stats from the user_stats rollup row"""
+        rollup = self.db.get(models.UserStats, user_id)
+        if rollup is None:
+            # Users created before the rollup existed get a row on first read
+            rollup = self.rebuild_user_stats(user_id)
+            self.db.commit()
+        
+        # "Upcoming" depends on the clock, so it stays a live (indexed) count
+        upcoming = self.db.execute(
+            select(func.count(models.Interview.id)).where(
+                models.Interview.user_id == user_id,
+                models.Interview.status == models.InterviewStatus.UPCOMING,
+                models.Interview.scheduled_date > datetime.utcnow()
+            )
+        ).scalar()
+        
+        completed = rollup.completed_interviews
+        return schemas.DashboardStats(
+            total_interviews=rollup.total_interviews,
+            upcoming_interviews=upcoming,
+            completed_interviews=completed,
+            total_prep_hours=rollup.total_prep_hours,
+            avg_confidence=(rollup.confidence_sum / rollup.confidence_count) if rollup.confidence_count else None,
+            success_rate=(rollup.passed_count / completed * 100) if completed > 0 else None
+        )
+    
+    def get_trends(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> schemas.TrendsResponse:
+        """Read weekly and monthly per-type series from the trend_buckets table"""
+        if self.db.get(models.UserStats, user_id) is None:
+            # Buckets are built with the rollup row, so users without one get both on first read
+            self.rebuild_user_stats(user_id)
+            self.db.commit()
+        
+        # Plain rows rather than ORM objects: a long history has a thousand or more buckets
+        # and identity-map bookkeeping would cost more than the query
+        table = models.TrendBucket.__table__
+        query = select(table).where(table.c.user_id == user_id, table.c.total_interviews > 0)
+        if start_date:
+            query = query.where(table.c.bucket_start >= start_date)
+        if end_date:
+            query = query.where(table.c.bucket_start <= end_date)
+        
+        series = {"week": [], "month": []}
+        for bucket in self.db.execute(query.order_by(table.c.period, table.c.bucket_start)):
+            series[bucket.period].append(schemas.TrendPoint(
+                bucket_start=bucket.bucket_start,
+                interview_type=bucket.interview_type,
+                interviews=bucket.total_interviews,
+                completed_interviews=bucket.completed_interviews,
+                prep_hours=bucket.total_prep_hours,
+                avg_confidence=(bucket.confidence_sum / bucket.confidence_count) if bucket.confidence_count else None,
+                pass_rate=(bucket.passed_count / bucket.completed_interviews * 100) if bucket.completed_interviews else None
+            ))
+        
+        return schemas.TrendsResponse(weekly=series["week"], monthly=series["month"])
+    
+    def _aggregate(self, user_id: int, *group_by):
+        """Rollup figures over raw interviews LEFT JOIN performance, optionally grouped"""
+        Interview, Performance = models.Interview, models.Performance
+        is_completed = Interview.status == models.InterviewStatus.COMPLETED
+        
+        return self.db.execute(
+            select(
+                *group_by,
+                func.count(Interview.id).label("total_interviews"),
+                func.coalesce(func.sum(case((is_completed, 1), else_=0)), 0).label("completed_interviews"),
+                func.coalesce(func.sum(Performance.prep_hours), 0).label("total_prep_hours"),
+                func.coalesce(func.sum(Performance.confidence_level), 0).label("confidence_sum"),
+                func.count(Performance.confidence_level).label("confidence_count"),
+                func.coalesce(func.sum(case(
+                    (and_(is_completed, Performance.outcome == 'passed'), 1),
+                    else_=0
+                )), 0).label("passed_count"),
+            )
+            .select_from(Interview)
+            .outerjoin(Performance, Performance.interview_id == Interview.id)
+            .where(Interview.user_id == user_id)
+            .group_by(*group_by)
+        )
+    
+    def compute_rollup(self, user_id: int) -> Dict[str, int]:
+        """Recompute a user's rollup figures from raw rows"""
+        row = self._aggregate(user_id).one()
+        return {field: int(getattr(row, field)) for field in ROLLUP_FIELDS}
+    
+    def compute_trend_buckets(self, user_id: int) -> Dict[tuple, Dict[str, int]]:
+        """Recompute a user's trend buckets from raw rows, keyed by (period, bucket_start, interview_type)"""
+        buckets = {}
+        for period in ("week", "month"):
+            bucket_start = cast(func.date_trunc(period, models.Interview.scheduled_date), Date).label("bucket_start")
+            for row in self._aggregate(user_id, bucket_start, models.Interview.interview_type):
+                buckets[(period, row.bucket_start, row.interview_type)] = {
+                    field: int(getattr(row, field)) for field in ROLLUP_FIELDS
+                }
+        return buckets
+    
+    def _stored_trend_buckets(self, user_id: int) -> Dict[tuple, Dict[str, int]]:
+        return {
+            (bucket.period, bucket.bucket_start, bucket.interview_type): {
+                field: getattr(bucket, field) for field in ROLLUP_FIELDS
+            }
+            for bucket in self.db.query(models.TrendBucket).filter(models.TrendBucket.user_id == user_id)
+            if any(getattr(bucket, field) for field in ROLLUP_FIELDS)
+        }
+    
+    def rebuild_user_stats(self, user_id: int) -> models.UserStats:
+        """Overwrite a user's rollup row and trend buckets with a full recompute"""
+        # Waits for concurrent rebuilds and for writers that skipped the missing row to
+        # commit, so the recompute below sees their rows
+        lock_rollups(self.db.connection(), [user_id])
+        values = self.compute_rollup(user_id)
+        self.db.execute(
+            insert(models.UserStats)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(index_elements=['user_id'], set_=values)
+        )
+        
+        buckets = self.compute_trend_buckets(user_id)
+        self.db.execute(delete(models.TrendBucket).where(models.TrendBucket.user_id == user_id))
+        if buckets:
+            # executemany rather than one multi-VALUES statement, which would be recompiled for every size
+            self.db.execute(insert(models.TrendBucket), [
+                {
+                    "user_id": user_id,
+                    "period": period,
+                    "bucket_start": bucket_start,
+                    "interview_type": interview_type,
+                    **figures
+                }
+                for (period, bucket_start, interview_type), figures in buckets.items()
+            ])
+        
+        return self.db.get(models.UserStats, user_id, populate_existing=True)
+    
+    def check_user_stats(self, user_id: int) -> Dict[str, tuple]:
+        """Compare a user's rollups against a full recompute; returns {name: (stored, actual)} for mismatches"""
+        rollup = self.db.get(models.UserStats, user_id)
+        actual = self.compute_rollup(user_id)
+        stored = {field: getattr(rollup, field) if rollup else 0 for field in ROLLUP_FIELDS}
+        mismatches = {
+            field: (stored[field], actual[field])
+            for field in ROLLUP_FIELDS
+            if stored[field] != actual[field]
+        }
+        
+        stored_buckets = self._stored_trend_buckets(user_id)
+        actual_buckets = self.compute_trend_buckets(user_id)
+        for key in set(stored_buckets) | set(actual_buckets):
+            if stored_buckets.get(key) != actual_buckets.get(key):
+                period, bucket_start, interview_type = key
+                mismatches[f"trend {period} {bucket_start} {interview_type.value}"] = (
+                    stored_buckets.get(key), actual_buckets.get(key)
+                )
+        
+        return mismatches
+
+
+def invalidate_dashboard(user_id: int):
+    """Drop a user's cached dashboard stats"""
+    dashboard_cache.delete(str(user_id))
+
+
+def _pending_invalidations(session: Session) -> Set[int]:
+    return session.info.setdefault("dashboard_invalidations", set())
+
+
+def _mark_interview_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _pending_invalidations(session).add(target.user_id)
+
+
+def _mark_performance_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    user_id = connection.execute(
+        select(models.Interview.user_id).where(models.Interview.id == target.interview_id)
+    ).scalar()
+    if user_id is not None:
+        _pending_invalidations(session).add(user_id)
+
+
+for _model, _listener in ((models.Interview, _mark_interview_changed), (models.Performance, _mark_performance_changed)):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Invalidate only once the change is visible, so a concurrent read cannot re-cache stale stats
+    for user_id in session.info.pop("dashboard_invalidations", set()):
+        invalidate_dashboard(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("dashboard_invalidations", None)
+
+
+# Incremental user_stats / trend_buckets maintenance: each flush applies
+# (new contribution - old contribution) for every interview whose own row or performance row changed.
+
+ROLLUP_FIELDS = (
+    "total_interviews",
+    "completed_interviews",
+    "total_prep_hours",
+    "confidence_sum",
+    "confidence_count",
+    "passed_count",
+)
+
+INTERVIEW_ATTRS = ("user_id", "status", "scheduled_date", "interview_type")
+PERFORMANCE_ATTRS = ("prep_hours", "confidence_level", "outcome")
+
+
+def _contribution(interview: Optional[Dict], performance: Optional[Dict]) -> Dict[str, int]:
+    """Rollup figures contributed by one interview and its performance row"""
+    contribution = dict.fromkeys(ROLLUP_FIELDS, 0)
+    if interview is None:
+        return contribution
+    
+    completed = interview["status"] == models.InterviewStatus.COMPLETED
+    contribution["total_interviews"] = 1
+    contribution["completed_interviews"] = int(completed)
+    if performance is not None:
+        contribution["total_prep_hours"] = performance["prep_hours"] or 0
+        if performance["confidence_level"] is not None:
+            contribution["confidence_sum"] = performance["confidence_level"]
+            contribution["confidence_count"] = 1
+        contribution["passed_count"] = int(completed and performance["outcome"] == 'passed')
+    return contribution
+
+
+def _old_values(obj, attrs) -> Dict:
+    """Attribute values as they were before this flush"""
+    state = inspect(obj)
+    values = {}
+    for attr in attrs:
+        history = state.attrs[attr].history
+        if history.deleted:
+            values[attr] = history.deleted[0]
+        elif history.unchanged:
+            values[attr] = history.unchanged[0]
+        else:
+            values[attr] = getattr(obj, attr)
+    return values
+
+
+def _new_values(obj, attrs) -> Dict:
+    return {attr: getattr(obj, attr) for attr in attrs}
+
+
+def _states(session: Session, obj, attrs):
+    """(old, new) attribute snapshots for a flushed object; None means the row did not / no longer exists"""
+    if obj in session.new:
+        return None, _new_values(obj, attrs)
+    if obj in session.deleted:
+        return _old_values(obj, attrs), None
+    return _old_values(obj, attrs), _new_values(obj, attrs)
+
+
+# First key of the transaction-level advisory locks that serialize rollup writes per user
+ROLLUP_LOCK_NAMESPACE = 7001
+
+
+def lock_rollups(connection, user_ids):
+    """Take the users' rollup locks until the end of the transaction, in id order to avoid deadlocks"""
+    for user_id in sorted(set(user_ids)):
+        connection.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_NAMESPACE, user_id)))
+
+
+def apply_rollup_delta(connection, user_id: int, delta: Dict[str, int]):
+    """Add a delta to a user's existing rollup row"""
+    if not any(delta.values()):
+        return
+    table = models.UserStats.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.user_id == user_id)
+        .values({field: table.c[field] + delta[field] for field in ROLLUP_FIELDS})
+    )
+
+
+def bucket_starts(scheduled_date: datetime) -> Dict[str, date]:
+    """Week (Monday) and month start dates for an interview date, matching date_trunc"""
+    day = scheduled_date.date()
+    return {
+        "week": day - timedelta(days=day.weekday()),
+        "month": day.replace(day=1),
+    }
+
+
+def apply_trend_delta(connection, user_id: int, period: str, bucket_start: date, interview_type, delta: Dict[str, int]):
+    """Add a delta to one trend bucket, creating it if needed"""
+    if not any(delta.values()):
+        return
+    table = models.TrendBucket.__table__
+    connection.execute(
+        insert(table)
+        .values(user_id=user_id, period=period, bucket_start=bucket_start, interview_type=interview_type, **delta)
+        .on_conflict_do_update(
+            index_elements=['user_id', 'period', 'bucket_start', 'interview_type'],
+            set_={field: table.c[field] + delta[field] for field in ROLLUP_FIELDS}
+        )
+    )
+
+
+def apply_interview_changes(connection, changes: List[tuple]):
+    """
+    Apply rollup and trend deltas for a set of interview changes
+    
+    Users without a user_stats row are skipped: a delta on an empty row would
+    leave out their older interviews, so their first dashboard or trends read
+    rebuilds both rollups from raw rows instead.
+    
+    Args:
+        connection: Connection inside the writing transaction
+        changes: (old_interview, old_performance, new_interview, new_performance) snapshots,
+            with None for rows that did not / no longer exist
+    """
+    user_deltas: Dict[int, Dict[str, int]] = {}
+    trend_deltas: Dict[tuple, Dict[str, int]] = {}
+    
+    for old_interview, old_performance, new_interview, new_performance in changes:
+        for interview, performance, sign in ((old_interview, old_performance, -1), (new_interview, new_performance, 1)):
+            if interview is None:
+                continue
+            contribution = _contribution(interview, performance)
+            
+            user_delta = user_deltas.setdefault(interview["user_id"], dict.fromkeys(ROLLUP_FIELDS, 0))
+            for field in ROLLUP_FIELDS:
+                user_delta[field] += sign * contribution[field]
+            
+            for period, bucket_start in bucket_starts(interview["scheduled_date"]).items():
+                key = (interview["user_id"], period, bucket_start, interview["interview_type"])
+                trend_delta = trend_deltas.setdefault(key, dict.fromkeys(ROLLUP_FIELDS, 0))
+                for field in ROLLUP_FIELDS:
+                    trend_delta[field] += sign * contribution[field]
+    
+    if not user_deltas:
+        return
+    lock_rollups(connection, user_deltas)
+    table = models.UserStats.__table__
+    initialized = set(connection.execute(
+        select(table.c.user_id).where(table.c.user_id.in_(list(user_deltas)))
+    ).scalars())
+    
+    for user_id, delta in user_deltas.items():
+        if user_id in initialized:
+            apply_rollup_delta(connection, user_id, delta)
+    for (user_id, period, bucket_start, interview_type), delta in trend_deltas.items():
+        if user_id in initialized:
+            apply_trend_delta(connection, user_id, period, bucket_start, interview_type, delta)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_user_stats(session, flush_context):
+    changed = [obj for obj in (*session.new, *session.dirty, *session.deleted)
+               if isinstance(obj, (models.Interview, models.Performance))]
+    if not changed:
+        return
+    
+    interviews: Dict[int, tuple] = {}
+    performances: Dict[int, tuple] = {}
+    for obj in changed:
+        if isinstance(obj, models.Interview):
+            interviews[obj.id] = _states(session, obj, INTERVIEW_ATTRS)
+        elif isinstance(obj, models.Performance):
+            performances[obj.interview_id] = _states(session, obj, PERFORMANCE_ATTRS)
+    
+    connection = session.connection()
+    changes = []
+    for interview_id in set(interviews) | set(performances):
+        # Whichever side did not change in this flush is read back as-is
+        if interview_id in interviews:
+            old_interview, new_interview = interviews[interview_id]
+        else:
+            row = connection.execute(
+                select(*(getattr(models.Interview, attr) for attr in INTERVIEW_ATTRS))
+                .where(models.Interview.id == interview_id)
+            ).mappings().first()
+            old_interview = new_interview = dict(row) if row else None
+        
+        if interview_id in performances:
+            old_performance, new_performance = performances[interview_id]
+        else:
+            row = connection.execute(
+                select(*(getattr(models.Performance, attr) for attr in PERFORMANCE_ATTRS))
+                .where(models.Performance.interview_id == interview_id)
+            ).mappings().first()
+            old_performance = new_performance = dict(row) if row else None
+        
+        changes.append((old_interview, old_performance, new_interview, new_performance))
+    
+    apply_interview_changes(connection, changes)
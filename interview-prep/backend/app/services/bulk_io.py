@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas
+from app.database import SessionLocal
+from app.services.analytics_service import INTERVIEW_ATTRS, apply_interview_changes, invalidate_dashboard
+
+EXPORT_FIELDS = list(schemas.InterviewResponse.model_fields)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8").rstrip("\r")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Dict]]:
+    """Yield (row number, record) for each non-empty NDJSON line; unparseable lines yield an error string"""
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        yield row_number, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def ends_inside_quotes(text: str) -> bool:
+    """
+    Whether text stops inside a quoted CSV field, so its record continues on the next line
+    
+    Only a quote opening a field starts a quoted field; one inside an unquoted
+    value (Acme 5" Inc) is literal, as the csv module reads it.
+    """
+    quoted = False
+    field_start = True
+    just_closed = False
+    for char in text:
+        if quoted:
+            if char == '"':
+                quoted, just_closed = False, True
+            continue
+        # A quote straight after a closing quote is an escaped "" and reopens the field
+        if char == '"' and (field_start or just_closed):
+            quoted = True
+        field_start = char in ",\n"
+        just_closed = False
+    return quoted
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Dict]]:
+    """
+    Yield (row number, record) for each CSV row; the first row is the header
+    
+    Rows that can't be parsed, including a quoted field still open when the
+    body ends, yield an error string instead of a record.
+    """
+    header = None
+    row_number = 0
+    line_number = 0
+    start_line = 0
+    buffered = ""
+    async for line in lines:
+        line_number += 1
+        if not buffered:
+            start_line = line_number
+        buffered = f"{buffered}\n{line}" if buffered else line
+        # A quoted field may span lines; wait until it closes
+        if ends_inside_quotes(buffered):
+            continue
+        text, buffered = buffered, ""
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            row_number += 1
+            yield row_number, f"Invalid CSV on line {start_line}: {e}"
+            continue
+        if header is None:
+            # Spreadsheet exports often start with a byte order mark
+            header = [name.lstrip("\ufeff").strip() for name in values]
+            continue
+        row_number += 1
+        # Empty cells mean "not provided" so schema defaults apply
+        yield row_number, {key: value for key, value in zip(header, values) if value != ""}
+    if buffered:
+        row_number += 1
+        yield row_number, f"Invalid CSV on line {start_line}: quoted field is never closed"
+
+
+class BulkInterviewImporter:
+    """Validate streamed interview records and insert them in batches inside one transaction"""
+    
+    def __init__(self, db: AsyncSession, user_id: int, batch_size: int):
+        self.db = db
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.batch: List[Dict] = []
+        self.imported = 0
+        self.errors: List[Dict] = []
+    
+    async def add(self, row_number: int, record):
+        """Validate one record, flushing a batch once it is full"""
+        if isinstance(record, str):
+            self.errors.append({"row": row_number, "errors": [record]})
+            return
+        try:
+            interview = schemas.InterviewCreate(**record)
+        except ValidationError as e:
+            self.errors.append({
+                "row": row_number,
+                "errors": [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+            })
+            return
+        
+        self.batch.append({**interview.model_dump(), "user_id": self.user_id})
+        if len(self.batch) >= self.batch_size:
+            await self._insert_batch()
+    
+    async def finish(self) -> Dict:
+        """Insert the final partial batch and commit everything"""
+        await self._insert_batch()
+        await self.db.commit()
+        if self.imported:
+            invalidate_dashboard(self.user_id)
+        return {"imported": self.imported, "failed": len(self.errors), "errors": self.errors}
+    
+    async def _insert_batch(self):
+        if not self.batch:
+            return
+        result = await self.db.execute(
+            insert(models.Interview)
+            .values(self.batch)
+            .returning(*(getattr(models.Interview, attr) for attr in INTERVIEW_ATTRS))
+        )
+        inserted = [dict(row) for row in result.mappings()]
+        # Core inserts bypass the ORM flush hook, so apply rollup deltas directly
+        await self.db.run_sync(
+            lambda session: apply_interview_changes(
+                session.connection(), [(None, None, interview, None) for interview in inserted]
+            )
+        )
+        self.imported += len(inserted)
+        self.batch = []
+
+
+def stream_interviews(user_id: int, export_format: str, batch_size: int) -> Iterator[str]:
+    """Stream a user's interviews as NDJSON or CSV, holding at most one batch in memory"""
+    # Runs after the request-scoped session is closed, so it owns its session
+    db = SessionLocal()
+    try:
+        query = db.query(models.Interview).filter(
+            models.Interview.user_id == user_id
+        ).order_by(models.Interview.scheduled_date, models.Interview.id).yield_per(batch_size)
+        
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for interview in query:
+                writer.writerow(schemas.InterviewResponse.model_validate(interview).model_dump(mode="json"))
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for interview in query:
+                yield schemas.InterviewResponse.model_validate(interview).model_dump_json() + "\n"
+    finally:
+        db.close()
@@ -1,17 +1,66 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from app.config import settings
+from app.services.fake_calendar import FakeCalendar
 import logging
 
 logger = logging.getLogger(__name__)
 
+Interval = Tuple[datetime, datetime]
+
+# Mock mode shares one in-memory calendar per process, so events created by one
+# request can be updated by the next
+mock_calendar = FakeCalendar()
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC, matching stored dates; naive ones are already UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """Parse an API timestamp into a naive UTC datetime, matching stored dates"""
+    return to_naive_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+
+
+class BusyIndex:
+    """Sorted, merged busy intervals with O(log n) lookup of the first free slot"""
+    
+    def __init__(self, intervals: List[Interval]):
+        self.intervals: List[Interval] = []
+        for start, end in sorted(intervals):
+            if self.intervals and start <= self.intervals[-1][1]:
+                if end > self.intervals[-1][1]:
+                    self.intervals[-1] = (self.intervals[-1][0], end)
+            else:
+                self.intervals.append((start, end))
+        self.ends = [end for _, end in self.intervals]
+    
+    def first_free_slot(self, window_start: datetime, window_end: datetime, duration: timedelta) -> Optional[Interval]:
+        """Earliest slot of the given length inside the window that overlaps no busy interval"""
+        candidate = window_start
+        # Skip everything that ends before the window opens, then walk forward past conflicts
+        index = bisect_right(self.ends, candidate)
+        while index < len(self.intervals) and self.intervals[index][0] < candidate + duration:
+            candidate = max(candidate, self.intervals[index][1])
+            index += 1
+        
+        if candidate + duration <= window_end:
+            return candidate, candidate + duration
+        return None
+
 
 class CalendarService:
     """Service for interacting with Google Calendar API"""
     
+    BATCH_SIZE = 50  # Calendar's recommended maximum calls per batch request
+    
     def __init__(self, credentials: Optional[Credentials] = None, mock_mode: bool = None):
         self.mock_mode = mock_mode if mock_mode is not None else settings.MOCK_MODE
         self.credentials = credentials
@@ -23,6 +72,10 @@ class CalendarService:
             except Exception as e:
                 logger.error(f"Failed to build Calendar service: {e}")
                 self.mock_mode = True
+        
+        if self.mock_mode:
+            # Batch paths run against an in-memory calendar instead of the API
+            self.service = mock_calendar
     
     def create_prep_session(
         self,
@@ -36,25 +89,7 @@ class CalendarService:
             return self._create_mock_event(title, start_time, end_time)
         
         try:
-            event = {
-                'summary': title,
-                'description': description or 'Interview preparation session',
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},
-                        {'method': 'popup', 'minutes': 30},
-                    ],
-                },
-            }
+            event = self._event_body(title, start_time, end_time, description)
             
             created_event = self.service.events().insert(
                 calendarId='primary',
@@ -67,65 +102,215 @@ class CalendarService:
             logger.error(f"An error occurred: {error}")
             return None
     
+    def _event_body(
+        self,
+        title: str,
+        start_time: datetime,
+        end_time: datetime,
+        description: Optional[str] = None
+    ) -> Dict:
+        """Build the API body for a prep session event"""
+        return {
+            'summary': title,
+            'description': description or 'Interview preparation session',
+            'start': {
+                'dateTime': start_time.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'end': {
+                'dateTime': end_time.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},
+                    {'method': 'popup', 'minutes': 30},
+                ],
+            },
+        }
+    
     def schedule_prep_blocks(
         self,
         interview_date: datetime,
         interview_title: str,
         days_before: int = 3,
-        session_duration: int = 90
-    ) -> list[str]:
-        """Automatically schedule prep blocks before an interview"""
-        event_ids = []
+        session_duration: int = 90,
+        preferred_start_hour: Optional[int] = None,
+        preferred_end_hour: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Schedule prep blocks in free time before an interview
+        
+        One free/busy query covers the whole window; each day then gets a block at
+        its earliest free slot within the preferred (UTC) hours. Days with no free
+        slot are skipped. All blocks are created in one batch request.
+        
+        Returns:
+            Created blocks as dicts with title, start, end and event_id;
+            blocks the API rejected are left out
+        """
+        if preferred_start_hour is None:
+            preferred_start_hour = settings.PREP_PREFERRED_START_HOUR
+        if preferred_end_hour is None:
+            preferred_end_hour = settings.PREP_PREFERRED_END_HOUR
+        
+        first_day = (interview_date - timedelta(days=days_before)).replace(hour=0, minute=0, second=0, microsecond=0)
+        busy = BusyIndex(self.get_busy_intervals(first_day, interview_date))
+        duration = timedelta(minutes=session_duration)
+        now = datetime.utcnow()
+        
+        blocks = []
+        description = f"Preparation session for {interview_title} interview scheduled on {interview_date.strftime('%Y-%m-%d')}"
         
         # Create multiple prep sessions leading up to the interview
         for day in range(days_before, 0, -1):
-            prep_date = interview_date - timedelta(days=day)
-            # Schedule in the evening (7 PM)
-            prep_start = prep_date.replace(hour=19, minute=0, second=0, microsecond=0)
-            prep_end = prep_start + timedelta(minutes=session_duration)
-            
-            title = f"Prep Session #{days_before - day + 1} - {interview_title}"
-            description = f"Preparation session for {interview_title} interview scheduled on {interview_date.strftime('%Y-%m-%d')}"
+            day_start = first_day + timedelta(days=days_before - day)
+            slot = busy.first_free_slot(
+                max(day_start + timedelta(hours=preferred_start_hour), now),
+                min(day_start + timedelta(hours=preferred_end_hour), interview_date),
+                duration
+            )
+            if slot is None:
+                logger.info(f"No free {session_duration}-minute prep slot on {day_start.date()}")
+                continue
             
-            event_id = self.create_prep_session(title, prep_start, prep_end, description)
-            if event_id:
-                event_ids.append(event_id)
+            blocks.append({
+                'title': f"Prep Session #{len(blocks) + 1} - {interview_title}",
+                'start': slot[0],
+                'end': slot[1],
+                'description': description
+            })
         
-        return event_ids
+        return self.create_events(blocks)
     
-    def update_event(self, event_id: str, updates: Dict) -> bool:
-        """Update an existing calendar event"""
-        if self.mock_mode:
-            logger.info(f"Mock: Would update event {event_id} with {updates}")
-            return True
-        
+    def get_busy_intervals(self, time_min: datetime, time_max: datetime) -> List[Interval]:
+        """Fetch busy intervals on the primary calendar with a single free/busy query"""
         try:
-            event = self.service.events().get(
-                calendarId='primary',
-                eventId=event_id
+            response = self.service.freebusy().query(
+                body={
+                    'timeMin': time_min.isoformat() + 'Z',
+                    'timeMax': time_max.isoformat() + 'Z',
+                    'items': [{'id': 'primary'}]
+                }
             ).execute()
-            
-            # Apply updates
-            for key, value in updates.items():
-                if key in ['start', 'end']:
-                    event[key] = {
-                        'dateTime': value.isoformat(),
-                        'timeZone': 'UTC',
-                    }
-                else:
-                    event[key] = value
-            
-            updated_event = self.service.events().update(
-                calendarId='primary',
-                eventId=event_id,
-                body=event
-            ).execute()
-            
-            return True
-        
         except HttpError as error:
             logger.error(f"An error occurred: {error}")
-            return False
+            return []
+        
+        busy = response.get('calendars', {}).get('primary', {}).get('busy', [])
+        return [(parse_rfc3339(interval['start']), parse_rfc3339(interval['end'])) for interval in busy]
+    
+    def create_events(self, blocks: List[Dict]) -> List[Dict]:
+        """Insert events with batch requests, returning each created block with its event_id and etag"""
+        created: Dict[str, Dict] = {}
+        
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Error creating event {request_id}: {exception}")
+                return
+            created[request_id] = response
+        
+        for start in range(0, len(blocks), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for index, block in enumerate(blocks[start:start + self.BATCH_SIZE], start=start):
+                batch.add(
+                    self.service.events().insert(
+                        calendarId='primary',
+                        body=self._event_body(block['title'], block['start'], block['end'], block.get('description'))
+                    ),
+                    request_id=str(index)
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error(f"An error occurred: {error}")
+        
+        return [
+            {**block, 'event_id': created[str(index)]['id'], 'etag': created[str(index)].get('etag')}
+            for index, block in enumerate(blocks)
+            if created.get(str(index), {}).get('id')
+        ]
+    
+    def update_event(self, event_id: str, updates: Dict, etag: Optional[str] = None) -> Optional[Dict]:
+        """
+        Patch only the given fields of a calendar event
+        
+        Args:
+            event_id: Calendar event ID
+            updates: Event fields to change; start/end may be datetimes
+            etag: ETag from when the event was last read or written; if the event
+                has changed since, the update is rejected instead of overwriting it
+        
+        Returns:
+            The updated event resource, or None if the update failed or conflicted
+        """
+        try:
+            return self._patch_request(event_id, updates, etag).execute()
+        
+        except HttpError as error:
+            self._log_update_error(event_id, error)
+            return None
+    
+    def update_events(self, updates: List[Dict]) -> Dict[str, Optional[Dict]]:
+        """
+        Patch several events in batch requests
+        
+        Args:
+            updates: Dicts with event_id, optional etag, and the fields to change
+        
+        Returns:
+            Updated event resource per event ID, or None where the update failed or conflicted
+        """
+        results: Dict[str, Optional[Dict]] = {update['event_id']: None for update in updates}
+        
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                self._log_update_error(request_id, exception)
+                return
+            results[request_id] = response
+        
+        for start in range(0, len(updates), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for update in updates[start:start + self.BATCH_SIZE]:
+                fields = {key: value for key, value in update.items() if key not in ('event_id', 'etag')}
+                batch.add(
+                    self._patch_request(update['event_id'], fields, update.get('etag')),
+                    request_id=update['event_id']
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error(f"An error occurred: {error}")
+        
+        return results
+    
+    def _patch_request(self, event_id: str, updates: Dict, etag: Optional[str] = None):
+        """Build an events().patch() request, conditional on the ETag when one is given"""
+        body = {}
+        for key, value in updates.items():
+            if key in ['start', 'end']:
+                body[key] = {
+                    'dateTime': value.isoformat(),
+                    'timeZone': 'UTC',
+                }
+            else:
+                body[key] = value
+        
+        request = self.service.events().patch(
+            calendarId='primary',
+            eventId=event_id,
+            body=body
+        )
+        if etag:
+            request.headers['If-Match'] = etag
+        return request
+    
+    def _log_update_error(self, event_id: str, error: Exception):
+        if isinstance(error, HttpError) and error.resp.status == 412:
+            logger.warning(f"Event {event_id} was changed in the calendar since it was last synced; not overwriting")
+        else:
+            logger.error(f"Error updating event {event_id}: {error}")
     
     def delete_event(self, event_id: str) -> bool:
         """Delete a calendar event"""
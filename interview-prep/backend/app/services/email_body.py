@@ -0,0 +1,94 @@
+import base64
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+# Tags whose contents are never visible text
+HIDDEN_TAGS = {'script', 'style', 'head', 'title'}
+# Tags that start a new line when rendered
+BLOCK_TAGS = {'br', 'p', 'div', 'tr', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'blockquote'}
+
+
+def is_attachment(part: Dict) -> bool:
+    """Whether a Gmail message part is an attachment (its data is never decoded)"""
+    if part.get('filename') or part.get('body', {}).get('attachmentId'):
+        return True
+    return any(
+        header['name'].lower() == 'content-disposition' and header['value'].lower().startswith('attachment')
+        for header in part.get('headers', [])
+    )
+
+
+def iter_leaf_parts(payload: Dict) -> Iterator[Dict]:
+    """Lazily walk a MIME tree depth-first, yielding non-attachment leaf parts"""
+    if is_attachment(payload):
+        return
+    parts = payload.get('parts')
+    if parts:
+        for part in parts:
+            yield from iter_leaf_parts(part)
+    else:
+        yield payload
+
+
+def decode_part(part: Dict, max_bytes: int) -> str:
+    """Decode at most max_bytes of a part's base64url body"""
+    data = part.get('body', {}).get('data', '')
+    # Every 4 base64 characters encode 3 bytes, so only decode the prefix we need
+    data = data[:(max_bytes + 2) // 3 * 4]
+    raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))[:max_bytes]
+    # The budget may cut a multi-byte character in half
+    return raw.decode('utf-8', errors='ignore')
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks: List[str] = []
+        self.hidden_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in HIDDEN_TAGS:
+            self.hidden_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in HIDDEN_TAGS and self.hidden_depth:
+            self.hidden_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+    
+    def handle_data(self, data):
+        if not self.hidden_depth:
+            self.chunks.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Strip tags, scripts and styles from HTML, keeping line breaks between blocks"""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    lines = (' '.join(line.split()) for line in ''.join(extractor.chunks).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_body(payload: Dict, max_bytes: int) -> str:
+    """
+    Extract readable body text from a Gmail message payload
+    
+    Prefers the first text/plain part anywhere in the tree and falls back to
+    the first text/html part converted to text. At most max_bytes are decoded.
+    """
+    html_part: Optional[Dict] = None
+    for part in iter_leaf_parts(payload):
+        if not part.get('body', {}).get('data'):
+            continue
+        mime_type = part.get('mimeType', 'text/plain')
+        if mime_type == 'text/plain':
+            return decode_part(part, max_bytes)
+        if mime_type == 'text/html' and html_part is None:
+            html_part = part
+    
+    if html_part is not None:
+        return html_to_text(decode_part(html_part, max_bytes))
+    return ""
@@ -0,0 +1,110 @@
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from app.models import InterviewType
+
+# Checked in order; the first type with any keyword present wins
+TYPE_KEYWORDS: List[Tuple[InterviewType, Tuple[str, ...]]] = [
+    (InterviewType.TECHNICAL, ('technical', 'coding', 'algorithm', 'leetcode')),
+    (InterviewType.SYSTEM_DESIGN, ('system design', 'architecture', 'scalability')),
+    (InterviewType.BEHAVIORAL, ('behavioral', 'culture fit', 'team fit')),
+    (InterviewType.PHONE_SCREEN, ('phone screen', 'phone interview', 'initial call')),
+    (InterviewType.HR_SCREENING, ('hr', 'recruiter', 'screening')),
+    (InterviewType.FINAL_ROUND, ('final', 'onsite', 'last round')),
+]
+INTERVIEW_KEYWORDS = ('interview', 'looking forward to speaking')
+
+COMPANY_DOMAIN_PATTERN = re.compile(r'@([a-zA-Z0-9-]+)\.(com|org|io|net)')
+COMPANY_BODY_PATTERN = re.compile(r'(?:at|with|from)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)')
+POSITION_PATTERNS = [
+    re.compile(r'(?:for|as)\s+(?:a|an|the)\s+([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))'),
+    re.compile(r'([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))\s+(?:position|role)'),
+]
+# One alternation for every conferencing provider, so the body is scanned once for links
+MEETING_LINK_PATTERN = re.compile(
+    r'https?://(?:[\w\-\.]+\.zoom\.us|meet\.google\.com|teams\.microsoft\.com|[\w\-\.]+\.webex\.com)/[^\s<>"]+'
+)
+# Starts with a literal so the regex engine can skip ahead; the leading day/month digits are checked by hand
+NUMERIC_DATE_TAIL_PATTERN = re.compile(r'/\d{1,2}/\d{4}')
+MONTH_DATE_PATTERN = re.compile(
+    r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'
+)
+
+
+def classify(subject: str, body: str) -> Tuple[InterviewType, bool]:
+    """Detect the interview type and whether the email looks like an interview"""
+    # Lowercase once for both checks; str containment is C-level and beats a
+    # pure-Python single-pass automaton by several times on real bodies
+    text = (subject + " " + body).lower()
+    interview_type = next(
+        (interview_type for interview_type, keywords in TYPE_KEYWORDS if any(keyword in text for keyword in keywords)),
+        InterviewType.OTHER
+    )
+    return interview_type, any(keyword in text for keyword in INTERVIEW_KEYWORDS)
+
+
+def extract_company(sender: str, body: str) -> str:
+    """Extract company name from the sender domain, else from the body"""
+    match = COMPANY_DOMAIN_PATTERN.search(sender)
+    if match:
+        # Clean up common variations
+        company = match.group(1).replace('mail', '').replace('hr', '').replace('jobs', '')
+        if company:
+            return company.capitalize()
+    
+    match = COMPANY_BODY_PATTERN.search(body)
+    if match:
+        return match.group(1)
+    
+    return "Unknown Company"
+
+
+def extract_position(subject: str, body: str) -> str:
+    """Extract job position from email"""
+    text = subject + " " + body
+    for pattern in POSITION_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+    
+    return "Unknown Position"
+
+
+def extract_meeting_link(body: str) -> Optional[str]:
+    """Extract the first video conferencing link from the body"""
+    match = MEETING_LINK_PATTERN.search(body)
+    return match.group(0) if match else None
+
+
+def find_date_text(body: str) -> Optional[str]:
+    """Find the first date written as M/D/YYYY or 'Month D, YYYY'"""
+    for match in NUMERIC_DATE_TAIL_PATTERN.finditer(body):
+        start = match.start()
+        if start and body[start - 1].isdigit():
+            if start > 1 and body[start - 2].isdigit():
+                start -= 1
+            return body[start - 1:match.end()]
+    
+    match = MONTH_DATE_PATTERN.search(body)
+    return match.group(0) if match else None
+
+
+def extract_date(body: str) -> Optional[datetime]:
+    """Extract interview date from email body"""
+    # Dates are only detected, not parsed yet; keep the one-week placeholder
+    if find_date_text(body):
+        return datetime.now() + timedelta(days=7)
+    return None
+
+
+def extract_details(subject: str, sender: str, body: str) -> Dict:
+    """Run every extractor over an email"""
+    interview_type, is_interview = classify(subject, body)
+    return {
+        'interview_type': interview_type,
+        'is_interview': is_interview,
+        'company': extract_company(sender, body),
+        'position': extract_position(subject, body),
+        'interview_date': extract_date(body),
+        'meeting_link': extract_meeting_link(body)
+    }
@@ -0,0 +1,171 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+
+def _http_error(status: int, reason: str) -> HttpError:
+    resp = Response({'status': status})
+    resp.reason = reason
+    return HttpError(resp, json.dumps({'error': {'code': status, 'message': reason}}).encode())
+
+
+class FakeRequest:
+    """A deferred call, executed on its own or as part of a batch"""
+    
+    def __init__(self, calendar: "FakeCalendar", handler: Callable[[], Dict]):
+        self.calendar = calendar
+        self.handler = handler
+        self.headers: Dict[str, str] = {}
+    
+    def execute(self) -> Dict:
+        self.calendar.round_trips += 1
+        return self.handler()
+
+
+class FakeBatchRequest:
+    """Runs queued requests in one simulated round trip, like BatchHttpRequest"""
+    
+    def __init__(self, calendar: "FakeCalendar", callback: Optional[Callable] = None):
+        self.calendar = calendar
+        self.callback = callback
+        self.requests: List[Tuple[str, FakeRequest, Optional[Callable]]] = []
+    
+    def add(self, request: FakeRequest, callback: Optional[Callable] = None, request_id: Optional[str] = None):
+        self.requests.append((request_id or str(len(self.requests) + 1), request, callback))
+    
+    def execute(self):
+        self.calendar.round_trips += 1
+        for request_id, request, callback in self.requests:
+            callback = callback or self.callback
+            try:
+                response, exception = request.handler(), None
+            except HttpError as error:
+                response, exception = None, error
+            if callback:
+                callback(request_id, response, exception)
+
+
+class FakeEvents:
+    """The events() resource of FakeCalendar"""
+    
+    def __init__(self, calendar: "FakeCalendar"):
+        self.calendar = calendar
+    
+    def insert(self, calendarId: str, body: Dict) -> FakeRequest:
+        return FakeRequest(self.calendar, lambda: self.calendar._insert(body))
+    
+    def get(self, calendarId: str, eventId: str) -> FakeRequest:
+        return FakeRequest(self.calendar, lambda: self.calendar._get(eventId))
+    
+    def patch(self, calendarId: str, eventId: str, body: Dict) -> FakeRequest:
+        request = FakeRequest(
+            self.calendar,
+            lambda: self.calendar._patch(eventId, body, request.headers.get('If-Match'))
+        )
+        return request
+    
+    def delete(self, calendarId: str, eventId: str) -> FakeRequest:
+        return FakeRequest(self.calendar, lambda: self.calendar._delete(eventId))
+
+
+class FakeFreebusy:
+    """The freebusy() resource of FakeCalendar"""
+    
+    def __init__(self, calendar: "FakeCalendar"):
+        self.calendar = calendar
+    
+    def query(self, body: Dict) -> FakeRequest:
+        return FakeRequest(self.calendar, lambda: self.calendar._freebusy(body))
+
+
+class FakeCalendar:
+    """
+    In-memory stand-in for the Calendar v3 client
+    
+    Used in mock mode and for exercising the batch paths without network access.
+    round_trips counts simulated HTTP calls; a batch counts as one. Free/busy
+    answers come from a deterministic synthetic schedule plus inserted events.
+    """
+    
+    def __init__(self):
+        self.events_by_id: Dict[str, Dict] = {}
+        self.round_trips = 0
+        self.revision = 0
+    
+    def events(self) -> FakeEvents:
+        return FakeEvents(self)
+    
+    def freebusy(self) -> FakeFreebusy:
+        return FakeFreebusy(self)
+    
+    def new_batch_http_request(self, callback: Optional[Callable] = None) -> FakeBatchRequest:
+        return FakeBatchRequest(self, callback)
+    
+    def _insert(self, body: Dict) -> Dict:
+        # Same deterministic ID scheme as CalendarService._create_mock_event
+        event_id = hashlib.md5(f"{body['summary']}_{body['start']['dateTime']}".encode()).hexdigest()[:16]
+        event = {**body, 'id': event_id, 'etag': self._next_etag(event_id), 'status': 'confirmed'}
+        self.events_by_id[event_id] = event
+        return dict(event)
+    
+    def _get(self, event_id: str) -> Dict:
+        if event_id not in self.events_by_id:
+            raise _http_error(404, "Not Found")
+        return dict(self.events_by_id[event_id])
+    
+    def _patch(self, event_id: str, body: Dict, if_match: Optional[str] = None) -> Dict:
+        if event_id not in self.events_by_id:
+            raise _http_error(404, "Not Found")
+        event = self.events_by_id[event_id]
+        if if_match and if_match != event['etag']:
+            raise _http_error(412, "Precondition Failed")
+        event.update(body)
+        event['etag'] = self._next_etag(event_id)
+        return dict(event)
+    
+    def _next_etag(self, event_id: str) -> str:
+        self.revision += 1
+        return f'"{event_id}-{self.revision}"'
+    
+    def _delete(self, event_id: str) -> Dict:
+        if self.events_by_id.pop(event_id, None) is None:
+            raise _http_error(410, "Resource has been deleted")
+        return {}
+    
+    def synthetic_busy(self, day: datetime) -> List[Tuple[datetime, datetime]]:
+        """Repeatable busy times for a day: work hours on weekdays, an evening commitment every third day"""
+        midnight = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        busy = []
+        if midnight.weekday() < 5:
+            busy.append((midnight + timedelta(hours=9), midnight + timedelta(hours=17)))
+        if midnight.toordinal() % 3 == 0:
+            busy.append((midnight + timedelta(hours=19), midnight + timedelta(hours=20)))
+        return busy
+    
+    def _freebusy(self, body: Dict) -> Dict:
+        time_min = datetime.fromisoformat(body['timeMin'].rstrip('Z'))
+        time_max = datetime.fromisoformat(body['timeMax'].rstrip('Z'))
+        
+        busy = []
+        day = time_min
+        while day < time_max:
+            busy.extend(self.synthetic_busy(day))
+            day += timedelta(days=1)
+        for event in self.events_by_id.values():
+            busy.append((
+                datetime.fromisoformat(event['start']['dateTime']),
+                datetime.fromisoformat(event['end']['dateTime'])
+            ))
+        
+        busy = sorted((start, end) for start, end in busy if start < time_max and end > time_min)
+        return {
+            'timeMin': body['timeMin'],
+            'timeMax': body['timeMax'],
+            'calendars': {
+                item['id']: {'busy': [{'start': start.isoformat() + 'Z', 'end': end.isoformat() + 'Z'} for start, end in busy]}
+                for item in body.get('items', [])
+            }
+        }
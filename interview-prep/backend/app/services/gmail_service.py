@@ -1,16 +1,40 @@
-import base64
-import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Set, Tuple
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from app.config import settings
 from app.models import InterviewType
+from app.services.email_body import extract_body
+from app.services.email_classifier import extract_details
 import logging
 
 logger = logging.getLogger(__name__)
 
+FETCH_STAT_FIELDS = ("candidates", "full_fetches", "full_fetches_saved", "failed_fetches")
+_fetch_totals = dict.fromkeys(FETCH_STAT_FIELDS, 0)
+_fetch_totals_lock = threading.Lock()
+
+
+def record_fetch_stats(stats: Dict[str, int]):
+    """Add one sync's fetch stats to the process-wide totals"""
+    with _fetch_totals_lock:
+        for field in FETCH_STAT_FIELDS:
+            _fetch_totals[field] += stats[field]
+
+
+def fetch_stats() -> Dict[str, int]:
+    """Process-wide totals of the messages syncs considered, fetched and left alone"""
+    with _fetch_totals_lock:
+        return dict(_fetch_totals)
+
+
+def get_header(headers: List[Dict], name: str) -> str:
+    """Value of the first header with the given name, or an empty string"""
+    name = name.lower()
+    return next((header['value'] for header in headers if header['name'].lower() == name), '')
+
 
 class GmailService:
     """Service for interacting with Gmail API"""
@@ -27,57 +51,236 @@ class GmailService:
                 logger.error(f"Failed to build Gmail service: {e}")
                 self.mock_mode = True
     
-    def get_interview_emails(self, max_results: int = 50) -> List[Dict]:
-        """Fetch emails that might contain interview invitations"""
+    INTERVIEW_QUERY = 'subject:(interview OR "interview invitation" OR "interview scheduled") OR body:(interview OR "looking forward to speaking")'
+    # History reports every added message; these never held an invitation to the user
+    HISTORY_SKIPPED_LABELS = frozenset(('SPAM', 'TRASH', 'DRAFT', 'SENT'))
+    # How far before the last sync the narrowing search looks, for mail whose
+    # date is older than its arrival (delayed delivery, imports, clock skew)
+    SEARCH_LOOKBACK = timedelta(days=2)
+    SEARCH_PAGE_SIZE = 500
+    
+    def sync_interview_emails(
+        self, start_history_id: Optional[str] = None, max_results: int = 50, since: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Fetch interview emails added since a history checkpoint
+        
+        Messages in the history are narrowed on the server by running
+        INTERVIEW_QUERY over the same period, so only those Gmail's subject and
+        body search matched are downloaded.
+        
+        Args:
+            start_history_id: Gmail historyId from the previous sync, if any
+            max_results: Maximum messages to fetch on a full sync
+            since: When start_history_id was recorded (naive UTC); without it the
+                narrowing search covers the whole mailbox
+        
+        Returns:
+            Dict with the parsed emails, the new historyId, whether a full sync ran
+            and fetch_stats (see _fetch_interview_emails). history_id is None unless
+            every listed message was fetched, so the caller keeps its old checkpoint
+            and the next sync retries instead of skipping what failed
+        """
         if self.mock_mode:
-            return self._get_mock_interview_emails()
+            emails = self._get_mock_interview_emails()
+            stats = dict.fromkeys(FETCH_STAT_FIELDS, 0)
+            stats.update(candidates=len(emails), full_fetches=len(emails))
+            return {'emails': emails, 'history_id': None, 'full_sync': True, 'fetch_stats': stats}
         
+        full_sync = True
         try:
-            # Search for emails with interview-related keywords
-            query = 'subject:(interview OR "interview invitation" OR "interview scheduled") OR body:(interview OR "looking forward to speaking")'
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
+            # Read the checkpoint before listing so nothing added mid-sync is skipped next time
+            history_id = self.service.users().getProfile(userId='me').execute().get('historyId')
             
-            messages = results.get('messages', [])
-            email_data = []
-            
-            for message in messages:
-                msg = self.service.users().messages().get(
+            message_ids = None
+            candidates = 0
+            if start_history_id:
+                added = self._get_message_ids_since(start_history_id)
+                if added is None:
+                    logger.info("Gmail history checkpoint expired, falling back to full sync")
+                else:
+                    full_sync = False
+                    candidates = len(added)
+                    matching = self._search_message_ids(since) if added else set()
+                    message_ids = [message_id for message_id in added if message_id in matching]
+            if message_ids is None:
+                message_ids = self._list_interview_message_ids(max_results)
+                candidates = len(message_ids)
+        except HttpError as error:
+            logger.error(f"An error occurred: {error}")
+            return {'emails': [], 'history_id': None, 'full_sync': full_sync, 'fetch_stats': None}
+        
+        emails, stats = self._fetch_interview_emails(message_ids, candidates)
+        if stats['failed_fetches']:
+            logger.warning(f"{stats['failed_fetches']} Gmail messages could not be fetched; keeping the previous checkpoint")
+            history_id = None
+        return {'emails': emails, 'history_id': history_id, 'full_sync': full_sync, 'fetch_stats': stats}
+    
+    def _get_message_ids_since(self, start_history_id: str) -> Optional[List[str]]:
+        """
+        List messages added after a historyId, or None if the checkpoint expired
+        
+        Spam, trash, drafts and the user's own sent mail are left out, using the
+        labels each history record carries for its message.
+        
+        Raises:
+            HttpError: for any failure other than an expired checkpoint
+        """
+        # A dict keeps first-seen order and makes the duplicate check O(1)
+        message_ids: Dict[str, None] = {}
+        page_token = None
+        
+        try:
+            while True:
+                results = self.service.users().history().list(
                     userId='me',
-                    id=message['id'],
-                    format='full'
+                    startHistoryId=start_history_id,
+                    historyTypes=['messageAdded'],
+                    pageToken=page_token
                 ).execute()
                 
-                parsed_email = self._parse_email(msg)
-                if parsed_email:
-                    email_data.append(parsed_email)
-            
-            return email_data
+                for record in results.get('history', []):
+                    for added in record.get('messagesAdded', []):
+                        message = added['message']
+                        if not self.HISTORY_SKIPPED_LABELS.intersection(message.get('labelIds', [])):
+                            message_ids[message['id']] = None
+                
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+        except HttpError as error:
+            # Gmail returns 404 once a historyId is too old to replay
+            if error.resp.status == 404:
+                return None
+            raise
         
+        return list(message_ids)
+    
+    def get_interview_emails(self, max_results: int = 50) -> List[Dict]:
+        """Fetch emails that might contain interview invitations"""
+        if self.mock_mode:
+            return self._get_mock_interview_emails()
+        
+        try:
+            message_ids = self._list_interview_message_ids(max_results)
         except HttpError as error:
             logger.error(f"An error occurred: {error}")
             return []
+        
+        emails, _ = self._fetch_interview_emails(message_ids, len(message_ids))
+        return emails
+    
+    def _search_message_ids(self, since: Optional[datetime]) -> Set[str]:
+        """IDs of every message INTERVIEW_QUERY matches since shortly before since (raises HttpError on failure)"""
+        query = f"({self.INTERVIEW_QUERY})"
+        if since:
+            after = (since - self.SEARCH_LOOKBACK).replace(tzinfo=timezone.utc)
+            query += f" after:{int(after.timestamp())}"
+        
+        message_ids = set()
+        page_token = None
+        while True:
+            results = self.service.users().messages().list(
+                userId='me',
+                q=query,
+                maxResults=self.SEARCH_PAGE_SIZE,
+                pageToken=page_token
+            ).execute()
+            message_ids.update(message['id'] for message in results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return message_ids
+    
+    def _list_interview_message_ids(self, max_results: int) -> List[str]:
+        """Search for emails with interview-related keywords (raises HttpError on failure)"""
+        results = self.service.users().messages().list(
+            userId='me',
+            q=self.INTERVIEW_QUERY,
+            maxResults=max_results
+        ).execute()
+        
+        return [message['id'] for message in results.get('messages', [])]
+    
+    def _fetch_interview_emails(self, message_ids: List[str], candidates: int) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Fetch and parse messages INTERVIEW_QUERY matched
+        
+        Returns:
+            (parsed emails, fetch stats) where the stats count the candidates the
+            sync considered, full fetches made, full_fetches_saved for candidates
+            the search ruled out, and failed_fetches for messages that could not
+            be fetched
+        """
+        emails = []
+        messages, failed_fetches = self._fetch_messages(message_ids)
+        for msg in messages:
+            parsed_email = self._parse_email(msg)
+            if parsed_email:
+                emails.append(parsed_email)
+        
+        stats = {
+            'candidates': candidates,
+            'full_fetches': len(message_ids),
+            'full_fetches_saved': candidates - len(message_ids),
+            'failed_fetches': failed_fetches
+        }
+        record_fetch_stats(stats)
+        return emails, stats
+    
+    def _fetch_messages(self, message_ids: List[str], format: str = 'full') -> Tuple[List[Dict], int]:
+        """
+        Fetch messages using Gmail batch requests instead of one call per message
+        
+        Returns:
+            (messages in the order given, number of messages that failed to fetch).
+            Messages deleted since they were listed are dropped without counting
+            as failures, since retrying them can never succeed.
+        """
+        fetched: Dict[str, Dict] = {}
+        deleted = set()
+        batch_size = max(1, min(settings.GMAIL_BATCH_SIZE, 100))  # Gmail caps batches at 100 calls
+        
+        def _collect(request_id, response, exception):
+            if exception is None:
+                fetched[request_id] = response
+            elif isinstance(exception, HttpError) and exception.resp.status == 404:
+                deleted.add(request_id)
+            else:
+                logger.error(f"Error fetching message {request_id}: {exception}")
+        
+        for start in range(0, len(message_ids), batch_size):
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for message_id in message_ids[start:start + batch_size]:
+                batch.add(
+                    self.service.users().messages().get(
+                        userId='me',
+                        id=message_id,
+                        format=format
+                    ),
+                    request_id=message_id
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error(f"An error occurred: {error}")
+        
+        # Preserve the order returned by the list call
+        messages = [fetched[message_id] for message_id in message_ids if message_id in fetched]
+        return messages, len(message_ids) - len(messages) - len(deleted)
     
     def _parse_email(self, message: Dict) -> Optional[Dict]:
         """Parse an email message to extract interview details"""
         try:
             headers = message['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), '')
-            sender = next((h['value'] for h in headers if h['name'].lower() == 'from'), '')
-            date = next((h['value'] for h in headers if h['name'].lower() == 'date'), '')
+            subject = get_header(headers, 'subject')
+            sender = get_header(headers, 'from')
+            date = get_header(headers, 'date')
             
             # Get email body
             body = self._get_email_body(message['payload'])
             
             # Extract interview details
-            interview_type = self._detect_interview_type(subject, body)
-            company = self._extract_company(sender, body)
-            position = self._extract_position(subject, body)
-            interview_date = self._extract_date(body)
-            meeting_link = self._extract_meeting_link(body)
+            details = extract_details(subject, sender, body)
             
             return {
                 'message_id': message['id'],
@@ -85,118 +288,20 @@ class GmailService:
                 'sender': sender,
                 'date': date,
                 'body': body,
-                'interview_type': interview_type,
-                'company': company,
-                'position': position,
-                'interview_date': interview_date,
-                'meeting_link': meeting_link
+                'interview_type': details['interview_type'],
+                'is_interview': details['is_interview'],
+                'company': details['company'],
+                'position': details['position'],
+                'interview_date': details['interview_date'],
+                'meeting_link': details['meeting_link']
             }
         except Exception as e:
             logger.error(f"Error parsing email: {e}")
             return None
     
     def _get_email_body(self, payload: Dict) -> str:
-        """Extract the body text from an email payload"""
-        body = ""
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body'].get('data', '')
-                    body = base64.urlsafe_b64decode(data).decode('utf-8')
-                    break
-        elif 'body' in payload:
-            data = payload['body'].get('data', '')
-            if data:
-                body = base64.urlsafe_b64decode(data).decode('utf-8')
-        return body
-    
-    def _detect_interview_type(self, subject: str, body: str) -> InterviewType:
-        """Detect the type of interview from email content"""
-        text = (subject + " " + body).lower()
-        
-        if any(keyword in text for keyword in ['technical', 'coding', 'algorithm', 'leetcode']):
-            return InterviewType.TECHNICAL
-        elif any(keyword in text for keyword in ['system design', 'architecture', 'scalability']):
-            return InterviewType.SYSTEM_DESIGN
-        elif any(keyword in text for keyword in ['behavioral', 'culture fit', 'team fit']):
-            return InterviewType.BEHAVIORAL
-        elif any(keyword in text for keyword in ['phone screen', 'phone interview', 'initial call']):
-            return InterviewType.PHONE_SCREEN
-        elif any(keyword in text for keyword in ['hr', 'recruiter', 'screening']):
-            return InterviewType.HR_SCREENING
-        elif any(keyword in text for keyword in ['final', 'onsite', 'last round']):
-            return InterviewType.FINAL_ROUND
-        else:
-            return InterviewType.OTHER
-    
-    def _extract_company(self, sender: str, body: str) -> str:
-        """Extract company name from email"""
-        # Try to extract from sender email domain
-        match = re.search(r'@([a-zA-Z0-9-]+)\.(com|org|io|net)', sender)
-        if match:
-            company = match.group(1)
-            # Clean up common variations
-            company = company.replace('mail', '').replace('hr', '').replace('jobs', '')
-            if company:
-                return company.capitalize()
-        
-        # Try to find company name in body
-        match = re.search(r'(?:at|with|from)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)', body)
-        if match:
-            return match.group(1)
-        
-        return "Unknown Company"
-    
-    def _extract_position(self, subject: str, body: str) -> str:
-        """Extract job position from email"""
-        # Look for common patterns
-        patterns = [
-            r'(?:for|as)\s+(?:a|an|the)\s+([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))',
-            r'([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))\s+(?:position|role)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, subject + " " + body)
-            if match:
-                return match.group(1).strip()
-        
-        return "Unknown Position"
-    
-    def _extract_date(self, body: str) -> Optional[datetime]:
-        """Extract interview date from email body"""
-        # This is a simplified version - in production you'd want more sophisticated date parsing
-        date_patterns = [
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, body)
-            if match:
-                try:
-                    # Basic date parsing - would need more robust implementation
-                    return datetime.now() + timedelta(days=7)  # Placeholder
-                except:
-                    pass
-        
-        return None
-    
-    def _extract_meeting_link(self, body: str) -> Optional[str]:
-        """Extract meeting link from email body"""
-        # Look for common video conferencing links
-        patterns = [
-            r'(https?://[\w\-\.]+\.zoom\.us/[^\s<>"]+)',
-            r'(https?://meet\.google\.com/[^\s<>"]+)',
-            r'(https?://teams\.microsoft\.com/[^\s<>"]+)',
-            r'(https?://[\w\-\.]+\.webex\.com/[^\s<>"]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, body)
-            if match:
-                return match.group(1)
-        
-        return None
+        """Extract the body text from an email payload, decoding at most GMAIL_BODY_MAX_BYTES"""
+        return extract_body(payload, settings.GMAIL_BODY_MAX_BYTES)
     
     def _get_mock_interview_emails(self) -> List[Dict]:
         """Return mock interview emails for testing"""
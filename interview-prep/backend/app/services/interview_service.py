@@ -0,0 +1,281 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from google.oauth2.credentials import Credentials
+from app import models
+from app.services.gmail_service import GmailService
+from app.services.calendar_service import CalendarService
+from app.services.ai_service import ai_service
+from app.services.analytics_service import INTERVIEW_ATTRS, apply_interview_changes, invalidate_dashboard
+from app.services.question_bank_service import QuestionBankService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_user_credentials(user: models.User) -> Optional[Credentials]:
+    """Get Google credentials for user"""
+    if not user.google_access_token:
+        return None
+    
+    return Credentials(
+        token=user.google_access_token,
+        refresh_token=user.google_refresh_token,
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=user.google_id,
+        client_secret=""
+    )
+
+
+def build_questions(interview_id: int, questions_data: List[Dict], start_index: int = 0) -> List[models.Question]:
+    """Build Question rows from generated question data"""
+    return [
+        models.Question(
+            interview_id=interview_id,
+            question_text=q_data['question_text'],
+            category=q_data['category'],
+            difficulty=q_data['difficulty'],
+            hints=q_data['hints'],
+            sample_answer=q_data['sample_answer'],
+            order_index=idx
+        )
+        for idx, q_data in enumerate(questions_data, start=start_index)
+    ]
+
+
+class InterviewService:
+    """Interview workflows shared by the API routes and background tasks"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def generate_questions(
+        self,
+        interview: models.Interview,
+        num_questions: int = 10,
+        use_cache: bool = True
+    ) -> List[models.Question]:
+        """Generate AI-powered questions for an interview and save them"""
+        question_bank = QuestionBankService(self.db)
+        
+        # Serve matching questions from the shared bank, then generate only the shortfall
+        questions_data = []
+        if use_cache:
+            questions_data = question_bank.find_questions(
+                interview.interview_type, interview.position, num_questions, interview.id
+            )
+        
+        shortfall = num_questions - len(questions_data)
+        if shortfall > 0:
+            generated = ai_service.generate_questions(
+                interview_type=interview.interview_type,
+                position=interview.position,
+                company=interview.company,
+                num_questions=shortfall,
+                use_cache=use_cache
+            )
+            question_bank.add_questions(generated, interview.interview_type, interview.position)
+            questions_data += generated
+        
+        # Save questions to database
+        db_questions = build_questions(interview.id, questions_data)
+        self.db.add_all(db_questions)
+        self.db.commit()
+        for q in db_questions:
+            self.db.refresh(q)
+        
+        return db_questions
+    
+    def sync_from_gmail(self, user: models.User) -> Dict:
+        """Sync interviews from Gmail"""
+        credentials = get_user_credentials(user)
+        gmail_service = GmailService(credentials)
+        
+        # The checkpoint is read as the sync starts, so this is when it was taken
+        started = datetime.utcnow()
+        sync_result = gmail_service.sync_interview_emails(
+            start_history_id=user.gmail_history_id, since=user.gmail_last_sync
+        )
+        emails = sync_result['emails']
+        
+        # Load already-synced message IDs in one query instead of one per email
+        message_ids = [email_data['message_id'] for email_data in emails]
+        existing_ids = set()
+        if message_ids:
+            existing_ids = {
+                row.gmail_message_id for row in self.db.query(models.Interview.gmail_message_id).filter(
+                    models.Interview.user_id == user.id,
+                    models.Interview.gmail_message_id.in_(message_ids)
+                )
+            }
+        
+        new_interviews = {}
+        for email_data in emails:
+            message_id = email_data['message_id']
+            if message_id in existing_ids or message_id in new_interviews or not email_data.get('interview_date'):
+                continue
+            
+            new_interviews[message_id] = {
+                'user_id': user.id,
+                'company': email_data['company'],
+                'position': email_data['position'],
+                'interview_type': email_data['interview_type'],
+                'scheduled_date': email_data['interview_date'],
+                'meeting_link': email_data.get('meeting_link'),
+                'recruiter_email': email_data['sender'],
+                'gmail_message_id': message_id,
+                'description': email_data['body'][:500]
+            }
+        
+        synced_count = 0
+        if new_interviews:
+            # The unique (user_id, gmail_message_id) index makes concurrent syncs skip rows instead of duplicating them
+            result = self.db.execute(
+                insert(models.Interview)
+                .values(list(new_interviews.values()))
+                .on_conflict_do_nothing(index_elements=['user_id', 'gmail_message_id'])
+                .returning(*(getattr(models.Interview, attr) for attr in INTERVIEW_ATTRS))
+            )
+            inserted = [dict(row) for row in result.mappings()]
+            synced_count = len(inserted)
+            apply_interview_changes(
+                self.db.connection(),
+                [(None, None, interview, None) for interview in inserted]
+            )
+        
+        # gmail_last_sync dates the stored checkpoint, bounding the next sync's search
+        if sync_result['history_id']:
+            user.gmail_history_id = sync_result['history_id']
+            user.gmail_last_sync = started
+        self.db.commit()
+        
+        # Core bulk inserts bypass the ORM events that normally maintain the rollups and invalidate the dashboard
+        if synced_count:
+            invalidate_dashboard(user.id)
+        
+        return {
+            "message": f"Synced {synced_count} interviews from Gmail",
+            "full_sync": sync_result['full_sync'],
+            "fetch_stats": sync_result['fetch_stats']
+        }
+    
+    def schedule_prep(
+        self,
+        interview: models.Interview,
+        user: models.User,
+        days_before: int = 3,
+        preferred_start_hour: Optional[int] = None,
+        preferred_end_hour: Optional[int] = None
+    ) -> Dict:
+        """Schedule prep sessions for an interview in free calendar time"""
+        blocks = self.create_prep_events(interview, user, days_before, preferred_start_hour, preferred_end_hour)
+        return self.save_prep_sessions(interview, user, blocks)
+    
+    def create_prep_events(
+        self,
+        interview: models.Interview,
+        user: models.User,
+        days_before: int = 3,
+        preferred_start_hour: Optional[int] = None,
+        preferred_end_hour: Optional[int] = None
+    ) -> List[Dict]:
+        """Create calendar events for prep blocks in free time, returning the created blocks"""
+        credentials = get_user_credentials(user)
+        calendar_service = CalendarService(credentials)
+        
+        interview_title = f"{interview.company} - {interview.position}"
+        return calendar_service.schedule_prep_blocks(
+            interview_date=interview.scheduled_date,
+            interview_title=interview_title,
+            days_before=days_before,
+            preferred_start_hour=preferred_start_hour,
+            preferred_end_hour=preferred_end_hour
+        )
+    
+    def save_prep_sessions(self, interview: models.Interview, user: models.User, blocks: List[Dict]) -> Dict:
+        """Store prep sessions for blocks whose calendar events already exist"""
+        # Store each block with the times the calendar event was created with
+        prep_sessions = [
+            models.PrepSession(
+                user_id=user.id,
+                interview_id=interview.id,
+                title=block['title'],
+                scheduled_start=block['start'],
+                scheduled_end=block['end'],
+                calendar_event_id=block['event_id'],
+                calendar_etag=block['etag']
+            )
+            for block in blocks
+        ]
+        self.db.add_all(prep_sessions)
+        self.db.commit()
+        
+        return {
+            "message": f"Scheduled {len(prep_sessions)} prep sessions",
+            "sessions": len(prep_sessions)
+        }
+    
+    def reschedule_prep(self, interview: models.Interview, user: models.User, shift: timedelta) -> Dict:
+        """
+        Move an interview's upcoming prep sessions by the same amount as the interview
+        
+        Calendar events are patched together in one batch, each conditional on its
+        stored ETag so edits made directly in the calendar are not overwritten.
+        A session whose event could not be updated keeps its old time, so the
+        database never claims a move the calendar did not make; its ID is
+        returned in calendar_failures.
+        
+        Commits the moved sessions, and should run after the interview's new date
+        is committed. If this commit fails, the events are patched back before the
+        error is raised, so the calendar never shows a move the database lost.
+        """
+        sessions = [
+            session for session in interview.prep_sessions
+            if session.status == models.PrepSessionStatus.SCHEDULED
+        ]
+        
+        linked = [session for session in sessions if session.calendar_event_id]
+        calendar = CalendarService(get_user_credentials(user))
+        results = {}
+        if linked:
+            results = calendar.update_events([
+                {
+                    'event_id': session.calendar_event_id,
+                    'etag': session.calendar_etag,
+                    'start': session.scheduled_start + shift,
+                    'end': session.scheduled_end + shift
+                }
+                for session in linked
+            ])
+        
+        rescheduled = 0
+        failures = []
+        moved_back = []
+        for session in sessions:
+            if session.calendar_event_id:
+                updated = results.get(session.calendar_event_id)
+                if not updated:
+                    failures.append(session.id)
+                    continue
+                moved_back.append({
+                    'event_id': session.calendar_event_id,
+                    'etag': updated.get('etag'),
+                    'start': session.scheduled_start,
+                    'end': session.scheduled_end
+                })
+                session.calendar_etag = updated.get('etag')
+            session.scheduled_start += shift
+            session.scheduled_end += shift
+            rescheduled += 1
+        
+        try:
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            if moved_back:
+                calendar.update_events(moved_back)
+            raise
+        
+        return {"rescheduled": rescheduled, "calendar_failures": failures}
@@ -0,0 +1,210 @@
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Optional, Set
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert
+from app import models
+from app.config import settings
+from app.models import InterviewType
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_question(text: str) -> str:
+    """Normalize question text so trivially different phrasings dedupe"""
+    return " ".join(TOKEN_PATTERN.findall(text.lower()))
+
+
+def _tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def question_hash(text: str) -> str:
+    """Key that banked and attached questions are deduplicated on"""
+    return hashlib.sha256(normalize_question(text).encode()).hexdigest()
+
+
+def _candidates_statement(interview_type: InterviewType, position: str, exclude_hashes: Set[str]) -> Optional[Select]:
+    """
+    Banked questions of the type that share a word with the position, best text match first
+    
+    The match runs on the GIN-indexed search_vector, so only relevant rows are
+    read; None when the position has no searchable words.
+    """
+    terms = sorted(set(_tokenize(position)))
+    if not terms:
+        return None
+    # Tokens are plain [a-z0-9]+ words, so OR-ing them is a valid tsquery
+    query = func.to_tsquery('english', ' | '.join(terms))
+    statement = select(models.QuestionBankEntry).where(
+        models.QuestionBankEntry.interview_type == interview_type,
+        models.QuestionBankEntry.search_vector.op('@@')(query)
+    )
+    if exclude_hashes:
+        statement = statement.where(models.QuestionBankEntry.normalized_hash.notin_(exclude_hashes))
+    return statement.order_by(
+        func.ts_rank(models.QuestionBankEntry.search_vector, query).desc(),
+        models.QuestionBankEntry.times_served.desc()
+    ).limit(settings.QUESTION_BANK_CANDIDATES)
+
+
+def _attached_statement(interview_id: int) -> Select:
+    return select(models.Question.question_text).where(models.Question.interview_id == interview_id)
+
+
+def _served_statement(selected: List[models.QuestionBankEntry]):
+    return (
+        update(models.QuestionBankEntry)
+        .where(models.QuestionBankEntry.id.in_([entry.id for entry in selected]))
+        .values(times_served=models.QuestionBankEntry.times_served + 1)
+    )
+
+
+def rank_candidates(
+    candidates: List[models.QuestionBankEntry],
+    position: str,
+    num_questions: int
+) -> List[models.QuestionBankEntry]:
+    """Up to num_questions candidates by TF-IDF cosine similarity to the position, above the minimum score"""
+    if not candidates:
+        return []
+    
+    documents = [
+        Counter(_tokenize(f"{entry.position or ''} {entry.category or ''} {entry.question_text}"))
+        for entry in candidates
+    ]
+    
+    # Inverse document frequency over the candidate set
+    document_frequency = Counter()
+    for tokens in documents:
+        document_frequency.update(tokens.keys())
+    idf = {
+        token: math.log((1 + len(documents)) / (1 + count)) + 1
+        for token, count in document_frequency.items()
+    }
+    
+    query = Counter(_tokenize(position))
+    query_vector = {token: count * idf.get(token, 0) for token, count in query.items()}
+    query_norm = math.sqrt(sum(weight * weight for weight in query_vector.values()))
+    if query_norm == 0:
+        return []
+    
+    scored = []
+    for entry, tokens in zip(candidates, documents):
+        vector = {token: count * idf[token] for token, count in tokens.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        dot = sum(weight * vector.get(token, 0) for token, weight in query_vector.items())
+        score = dot / (query_norm * norm) if norm else 0
+        if score >= settings.QUESTION_BANK_MIN_SCORE:
+            scored.append((score, entry))
+    
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [entry for _, entry in scored[:num_questions]]
+
+
+def _as_question(entry: models.QuestionBankEntry) -> Dict[str, any]:
+    return {
+        'question_text': entry.question_text,
+        'category': entry.category,
+        'difficulty': entry.difficulty,
+        'hints': entry.hints or [],
+        'sample_answer': entry.sample_answer
+    }
+
+
+class QuestionBankService:
+    """Shared, deduplicated bank of generated questions with TF-IDF lookup"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def find_questions(
+        self,
+        interview_type: InterviewType,
+        position: str,
+        num_questions: int,
+        interview_id: Optional[int] = None
+    ) -> List[Dict[str, any]]:
+        """Return up to num_questions banked questions relevant to the position, skipping ones the interview already has"""
+        exclude = set()
+        if interview_id is not None:
+            exclude = {question_hash(text) for text in self.db.execute(_attached_statement(interview_id)).scalars()}
+        
+        statement = _candidates_statement(interview_type, position, exclude)
+        if statement is None:
+            return []
+        selected = rank_candidates(self.db.execute(statement).scalars().all(), position, num_questions)
+        
+        if selected:
+            self.db.execute(_served_statement(selected))
+        return [_as_question(entry) for entry in selected]
+    
+    def add_questions(
+        self,
+        questions: List[Dict[str, any]],
+        interview_type: InterviewType,
+        position: str
+    ):
+        """Store newly generated questions, skipping ones already in the bank"""
+        rows = {}
+        for q in questions:
+            # Fallback questions are canned, not generated for this position
+            if q.get('fallback') or not q.get('question_text'):
+                continue
+            normalized_hash = question_hash(q['question_text'])
+            rows[normalized_hash] = {
+                'normalized_hash': normalized_hash,
+                'interview_type': interview_type,
+                'position': position,
+                'question_text': q['question_text'],
+                'category': q.get('category'),
+                'difficulty': q.get('difficulty'),
+                'hints': q.get('hints'),
+                'sample_answer': q.get('sample_answer'),
+                'times_served': 1
+            }
+        
+        if rows:
+            self.db.execute(
+                insert(models.QuestionBankEntry)
+                .values(list(rows.values()))
+                .on_conflict_do_nothing(index_elements=['interview_type', 'normalized_hash'])
+            )
+
+
+class AsyncQuestionBankService:
+    """QuestionBankService lookups for async route handlers"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def find_questions(
+        self,
+        interview_type: InterviewType,
+        position: str,
+        num_questions: int,
+        interview_id: Optional[int] = None
+    ) -> List[Dict[str, any]]:
+        """Same as QuestionBankService.find_questions; the TF-IDF scoring runs in a worker thread, off the event loop"""
+        exclude = set()
+        if interview_id is not None:
+            result = await self.db.execute(_attached_statement(interview_id))
+            exclude = {question_hash(text) for text in result.scalars()}
+        
+        statement = _candidates_statement(interview_type, position, exclude)
+        if statement is None:
+            return []
+        candidates = (await self.db.execute(statement)).scalars().all()
+        selected = await run_in_threadpool(rank_candidates, candidates, position, num_questions)
+        
+        if selected:
+            await self.db.execute(_served_statement(selected))
+        return [_as_question(entry) for entry in selected]
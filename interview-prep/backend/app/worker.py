@@ -0,0 +1,182 @@
+from datetime import datetime
+from celery import Celery
+from celery.utils import uuid
+from celery.utils.time import get_exponential_backoff_interval
+from typing import Dict, List, Optional
+from openai import APIConnectionError, InternalServerError, RateLimitError
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from app.cache import get_cache
+from app.config import settings
+from app.database import SessionLocal
+from app import models, schemas
+from app.services.interview_service import InterviewService
+import logging
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "interview_prep",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=24 * 60 * 60,
+    # Run tasks in-process (tests, local dev without Redis)
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_store_eager_result=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=False,
+)
+
+# Failures worth retrying: lost or busy DB connections, network errors, upstream overload.
+# Anything else (bad data, missing rows, bugs) fails the job on the first attempt.
+TRANSIENT_ERRORS = (
+    OperationalError,
+    PoolTimeoutError,
+    ConnectionError,
+    TimeoutError,
+    APIConnectionError,
+    RateLimitError,
+    InternalServerError,
+)
+
+# Retry transient failures (Google/OpenAI/DB hiccups) with exponential backoff
+RETRY_OPTIONS = {
+    "autoretry_for": TRANSIENT_ERRORS,
+    "retry_backoff": True,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "max_retries": 3,
+}
+
+# Who enqueued each job, so status lookups are limited to the owner in every state.
+# Shared through Redis like the broker, unless tasks run in-process.
+job_owners = get_cache(
+    "job_owners",
+    backend="memory" if settings.CELERY_TASK_ALWAYS_EAGER else "redis",
+    ttl_seconds=celery_app.conf.result_expires,
+    max_entries=10000
+)
+
+
+def enqueue(task, user_id: int, *args, **kwargs):
+    """Send a task on behalf of a user, recording the user as the job's owner first"""
+    job_id = uuid()
+    job_owners.set(job_id, user_id)
+    return task.apply_async((user_id, *args), kwargs, task_id=job_id)
+
+
+def get_job_owner(job_id: str) -> Optional[int]:
+    """ID of the user who enqueued a job, or None for unknown or expired jobs"""
+    return job_owners.get(job_id)
+
+
+def _get_user(db, user_id: int) -> models.User:
+    """Load a user, failing the task if the account was deleted"""
+    user = db.get(models.User, user_id)
+    if not user:
+        raise LookupError(f"User {user_id} not found")
+    return user
+
+
+def _get_interview(db, interview_id: int, user_id: int) -> models.Interview:
+    """Load an interview owned by the user, failing the task if it is gone"""
+    interview = db.query(models.Interview).filter(
+        models.Interview.id == interview_id,
+        models.Interview.user_id == user_id
+    ).first()
+    if not interview:
+        raise LookupError(f"Interview {interview_id} not found")
+    return interview
+
+
+@celery_app.task(name="interviews.sync_from_gmail", **RETRY_OPTIONS)
+def sync_from_gmail_task(user_id: int) -> dict:
+    """Sync interviews from Gmail in the background"""
+    db = SessionLocal()
+    try:
+        user = _get_user(db, user_id)
+        result = InterviewService(db).sync_from_gmail(user)
+        return {"user_id": user_id, **result}
+    finally:
+        db.close()
+
+
+@celery_app.task(name="interviews.generate_questions", **RETRY_OPTIONS)
+def generate_questions_task(user_id: int, interview_id: int, num_questions: int = 10, use_cache: bool = True) -> dict:
+    """Generate interview questions in the background"""
+    db = SessionLocal()
+    try:
+        interview = _get_interview(db, interview_id, user_id)
+        questions = InterviewService(db).generate_questions(interview, num_questions, use_cache)
+        return {
+            "user_id": user_id,
+            "questions": [
+                schemas.QuestionResponse.model_validate(q).model_dump(mode="json")
+                for q in questions
+            ]
+        }
+    finally:
+        db.close()
+
+
+@celery_app.task(name="interviews.schedule_prep", bind=True, **RETRY_OPTIONS)
+def schedule_prep_task(
+    self,
+    user_id: int,
+    interview_id: int,
+    days_before: int = 3,
+    preferred_start_hour: Optional[int] = None,
+    preferred_end_hour: Optional[int] = None,
+    blocks: Optional[List[Dict]] = None
+) -> dict:
+    """
+    Schedule prep sessions in the background
+    
+    Creating the calendar events must not be repeated: if saving the sessions
+    fails after the events exist, the retry carries the created blocks and
+    only saves them.
+    """
+    db = SessionLocal()
+    try:
+        user = _get_user(db, user_id)
+        interview = _get_interview(db, interview_id, user_id)
+        service = InterviewService(db)
+        
+        if blocks is None:
+            created = service.create_prep_events(
+                interview, user, days_before, preferred_start_hour, preferred_end_hour
+            )
+        else:
+            created = [
+                {**block, "start": datetime.fromisoformat(block["start"]), "end": datetime.fromisoformat(block["end"])}
+                for block in blocks
+            ]
+        
+        try:
+            result = service.save_prep_sessions(interview, user, created)
+        except TRANSIENT_ERRORS as e:
+            db.rollback()
+            logger.warning(f"Saving prep sessions for interview {interview_id} failed, retrying: {e}")
+            raise self.retry(
+                exc=e,
+                args=(user_id, interview_id),
+                kwargs={
+                    "days_before": days_before,
+                    "preferred_start_hour": preferred_start_hour,
+                    "preferred_end_hour": preferred_end_hour,
+                    "blocks": [
+                        {**block, "start": block["start"].isoformat(), "end": block["end"].isoformat()}
+                        for block in created
+                    ]
+                },
+                countdown=get_exponential_backoff_interval(
+                    factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+                )
+            )
+        return {"user_id": user_id, **result}
+    finally:
+        db.close()
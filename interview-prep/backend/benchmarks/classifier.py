@@ -0,0 +1,174 @@
+"""
+Email classifier benchmark: emails/sec over a synthetic recruiter corpus
+
+Generates a seeded corpus of short interview invitations, recruiter
+follow-ups without dates and long newsletter-style bodies, then times
+email_classifier.extract_details against the per-method re.search scans
+GmailService used before, and checks that both agree on every email.
+
+Usage:
+    python -m benchmarks.classifier [--emails 100000] [--seed 0]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List, Tuple
+from app.models import InterviewType
+from app.services.email_classifier import extract_details
+
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+ROLES = ("Software Engineer", "Data Analyst", "Product Manager", "Frontend Developer", "UX Designer")
+TYPE_PHRASES = (
+    "a technical interview with live coding",
+    "a system design interview about scalability",
+    "a behavioral interview to check culture fit",
+    "a phone screen",
+    "an initial call with our recruiter",
+    "the final onsite round",
+    "a chat with the team",
+)
+LINKS = (
+    "https://acme.zoom.us/j/{n}?pwd=abc",
+    "https://meet.google.com/abc-{n}-xyz",
+    "https://teams.microsoft.com/l/meetup-join/{n}",
+    "https://acme.webex.com/meet/{n}",
+    "",
+)
+MONTHS = ("January", "March", "June", "September", "December")
+FILLER = (
+    "Here is what happened in your network this week. Several people viewed your profile and "
+    "new jobs matching your saved searches were posted. Read our latest articles on careers, "
+    "salaries and remote work, and manage your notification settings at any time. "
+)
+
+
+def make_corpus(count: int, seed: int) -> List[Tuple[str, str, str]]:
+    """(subject, sender, body) triples: 40% invitations, 20% follow-ups, 40% ~5 KB newsletters"""
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(count):
+        company, role = rng.choice(COMPANIES), rng.choice(ROLES)
+        kind = rng.random()
+        if kind < 0.4:
+            date = rng.choice((
+                f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/2030",
+                f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2030",
+            ))
+            body = (
+                f"Hi Ada,\n\nThanks for applying for the {role} position at {company}. We would like to invite "
+                f"you to {rng.choice(TYPE_PHRASES)} on {date}. {rng.choice(LINKS).format(n=n)}\n\n"
+                f"Looking forward to speaking with you,\nThe {company} team"
+            )
+            corpus.append((f"Interview invitation: {role}", f"talent@{company.split()[0].lower()}.com", body))
+        elif kind < 0.6:
+            body = (
+                f"Hi Ada, following up on your application as a {role} with {company}. "
+                f"Could you share your availability next week? Best, Sam"
+            )
+            corpus.append((f"Your application at {company}", f"sam@{company.split()[0].lower()}mail.io", body))
+        else:
+            body = FILLER * 20
+            corpus.append((f"Your weekly digest #{n}", "digest@news.example.net", body))
+    return corpus
+
+
+def legacy_details(subject: str, sender: str, body: str) -> Dict:
+    """The scans GmailService ran before the classifier, one re.search and lowercase per check"""
+    text = (subject + " " + body).lower()
+    type_keywords = (
+        (InterviewType.TECHNICAL, ['technical', 'coding', 'algorithm', 'leetcode']),
+        (InterviewType.SYSTEM_DESIGN, ['system design', 'architecture', 'scalability']),
+        (InterviewType.BEHAVIORAL, ['behavioral', 'culture fit', 'team fit']),
+        (InterviewType.PHONE_SCREEN, ['phone screen', 'phone interview', 'initial call']),
+        (InterviewType.HR_SCREENING, ['hr', 'recruiter', 'screening']),
+        (InterviewType.FINAL_ROUND, ['final', 'onsite', 'last round']),
+    )
+    interview_type = next(
+        (interview_type for interview_type, keywords in type_keywords if any(keyword in text for keyword in keywords)),
+        InterviewType.OTHER
+    )
+    is_interview = any(keyword in (subject + " " + body).lower() for keyword in ['interview', 'looking forward to speaking'])
+    
+    company = None
+    match = re.search(r'@([a-zA-Z0-9-]+)\.(com|org|io|net)', sender)
+    if match:
+        company = match.group(1).replace('mail', '').replace('hr', '').replace('jobs', '').capitalize() or None
+    if company is None:
+        match = re.search(r'(?:at|with|from)\s+([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)', body)
+        company = match.group(1) if match else "Unknown Company"
+    
+    position = "Unknown Position"
+    for pattern in (
+        r'(?:for|as)\s+(?:a|an|the)\s+([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))',
+        r'([A-Z][a-zA-Z\s]+(?:Engineer|Developer|Manager|Analyst|Designer))\s+(?:position|role)',
+    ):
+        match = re.search(pattern, subject + " " + body)
+        if match:
+            position = match.group(1).strip()
+            break
+    
+    has_date = any(re.search(pattern, body) for pattern in (
+        r'(\d{1,2}/\d{1,2}/\d{4})',
+        r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}',
+    ))
+    
+    meeting_link = None
+    for pattern in (
+        r'(https?://[\w\-\.]+\.zoom\.us/[^\s<>"]+)',
+        r'(https?://meet\.google\.com/[^\s<>"]+)',
+        r'(https?://teams\.microsoft\.com/[^\s<>"]+)',
+        r'(https?://[\w\-\.]+\.webex\.com/[^\s<>"]+)',
+    ):
+        match = re.search(pattern, body)
+        if match:
+            meeting_link = match.group(1)
+            break
+    
+    return {
+        'interview_type': interview_type,
+        'is_interview': is_interview,
+        'company': company,
+        'position': position,
+        'has_date': has_date,
+        'meeting_link': meeting_link
+    }
+
+
+def comparable(details: Dict) -> Tuple:
+    has_date = details['has_date'] if 'has_date' in details else details['interview_date'] is not None
+    return (
+        details['interview_type'], details['is_interview'], details['company'],
+        details['position'], has_date, details['meeting_link']
+    )
+
+
+def throughput(extract: Callable, corpus: List[Tuple[str, str, str]]) -> float:
+    """Emails per second for one pass over the corpus"""
+    started = time.perf_counter()
+    for subject, sender, body in corpus:
+        extract(subject, sender, body)
+    return len(corpus) / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per implementation; the best is reported")
+    args = parser.parse_args(argv)
+    
+    corpus = make_corpus(args.emails, args.seed)
+    mismatches = sum(
+        comparable(extract_details(*email)) != comparable(legacy_details(*email)) for email in corpus
+    )
+    megabytes = sum(len(body) for _, _, body in corpus) / 1e6
+    print(f"{len(corpus)} emails, {megabytes:.1f} MB of body text, {mismatches} disagreements\n")
+    
+    for name, extract in (("legacy re.search", legacy_details), ("email_classifier", extract_details)):
+        best = max(throughput(extract, corpus) for _ in range(args.repeat))
+        print(f"  {name:<18} {best:>10,.0f} emails/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Shared helpers for the benchmark scripts"""
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List
+from sqlalchemy import create_engine, text
+
+
+def bench_engine():
+    """Engine on BENCH_DATABASE_URL with an empty public schema; the schema is dropped, so use a scratch database"""
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        sys.exit("Set BENCH_DATABASE_URL to a scratch PostgreSQL database (its public schema is dropped)")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    return engine
+
+
+def timed(function: Callable, repeat: int = 1) -> List[float]:
+    """Wall times in milliseconds of calling function repeat times"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def summarize(times: List[float]) -> str:
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50 {statistics.median(ordered):8.2f} ms  p95 {p95:8.2f} ms"
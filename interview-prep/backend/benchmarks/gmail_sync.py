@@ -0,0 +1,251 @@
+"""
+Gmail sync benchmark: an incremental sync's requests, full fetches and wall time
+
+Serves a minimal Gmail v1 API (profile, history, search, messages and the
+batch endpoint) from a local HTTP server that adds a fixed latency to every
+HTTP request, and points the real Google API client at it. Every message in
+the mailbox counts as added since the checkpoint. Three ways of syncing them
+are timed:
+
+- sequential: one messages.get per message, as before batching
+- metadata-first: a batched metadata pass over every message, then full
+  fetches for those whose subject or snippet mention an interview or whose
+  snippet might be cut short (150+ characters)
+- search-narrowed: GmailService.sync_interview_emails, which fetches only the
+  messages Gmail's own search matched
+
+Snippets are the first 200 characters of the body, as Gmail's are.
+
+Usage:
+    python -m benchmarks.gmail_sync [--sizes 50 500 5000] [--latency-ms 20]
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from app.services.email_classifier import classify
+from app.services.gmail_service import GmailService, get_header
+
+HISTORY_PAGE_SIZE = 500
+SEARCH_TERMS = ("interview", "looking forward to speaking")
+# What the metadata-first pass took to be a whole body rather than a cut-off snippet
+COMPLETE_SNIPPET_CHARS = 150
+MESSAGE_PATH = re.compile(r"^/gmail/v1/users/me/messages/([^/]+)$")
+
+
+def make_messages(count: int) -> Dict[str, Dict]:
+    """Synthetic inbox: a quarter interview invitations, a quarter short notes, half long newsletters"""
+    messages = {}
+    for i in range(count):
+        if i % 4 == 0:
+            subject = f"Interview invitation - Engineer {i}"
+            body = f"Hi, we would like to schedule a technical interview on 3/14/2030 at 10:00 AM. https://zoom.us/j/{i}"
+        elif i % 4 == 1:
+            subject = f"Lunch on Friday? {i}"
+            body = "Are you free for lunch on Friday? The usual place at noon."
+        else:
+            subject = f"Your weekly digest {i}"
+            body = "Here is what happened in your network this week. " * 20
+        message_id = f"m{i}"
+        messages[message_id] = {
+            'id': message_id,
+            'snippet': body[:200],
+            'sizeEstimate': 1000 + len(body),
+            'payload': {
+                'mimeType': 'text/plain',
+                'headers': [
+                    {'name': 'Subject', 'value': subject},
+                    {'name': 'From', 'value': 'recruiter@acme.com'},
+                    {'name': 'Date', 'value': 'Mon, 1 Jan 2024 10:00:00 +0000'},
+                ],
+                'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()},
+            },
+        }
+    return messages
+
+
+class FakeGmailServer(ThreadingHTTPServer):
+    """Local Gmail API stand-in; latency is added once per HTTP request, batch or not"""
+    
+    daemon_threads = True
+    
+    def __init__(self, messages: Dict[str, Dict], latency: float):
+        super().__init__(("127.0.0.1", 0), FakeGmailHandler)
+        self.messages = messages
+        self.latency = latency
+        self.requests = 0
+    
+    @property
+    def root_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+    
+    def route(self, path: str) -> Tuple[int, Dict]:
+        url = urlsplit(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/gmail/v1/users/me/profile":
+            return 200, {'historyId': "200"}
+        if url.path == "/gmail/v1/users/me/messages":
+            # Stands in for INTERVIEW_QUERY: subject or body mentions an interview
+            ids = [message_id for message_id, message in self.messages.items() if self.matches(message)]
+            start = int(query.get('pageToken', 0))
+            size = int(query.get('maxResults', 100))
+            page = {'messages': [{'id': message_id} for message_id in ids[start:start + size]]}
+            if start + size < len(ids):
+                page['nextPageToken'] = str(start + size)
+            return 200, page
+        if url.path == "/gmail/v1/users/me/history":
+            # Every message counts as added since the checkpoint, HISTORY_PAGE_SIZE per page
+            ids = list(self.messages)
+            start = int(query.get('pageToken', 0))
+            page = {'history': [
+                {'messagesAdded': [{'message': {'id': message_id}}]}
+                for message_id in ids[start:start + HISTORY_PAGE_SIZE]
+            ]}
+            if start + HISTORY_PAGE_SIZE < len(ids):
+                page['nextPageToken'] = str(start + HISTORY_PAGE_SIZE)
+            return 200, page
+        match = MESSAGE_PATH.match(url.path)
+        if match and match.group(1) in self.messages:
+            message = self.messages[match.group(1)]
+            if query.get('format') == 'metadata':
+                return 200, {
+                    'id': message['id'],
+                    'snippet': message['snippet'],
+                    'sizeEstimate': message['sizeEstimate'],
+                    'payload': {'headers': message['payload']['headers']},
+                }
+            return 200, message
+        return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+    
+    @staticmethod
+    def matches(message: Dict) -> bool:
+        subject = get_header(message['payload']['headers'], 'subject')
+        body = base64.urlsafe_b64decode(message['payload']['body']['data']).decode()
+        text = f"{subject} {body}".lower()
+        return any(term in text for term in SEARCH_TERMS)
+
+
+class FakeGmailHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _respond(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+        status, payload = self.server.route(self.path)
+        self._respond(status, "application/json", json.dumps(payload).encode())
+    
+    def do_POST(self):
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+        content = self.rfile.read(int(self.headers["Content-Length"]))
+        request = BytesParser().parsebytes(f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + content)
+        
+        boundary = "batch_boundary"
+        parts = []
+        for part in request.get_payload():
+            request_line = part.get_payload().splitlines()[0]
+            status, payload = self.server.route(request_line.split(" ")[1])
+            content_id = part["Content-ID"].strip("<>")
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        body = ("".join(parts) + f"--{boundary}--\r\n").encode()
+        self._respond(200, f"multipart/mixed; boundary={boundary}", body)
+
+
+def gmail_client(server: FakeGmailServer):
+    """The real discovery-based Gmail client, with its root URL pointed at the fake server"""
+    document = json.loads(get_static_doc("gmail", "v1"))
+    document['rootUrl'] = server.root_url
+    return build_from_document(document, http=httplib2.Http())
+
+
+def sync_narrowed(server: FakeGmailServer) -> Tuple[int, int]:
+    service = GmailService(mock_mode=False)
+    service.service = gmail_client(server)
+    result = service.sync_interview_emails(start_history_id="100")
+    return sum(email['is_interview'] for email in result['emails']), result['fetch_stats']['full_fetches']
+
+
+def sync_metadata_first(server: FakeGmailServer) -> Tuple[int, int]:
+    """Metadata for every message, then full bodies unless the snippet rules an interview out"""
+    service = GmailService(mock_mode=False)
+    service.service = gmail_client(server)
+    message_ids = service._get_message_ids_since("100")
+    metadata, _ = service._fetch_messages(message_ids, format='metadata')
+    selected = [
+        message['id'] for message in metadata
+        if classify(get_header(message['payload']['headers'], 'subject'), message['snippet'])[1]
+        or len(message['snippet']) >= COMPLETE_SNIPPET_CHARS
+    ]
+    messages, _ = service._fetch_messages(selected)
+    emails = [email for email in map(service._parse_email, messages) if email and email['is_interview']]
+    return len(emails), len(selected)
+
+
+def sync_sequential(server: FakeGmailServer) -> Tuple[int, int]:
+    """The pre-batching fetch: list the IDs, then one messages.get per message"""
+    service = GmailService(mock_mode=False)
+    service.service = client = gmail_client(server)
+    message_ids = service._get_message_ids_since("100")
+    messages = [client.users().messages().get(userId='me', id=message_id, format='full').execute() for message_id in message_ids]
+    return sum(email['is_interview'] for email in map(service._parse_email, messages) if email), len(message_ids)
+
+
+def run(size: int, latency: float, sync) -> Tuple[float, int, int, int]:
+    """Wall time in seconds, interview emails found, full fetches and HTTP requests made by one sync"""
+    server = FakeGmailServer(make_messages(size), latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        started = time.perf_counter()
+        found, full_fetches = sync(server)
+        return time.perf_counter() - started, found, full_fetches, server.requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency the fake server adds to each HTTP request")
+    args = parser.parse_args(argv)
+    latency = args.latency_ms / 1000
+    
+    print(f"{args.latency_ms:g} ms per HTTP request\n")
+    print(f"{'messages':>8}  {'mode':<15} {'requests':>8} {'full fetches':>12} {'saved':>6} {'interviews':>10} {'seconds':>8}")
+    for size in args.sizes:
+        for mode, sync in (
+            ("sequential", sync_sequential), ("metadata-first", sync_metadata_first), ("search-narrowed", sync_narrowed)
+        ):
+            seconds, found, full_fetches, requests = run(size, latency, sync)
+            print(
+                f"{size:>8}  {mode:<15} {requests:>8} {full_fetches:>12} {size - full_fetches:>6} "
+                f"{found:>10} {seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
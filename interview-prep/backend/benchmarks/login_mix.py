@@ -0,0 +1,171 @@
+"""
+Mixed traffic benchmark: logins alongside dashboard reads
+
+Drives /api/auth/login and /api/analytics/dashboard concurrently through one
+in-process app, once with bcrypt in the password process pool and once with
+bcrypt on the request threadpool as before, and reports dashboard latency,
+completed logins and 503s for each. A dashboard-only run gives the baseline.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.login_mix [--logins 16] [--readers 8] [--seconds 10]
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Tuple
+import anyio
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app import auth, models, passwords
+from app.cache import MemoryCache
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.routers import analytics, auth as auth_router
+from app.services import analytics_service
+from benchmarks.common import bench_engine, summarize
+
+PASSWORD = "correct horse battery staple"
+
+
+def load(engine, users: int, interviews_per_user: int):
+    """Users sharing one password hash at the configured cost, each with an interview history"""
+    hashed = passwords.hash_password_sync(PASSWORD)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, email, hashed_password, is_active) "
+            "SELECT u, 'bench' || u || '@example.com', :hashed, true FROM generate_series(1, :users) AS u"
+        ), {"hashed": hashed, "users": users})
+        connection.execute(text(
+            "INSERT INTO interviews (user_id, company, position, interview_type, status, scheduled_date) "
+            "SELECT u, 'Company ' || (n % 50), 'Engineer', "
+            "(enum_range(NULL::interviewtype))[1 + (u + n) % 8], 'COMPLETED'::interviewstatus, "
+            "timestamp '2024-01-01' + n * interval '1 day' "
+            "FROM generate_series(1, :users) AS u CROSS JOIN generate_series(1, :per_user) AS n"
+        ), {"users": users, "per_user": interviews_per_user})
+
+
+def build_app(engine) -> Tuple[FastAPI, AsyncEngine]:
+    """The auth and analytics routers on the benchmark database; the async engine belongs to the running loop"""
+    async_engine = create_async_engine(engine.url.set(drivername="postgresql+asyncpg"), pool_size=20)
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    session = sessionmaker(bind=engine)
+    
+    def get_bench_db():
+        db = session()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    async def get_bench_async_db():
+        async with async_session() as db:
+            yield db
+    
+    app = FastAPI()
+    app.include_router(auth_router.router)
+    app.include_router(analytics.router)
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_async_db] = get_bench_async_db
+    return app, async_engine
+
+
+async def drive(app: FastAPI, users: int, logins: int, readers: int, seconds: float) -> Dict[str, List]:
+    """Run login and dashboard clients in parallel for the given time"""
+    results = {"dashboard": [], "login": [], "rejected": []}
+    deadline = time.perf_counter() + seconds
+    tokens = [auth.create_access_token({"sub": str(user_id)}) for user_id in range(1, users + 1)]
+    
+    async def login_client(client: AsyncClient, worker: int):
+        n = worker
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/auth/login",
+                data={"username": f"bench{n % users + 1}@example.com", "password": PASSWORD}
+            )
+            if response.status_code == 503:
+                results["rejected"].append(1)
+                await asyncio.sleep(0.05)
+            else:
+                response.raise_for_status()
+                results["login"].append((time.perf_counter() - started) * 1000)
+            n += logins
+    
+    async def dashboard_client(client: AsyncClient, worker: int):
+        n = worker
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(
+                "/api/analytics/dashboard", headers={"Authorization": f"Bearer {tokens[n % users]}"}
+            )
+            response.raise_for_status()
+            results["dashboard"].append((time.perf_counter() - started) * 1000)
+            n += readers
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await asyncio.gather(
+            *(login_client(client, i) for i in range(logins)),
+            *(dashboard_client(client, i) for i in range(readers))
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--interviews-per-user", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent dashboard clients")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    
+    engine = bench_engine()
+    models.Base.metadata.create_all(engine)
+    load(engine, args.users, args.interviews_per_user)
+    # Every dashboard read should reach the database, and no run should depend on Redis
+    models.user_cache = MemoryCache("users", 10000, settings.USER_CACHE_TTL_SECONDS)
+    analytics_service.dashboard_cache = MemoryCache("dashboard", 1, 0)
+    analytics_service.dashboard_cache.get = lambda key: None
+    async def threadpool_run(func, *args):
+        return await run_in_threadpool(func, *args)
+    
+    process_pool_run = passwords._run
+    print(
+        f"bcrypt cost {settings.BCRYPT_ROUNDS}, {settings.PASSWORD_HASH_WORKERS} hash workers, "
+        f"{args.logins} login clients, {args.readers} dashboard clients, {args.seconds:g}s per run\n"
+    )
+    runs = (
+        ("warm-up", process_pool_run, 0),
+        ("no logins", process_pool_run, 0),
+        ("threadpool", threadpool_run, args.logins),
+        ("process pool", process_pool_run, args.logins),
+    )
+    for mode, run, logins in runs:
+        passwords._run = run
+        
+        async def measure():
+            anyio.to_thread.current_default_thread_limiter().total_tokens = 40
+            app, async_engine = build_app(engine)
+            try:
+                return await drive(app, args.users, logins, args.readers, args.seconds)
+            finally:
+                await async_engine.dispose()
+        
+        results = anyio.run(measure)
+        if mode == "warm-up":
+            continue
+        print(f"{mode}")
+        print(f"  dashboard  {len(results['dashboard']):>6} reads   {summarize(results['dashboard'])}")
+        if logins:
+            print(f"  login      {len(results['login']):>6} logins  {summarize(results['login'])}")
+            print(f"  rejected   {len(results['rejected']):>6} (503)")
+    passwords._run = process_pool_run
+    passwords.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Question generation load benchmark: the sync client on the threadpool vs the async client
+
+Serves a minimal OpenAI chat completions endpoint from a local HTTP server
+that answers every request after a fixed latency, points AIService at it, and
+fires N question generations at once down each path:
+
+- sync: AIService.generate_questions through anyio's default threadpool, the
+  way FastAPI ran the route when it was a plain def
+- async: AIService.agenerate_questions on the event loop, as the route runs now
+
+Reports p50 and p99 latency per request and the wall time for the whole burst.
+The cache is bypassed (use_cache=False) so every request reaches the server.
+
+Usage:
+    python -m benchmarks.question_load [--concurrency 10 100 500] [--latency-ms 500]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+import anyio
+from app.config import settings
+from app.models import InterviewType
+from app.services.ai_service import AIService
+
+QUESTIONS = json.dumps([
+    {"question_text": f"Question {i}?", "category": "Technical", "difficulty": "medium"} for i in range(5)
+])
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Local chat completions stand-in; each request is answered on its own thread after latency seconds"""
+    
+    daemon_threads = True
+    # Every client in a burst connects at once
+    request_queue_size = 1024
+    
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        self.latency = latency
+        self.completions = 0
+        self.lock = threading.Lock()
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.completions += 1
+        body = json.dumps({
+            'id': "chatcmpl-bench",
+            'object': "chat.completion",
+            'created': int(time.time()),
+            'model': request['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': "assistant", 'content': QUESTIONS},
+                'finish_reason': "stop",
+            }],
+            'usage': {'prompt_tokens': 100, 'completion_tokens': 100, 'total_tokens': 200},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+async def burst(service: AIService, concurrency: int, mode: str) -> Tuple[List[float], float]:
+    """Per-request latencies in milliseconds and the wall time in seconds of concurrency simultaneous generations"""
+    arguments = (InterviewType.TECHNICAL, "Engineer", "Acme", 5, False)
+    
+    async def generate() -> float:
+        started = time.perf_counter()
+        if mode == "sync":
+            await anyio.to_thread.run_sync(service.generate_questions, *arguments)
+        else:
+            await service.agenerate_questions(*arguments)
+        return (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*[generate() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - started
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(concurrency: int, latency: float, mode: str) -> Tuple[List[float], float, int]:
+    """Latencies, wall time and completions served for one burst against a fresh server and client"""
+    server = FakeOpenAIServer(latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.OPENAI_BASE_URL = server.base_url
+    service = AIService()
+    
+    async def measure():
+        try:
+            return await burst(service, concurrency, mode)
+        finally:
+            await service.aclose()
+    
+    try:
+        latencies, seconds = asyncio.run(measure())
+        return latencies, seconds, server.completions
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500],
+                        help="Simultaneous generations per burst")
+    parser.add_argument("--latency-ms", type=float, default=500, help="Time the fake endpoint takes per completion")
+    args = parser.parse_args(argv)
+    latency = args.latency_ms / 1000
+    
+    print(f"{args.latency_ms:g} ms per completion")
+    print()
+    print(f"{'requests':>8}  {'mode':<5} {'p50 ms':>8} {'p99 ms':>8} {'seconds':>8} {'failed':>6}")
+    for concurrency in args.concurrency:
+        for mode in ("sync", "async"):
+            latencies, seconds, completions = run(concurrency, latency, mode)
+            print(
+                f"{concurrency:>8}  {mode:<5} {statistics.median(latencies):>8.0f} "
+                f"{percentile(latencies, 0.99):>8.0f} {seconds:>8.2f} {concurrency - completions:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
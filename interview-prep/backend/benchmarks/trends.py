@@ -0,0 +1,101 @@
+"""
+Trends benchmark: precomputed trend_buckets vs scanning raw interviews
+
+Loads synthetic users and interviews straight into the database, builds the
+rollups, then times /api/analytics/trends' service call against the raw
+aggregate it replaces, overall and for users with growing histories.
+
+Usage:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.trends [--users 1000] [--interviews-per-user 10000]
+"""
+import argparse
+import random
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app import models
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+from benchmarks.common import bench_engine, summarize, timed
+
+HISTORY_SIZES = (10, 100, 1000, 10000)
+
+
+def load(db, first_user: int, users: int, interviews_per_user: int):
+    """Insert users with interviews spread over three years, half of them with a performance record"""
+    db.execute(text(
+        "INSERT INTO users (id, email, is_active) "
+        "SELECT u, 'bench' || u || '@example.com', true FROM generate_series(:first, :last) AS u"
+    ), {"first": first_user, "last": first_user + users - 1})
+    db.execute(text(
+        "INSERT INTO interviews (user_id, company, position, interview_type, status, scheduled_date) "
+        "SELECT u, 'Company ' || (n % 50), 'Engineer', "
+        "(enum_range(NULL::interviewtype))[1 + (u + n) % 8], "
+        "CASE WHEN n % 4 = 0 THEN 'UPCOMING'::interviewstatus ELSE 'COMPLETED'::interviewstatus END, "
+        "timestamp '2023-01-01' + ((u * 31 + n * 7919) % 1095) * interval '1 day' + (n % 10) * interval '1 hour' "
+        "FROM generate_series(:first, :last) AS u CROSS JOIN generate_series(1, :per_user) AS n"
+    ), {"first": first_user, "last": first_user + users - 1, "per_user": interviews_per_user})
+    db.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--interviews-per-user", type=int, default=10000)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args(argv)
+    
+    engine = bench_engine()
+    models.Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    # Every read should hit the database, not the dashboard cache
+    analytics_service.dashboard_cache.get = lambda key: None
+    
+    started = time.perf_counter()
+    load(db, 1, args.users, args.interviews_per_user)
+    growth_users = {}
+    for size in HISTORY_SIZES:
+        growth_users[size] = args.users + len(growth_users) + 1
+        load(db, growth_users[size], 1, size)
+    db.execute(text(
+        "INSERT INTO performance (interview_id, prep_hours, confidence_level, outcome) "
+        "SELECT id, id % 6, 1 + id % 10, CASE WHEN id % 3 = 0 THEN 'failed' ELSE 'passed' END "
+        "FROM interviews WHERE id % 2 = 0"
+    ))
+    db.commit()
+    db.execute(text("ANALYZE"))
+    total = db.execute(text("SELECT count(*) FROM interviews")).scalar()
+    print(f"Loaded {total} interviews for {args.users + len(HISTORY_SIZES)} users in {time.perf_counter() - started:.1f}s")
+    
+    analytics = AnalyticsService(db)
+    sample = random.Random(0).sample(range(1, args.users + 1), min(args.samples, args.users))
+    
+    # First read of a user without rollups builds them (one-off per user); other users
+    # keep no rollups, they only make the raw tables realistically large
+    first_reads = []
+    for user_id in sample:
+        first_reads += timed(lambda: analytics.get_trends(user_id))
+    for user_id in growth_users.values():
+        analytics.get_trends(user_id)
+    
+    bucket_reads, raw_scans = [], []
+    for user_id in sample:
+        bucket_reads += timed(lambda: analytics.get_trends(user_id), repeat=3)
+        raw_scans += timed(lambda: analytics.compute_trend_buckets(user_id), repeat=3)
+    
+    print(f"\n{args.interviews_per_user} interviews per user, {len(sample)} sampled users")
+    print(f"  first read (rebuild)   {summarize(first_reads)}")
+    print(f"  trend_buckets read     {summarize(bucket_reads)}")
+    print(f"  raw interviews scan    {summarize(raw_scans)}")
+    
+    print("\nBy history size")
+    for size, user_id in growth_users.items():
+        print(
+            f"  {size:>6} interviews  buckets {summarize(timed(lambda: analytics.get_trends(user_id), repeat=20))}"
+            f"  |  raw scan {summarize(timed(lambda: analytics.compute_trend_buckets(user_id), repeat=20))}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+from datetime import datetime
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from app import auth, models
+from app.cache import MemoryCache
+from app.database import get_db
+from app.routers import interviews
+from app.services import analytics_service
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def pg_engine():
+    """Engine on an empty public schema of TEST_DATABASE_URL (the schema is dropped and recreated)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(pg_engine, monkeypatch):
+    """Sessions on a freshly created schema, with empty in-memory dashboard and user caches"""
+    models.Base.metadata.create_all(pg_engine)
+    monkeypatch.setattr(analytics_service, "dashboard_cache", MemoryCache("dashboard"))
+    monkeypatch.setattr(models, "user_cache", MemoryCache("users"))
+    return sessionmaker(bind=pg_engine)
+
+
+@pytest.fixture
+def db_session(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def user(db_session):
+    user = models.User(email="ada@example.com")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def interview(db_session, user):
+    """A technical interview on a Thursday, with the three weekdays before it free for prep"""
+    interview = models.Interview(
+        user_id=user.id,
+        company="Acme",
+        position="Engineer",
+        interview_type=models.InterviewType.TECHNICAL,
+        scheduled_date=datetime(2030, 3, 14, 10, 0)
+    )
+    db_session.add(interview)
+    db_session.commit()
+    return interview
+
+
+def client_for(session_factory, user_id: int) -> TestClient:
+    """A client for the interviews API, signed in as user_id"""
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    def get_test_user(db: Session = Depends(get_db)):
+        return db.get(models.User, user_id)
+    
+    app = FastAPI()
+    app.include_router(interviews.router)
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[auth.get_current_active_user] = get_test_user
+    return TestClient(app)
@@ -0,0 +1,144 @@
+import base64
+import json
+from typing import Callable, Dict, List, Optional, Set
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+
+def http_error(status: int, reason: str = "error") -> HttpError:
+    resp = Response({'status': status})
+    resp.reason = reason
+    return HttpError(resp, json.dumps({'error': {'code': status, 'message': reason}}).encode())
+
+
+def make_message(
+    message_id: str, subject: str, body: str, sender: str = "recruiter@acme.com", labels: tuple = ('INBOX', 'UNREAD')
+) -> Dict:
+    """A Gmail API message in format=full"""
+    return {
+        'id': message_id,
+        'labelIds': list(labels),
+        'snippet': body[:200],
+        'sizeEstimate': 1000 + len(body),
+        'payload': {
+            'mimeType': 'text/plain',
+            'headers': [
+                {'name': 'Subject', 'value': subject},
+                {'name': 'From', 'value': sender},
+                {'name': 'Date', 'value': 'Mon, 1 Jan 2024 10:00:00 +0000'},
+            ],
+            'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()},
+        },
+    }
+
+
+class FakeRequest:
+    def __init__(self, handler: Callable[[], Dict]):
+        self.handler = handler
+    
+    def execute(self) -> Dict:
+        return self.handler()
+
+
+class FakeBatch:
+    def __init__(self, gmail: "FakeGmail", callback: Callable):
+        self.gmail = gmail
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request: FakeRequest, request_id: str):
+        self.requests.append((request_id, request))
+    
+    def execute(self):
+        self.gmail.batch_calls += 1
+        if self.gmail.fail_batches:
+            raise http_error(503, "Backend Error")
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.handler(), None)
+            except HttpError as error:
+                self.callback(request_id, None, error)
+
+
+class FakeGmail:
+    """
+    Minimal stand-in for the Gmail v1 client used by GmailService
+    
+    stored holds messages by ID; added lists the IDs history.list reports since
+    the checkpoint and found the IDs a search returns, in pages of maxResults;
+    failing_ids answer 429 when fetched and deleted_ids answer 404. searches
+    records each search query.
+    """
+    
+    def __init__(self, messages: List[Dict], added: Optional[List[str]] = None, found: Optional[List[str]] = None):
+        self.stored = {message['id']: message for message in messages}
+        self.added = added or []
+        self.found = found if found is not None else list(self.stored)
+        self.history_id = "200"
+        self.history_error: Optional[int] = None
+        self.failing_ids: Set[str] = set()
+        self.deleted_ids: Set[str] = set()
+        self.fail_batches = False
+        self.batch_calls = 0
+        self.fetched: List[tuple] = []
+        self.searches: List[str] = []
+    
+    def users(self):
+        return self
+    
+    def getProfile(self, userId: str) -> FakeRequest:
+        return FakeRequest(lambda: {'historyId': self.history_id})
+    
+    def history(self):
+        return self
+    
+    def list(
+        self, userId: str, startHistoryId: Optional[str] = None, q: Optional[str] = None,
+        maxResults: int = 100, pageToken: Optional[str] = None, **kwargs
+    ) -> FakeRequest:
+        if startHistoryId is not None:
+            return FakeRequest(self._history)
+        return FakeRequest(lambda: self._search(q, maxResults, int(pageToken or 0)))
+    
+    def _search(self, q: Optional[str], max_results: int, start: int) -> Dict:
+        self.searches.append(q)
+        page = {'messages': [{'id': message_id} for message_id in self.found[start:start + max_results]]}
+        if start + max_results < len(self.found):
+            page['nextPageToken'] = str(start + max_results)
+        return page
+    
+    def _history(self) -> Dict:
+        if self.history_error:
+            raise http_error(self.history_error)
+        return {'history': [
+            {'messagesAdded': [{'message': {'id': message_id, 'labelIds': self._labels(message_id)}}]}
+            for message_id in self.added
+        ]}
+    
+    def _labels(self, message_id: str) -> List[str]:
+        return self.stored[message_id]['labelIds'] if message_id in self.stored else ['INBOX']
+    
+    def messages(self):
+        return self
+    
+    def get(self, userId: str, id: str, format: str = 'full', metadataHeaders=None) -> FakeRequest:
+        return FakeRequest(lambda: self._get(id, format))
+    
+    def _get(self, message_id: str, format: str) -> Dict:
+        if message_id in self.failing_ids:
+            raise http_error(429, "Rate Limit Exceeded")
+        if message_id in self.deleted_ids or message_id not in self.stored:
+            raise http_error(404, "Not Found")
+        self.fetched.append((message_id, format))
+        message = self.stored[message_id]
+        if format == 'metadata':
+            return {
+                'id': message_id,
+                'snippet': message['snippet'],
+                'sizeEstimate': message['sizeEstimate'],
+                'payload': {'headers': message['payload']['headers']},
+            }
+        return message
+    
+    def new_batch_http_request(self, callback: Callable) -> FakeBatch:
+        return FakeBatch(self, callback)
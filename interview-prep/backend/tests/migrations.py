@@ -0,0 +1,14 @@
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def upgrade(engine, revision: str = "head"):
+    """Run alembic upgrade on the given engine's database"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
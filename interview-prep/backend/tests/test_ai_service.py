@@ -0,0 +1,128 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.cache import MemoryCache
+from app.models import InterviewType
+from app.services.ai_service import AIService, ai_service
+
+QUESTIONS = [{"question_text": f"Question {i}?"} for i in range(3)]
+
+
+class StreamingCompletions:
+    """Streams QUESTIONS as a JSON array a few characters at a time, optionally dying partway"""
+    
+    def __init__(self, fail_after_chars=None):
+        self.fail_after_chars = fail_after_chars
+    
+    async def create(self, stream, **request):
+        text = json.dumps(QUESTIONS)
+        
+        async def chunks():
+            for start in range(0, len(text), 8):
+                if self.fail_after_chars is not None and start >= self.fail_after_chars:
+                    raise ConnectionError("stream reset")
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[start:start + 8]))])
+        
+        return chunks()
+
+
+class CountingCompletions:
+    """Answers with QUESTIONS and counts the calls that reach it; create is sync or async to match the client"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def _respond(self):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(QUESTIONS)))])
+    
+    def create(self, **request):
+        return self._respond()
+    
+    async def acreate(self, **request):
+        return self._respond()
+
+
+def _stream(monkeypatch, completions):
+    monkeypatch.setattr(ai_service, "async_client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    
+    async def collect():
+        return [q async for q in ai_service.astream_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3)]
+    
+    return asyncio.run(collect())
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = MemoryCache("llm")
+    monkeypatch.setattr(ai_service, "cache", cache)
+    return cache
+
+
+def test_interrupted_stream_is_not_cached(monkeypatch, cache):
+    streamed = _stream(monkeypatch, StreamingCompletions(fail_after_chars=40))
+    
+    assert 0 < len(streamed) < len(QUESTIONS)
+    assert cache.stats()["entries"] == 0
+
+
+def test_complete_stream_is_cached(monkeypatch, cache):
+    streamed = _stream(monkeypatch, StreamingCompletions())
+    
+    assert [q["question_text"] for q in streamed] == [q["question_text"] for q in QUESTIONS]
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = CountingCompletions()
+    monkeypatch.setattr(ai_service, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setattr(ai_service, "async_client", SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=completions.acreate))
+    ))
+    return completions
+
+
+def test_identical_generate_call_is_served_from_the_cache(cache, completions):
+    first = ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3)
+    second = ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3)
+    # The async path shares the cache key
+    third = asyncio.run(ai_service.agenerate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3))
+    
+    assert completions.calls == 1
+    assert second == third == first
+    assert cache.stats()["hits"] == 2
+
+
+def test_different_requests_are_cached_separately(cache, completions):
+    ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3)
+    ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Globex", 3)
+    ai_service.generate_questions(InterviewType.BEHAVIORAL, "Engineer", "Acme", 3)
+    ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 5)
+    
+    assert completions.calls == 4
+    assert cache.stats()["entries"] == 4
+
+
+def test_use_cache_false_always_reaches_the_client(cache, completions):
+    ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3)
+    ai_service.generate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3, use_cache=False)
+    asyncio.run(ai_service.agenerate_questions(InterviewType.TECHNICAL, "Engineer", "Acme", 3, use_cache=False))
+    
+    assert completions.calls == 3
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_key_depends_only_on_the_request_content():
+    request = ai_service._question_request(ai_service._build_prompt(InterviewType.TECHNICAL, "Engineer", "Acme", 3))
+    # Another instance builds the same request; key order does not matter
+    other = AIService()
+    rebuilt = other._question_request(other._build_prompt(InterviewType.TECHNICAL, "Engineer", "Acme", 3))
+    asyncio.run(other.aclose())
+    reordered = dict(reversed(list(request.items())))
+    
+    assert ai_service._cache_key(rebuilt) == ai_service._cache_key(reordered) == ai_service._cache_key(request)
+    assert len(ai_service._cache_key(request)) == 64
+    for change in ({"model": "other-model"}, {"temperature": 0.2}, {"max_tokens": 100}):
+        assert ai_service._cache_key({**request, **change}) != ai_service._cache_key(request)
@@ -0,0 +1,170 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app import auth, models
+from app.config import settings
+from app.database import get_async_db
+from app.routers import interviews
+from app.services import bulk_io
+from tests.conftest import TEST_DATABASE_URL
+
+CSV_HEADER = "company,position,interview_type,scheduled_date,description"
+
+
+@pytest.fixture
+def api(session_factory, user, monkeypatch):
+    """Call the interviews API as the seeded user: api(method, path, **request) -> response"""
+    # Small batches so a few rows already take several inserts and export fetches
+    monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 2)
+    monkeypatch.setattr(bulk_io, "SessionLocal", session_factory)
+    
+    async def get_test_user():
+        return user
+    
+    app = FastAPI()
+    app.include_router(interviews.router)
+    app.dependency_overrides[auth.get_current_active_user_async] = get_test_user
+    app.dependency_overrides[auth.get_current_active_user] = lambda: user
+    
+    def call(method: str, path: str, **request):
+        async def run():
+            async_engine = create_async_engine(TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1))
+            async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            
+            async def get_test_db():
+                async with async_session() as session:
+                    yield session
+            
+            app.dependency_overrides[get_async_db] = get_test_db
+            try:
+                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                    return await client.request(method, path, **request)
+            finally:
+                await async_engine.dispose()
+        
+        return asyncio.run(run())
+    
+    return call
+
+
+def chunked(body: str, size: int = 7):
+    """The body as a stream of small chunks that split lines and characters"""
+    async def chunks():
+        data = body.encode("utf-8")
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+    
+    return chunks()
+
+
+def import_body(api, body: str, content_type: str) -> dict:
+    response = api("POST", "/api/interviews/bulk", content=chunked(body), headers={"Content-Type": content_type})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def stored(db_session):
+    return db_session.query(models.Interview).order_by(models.Interview.scheduled_date, models.Interview.id).all()
+
+
+def test_ndjson_import_reports_invalid_rows_and_inserts_the_rest(api, db_session):
+    body = "\n".join([
+        json.dumps({"company": "Acme", "position": "Engineer", "interview_type": "technical",
+                    "scheduled_date": "2030-01-01T10:00:00"}),
+        "",
+        "{not json",
+        json.dumps({"company": "Globex", "position": "Analyst", "interview_type": "interrogation",
+                    "scheduled_date": "2030-01-02T10:00:00"}),
+        json.dumps(["Initech"]),
+        json.dumps({"company": "Initech", "position": "Designer", "interview_type": "behavioral",
+                    "scheduled_date": "2030-01-03T10:00:00"}),
+        json.dumps({"company": "Hooli", "position": "Engineer", "interview_type": "final_round",
+                    "scheduled_date": "2030-01-04T10:00:00"}),
+    ]) + "\n"
+    
+    result = import_body(api, body, "application/x-ndjson")
+    
+    assert result["imported"] == 3
+    assert result["failed"] == 3
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][0]["errors"][0].startswith("Invalid JSON")
+    assert result["errors"][1]["errors"][0].startswith("interview_type:")
+    assert result["errors"][2]["errors"] == ["Expected a JSON object"]
+    assert [interview.company for interview in stored(db_session)] == ["Acme", "Initech", "Hooli"]
+
+
+def test_csv_import_reads_quoted_fields_and_reports_bad_rows(api, db_session):
+    body = "\ufeff" + "\n".join([
+        CSV_HEADER,
+        'Acme 5" Inc,Engineer,technical,2030-01-01T10:00:00,',
+        '"Globex, Ltd",Analyst,behavioral,2030-01-02T10:00:00,"Two rounds:',
+        'coding, then ""culture fit"""',
+        "Initech,Designer,technical,not a date,",
+        "Hooli,Engineer,final_round,2030-01-04T10:00:00,",
+    ]) + "\r\n"
+    
+    result = import_body(api, body, "text/csv")
+    
+    assert result["imported"] == 3
+    assert [error["row"] for error in result["errors"]] == [3]
+    assert result["errors"][0]["errors"][0].startswith("scheduled_date:")
+    interviews = stored(db_session)
+    assert [interview.company for interview in interviews] == ['Acme 5" Inc', "Globex, Ltd", "Hooli"]
+    assert interviews[1].description == 'Two rounds:\ncoding, then "culture fit"'
+    assert interviews[0].description is None
+
+
+def test_csv_import_reports_a_quoted_field_that_never_closes(api, db_session):
+    body = "\n".join([
+        CSV_HEADER,
+        "Acme,Engineer,technical,2030-01-01T10:00:00,",
+        'Globex,Analyst,behavioral,2030-01-02T10:00:00,"Bring your laptop',
+        "Initech,Designer,technical,2030-01-03T10:00:00,",
+    ]) + "\n"
+    
+    result = import_body(api, body, "text/csv")
+    
+    # Everything after the open quote may belong to the field, so none of it is imported
+    assert result["imported"] == 1
+    assert result["failed"] == 1
+    assert result["errors"] == [{"row": 2, "errors": ["Invalid CSV on line 3: quoted field is never closed"]}]
+    assert [interview.company for interview in stored(db_session)] == ["Acme"]
+
+
+@pytest.mark.parametrize("export_format,content_type", [("ndjson", "application/x-ndjson"), ("csv", "text/csv")])
+def test_export_streams_every_interview_and_imports_back(api, db_session, user, export_format, content_type):
+    companies = ["Acme", 'Acme 5" Inc', "Globex, Ltd", "Initech", "Hooli"]
+    for day, company in enumerate(companies):
+        db_session.add(models.Interview(
+            user_id=user.id,
+            company=company,
+            position="Engineer",
+            interview_type=models.InterviewType.TECHNICAL,
+            scheduled_date=datetime(2030, 1, day + 1, 10, 0),
+            description="Line one\nLine two" if day == 2 else None
+        ))
+    db_session.commit()
+    
+    response = api("GET", "/api/interviews/bulk", params={"format": export_format})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(content_type)
+    if export_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+    else:
+        rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["company"] for row in rows] == companies
+    
+    result = import_body(api, response.text, content_type)
+    
+    assert result == {"imported": len(companies), "failed": 0, "errors": []}
+    db_session.expire_all()
+    interviews = stored(db_session)
+    assert [interview.company for interview in interviews] == [company for company in companies for _ in range(2)]
+    assert [interview.description for interview in interviews[4:6]] == ["Line one\nLine two"] * 2
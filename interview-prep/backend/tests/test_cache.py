@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+import pytest
+from app import cache as cache_module
+from app.cache import MemoryCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic for app.cache: clock.now is the current reading"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock.now)
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = MemoryCache("test", max_entries=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+    
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == "A"
+    cache.set("d", "D")
+    
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_overwriting_a_key_refreshes_it():
+    cache = MemoryCache("test", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+    
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (3, None, 4)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = MemoryCache("test", ttl_seconds=60)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl_seconds=5)
+    
+    clock.now += 5
+    assert (cache.get("default"), cache.get("short")) == (1, 2)
+    
+    clock.now += 1
+    assert (cache.get("default"), cache.get("short")) == (1, None)
+    
+    clock.now += 55
+    assert cache.get("default") is None
+    # Expired entries are dropped when read, not kept until evicted
+    assert cache.stats()["entries"] == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = MemoryCache("test")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.delete("a")
+    cache.get("a")
+    
+    assert cache.stats() == {"backend": "memory", "hits": 1, "misses": 2, "entries": 0}
+
+
+def test_get_cache_returns_one_cache_per_namespace(monkeypatch):
+    monkeypatch.setattr(cache_module, "_caches", {})
+    
+    first = cache_module.get_cache("test", backend="memory", max_entries=5)
+    
+    assert cache_module.get_cache("test") is first
+    assert cache_module.get_cache("other", backend="memory") is not first
+    assert first.max_entries == 5
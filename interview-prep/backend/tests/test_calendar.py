@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from app.services.calendar_service import BusyIndex, CalendarService
+from app.services.fake_calendar import FakeCalendar
+
+# A Thursday; the three days before it are weekdays, busy 9-17 in FakeCalendar
+INTERVIEW_DATE = datetime(2030, 3, 14, 10, 0)
+
+
+def calendar_with(fake: FakeCalendar) -> CalendarService:
+    service = CalendarService(mock_mode=False)
+    service.service = fake
+    return service
+
+
+def test_busy_index_merges_overlaps_and_finds_first_gap():
+    day = datetime(2030, 3, 11)
+    busy = BusyIndex([
+        (day.replace(hour=9), day.replace(hour=11)),
+        (day.replace(hour=10), day.replace(hour=12)),
+        (day.replace(hour=13), day.replace(hour=14)),
+    ])
+    
+    assert busy.intervals == [(day.replace(hour=9), day.replace(hour=12)), (day.replace(hour=13), day.replace(hour=14))]
+    assert busy.first_free_slot(day.replace(hour=9), day.replace(hour=18), timedelta(hours=1)) == (
+        day.replace(hour=12), day.replace(hour=13)
+    )
+    assert busy.first_free_slot(day.replace(hour=9), day.replace(hour=18), timedelta(hours=2)) == (
+        day.replace(hour=14), day.replace(hour=16)
+    )
+    assert busy.first_free_slot(day.replace(hour=9), day.replace(hour=14), timedelta(hours=2)) is None
+
+
+def test_prep_blocks_land_in_free_time_with_one_batch():
+    fake = FakeCalendar()
+    blocks = calendar_with(fake).schedule_prep_blocks(
+        INTERVIEW_DATE, "Acme - Engineer", days_before=3, preferred_start_hour=8, preferred_end_hour=22
+    )
+    
+    # 8:00 is too close to the 9-17 work block for 90 minutes, so each block starts at 17:00
+    assert [block['start'] for block in blocks] == [datetime(2030, 3, day, 17, 0) for day in (11, 12, 13)]
+    assert all(block['end'] - block['start'] == timedelta(minutes=90) for block in blocks)
+    assert {block['event_id'] for block in blocks} == set(fake.events_by_id)
+    assert all(block['etag'] == fake.events_by_id[block['event_id']]['etag'] for block in blocks)
+    # One free/busy query and one batch insert
+    assert fake.round_trips == 2
+
+
+def test_prep_blocks_avoid_existing_events_and_skip_full_days():
+    fake = FakeCalendar()
+    service = calendar_with(fake)
+    service.create_events([
+        {'title': 'Dinner', 'start': datetime(2030, 3, 11, 17, 0), 'end': datetime(2030, 3, 11, 21, 0)},
+        {'title': 'Gym', 'start': datetime(2030, 3, 12, 17, 0), 'end': datetime(2030, 3, 12, 18, 0)},
+    ])
+    
+    blocks = service.schedule_prep_blocks(
+        INTERVIEW_DATE, "Acme - Engineer", days_before=3, preferred_start_hour=8, preferred_end_hour=21
+    )
+    
+    # The 11th has no 90-minute gap before 21:00; the 12th's block moves past the gym
+    assert [block['start'] for block in blocks] == [datetime(2030, 3, 12, 18, 0), datetime(2030, 3, 13, 17, 0)]
+    assert [block['title'] for block in blocks] == ["Prep Session #1 - Acme - Engineer", "Prep Session #2 - Acme - Engineer"]
+
+
+def test_create_events_splits_batches_and_keeps_order():
+    fake = FakeCalendar()
+    start = datetime(2030, 1, 1, 8, 0)
+    blocks = [
+        {'title': f"Block {i}", 'start': start + timedelta(hours=i), 'end': start + timedelta(hours=i, minutes=30)}
+        for i in range(CalendarService.BATCH_SIZE * 2 + 1)
+    ]
+    
+    created = calendar_with(fake).create_events(blocks)
+    
+    assert fake.round_trips == 3
+    assert [block['title'] for block in created] == [block['title'] for block in blocks]
+    assert len(fake.events_by_id) == len(blocks)
+
+
+def test_free_busy_includes_synthetic_schedule_and_events():
+    fake = FakeCalendar()
+    service = calendar_with(fake)
+    service.create_events([{'title': 'Call', 'start': datetime(2030, 3, 16, 12, 0), 'end': datetime(2030, 3, 16, 13, 0)}])
+    
+    # A weekday, then a Saturday with only the event
+    busy = service.get_busy_intervals(datetime(2030, 3, 15), datetime(2030, 3, 17))
+    
+    assert (datetime(2030, 3, 15, 9, 0), datetime(2030, 3, 15, 17, 0)) in busy
+    assert (datetime(2030, 3, 16, 12, 0), datetime(2030, 3, 16, 13, 0)) in busy
+    assert not any(start.date() == datetime(2030, 3, 16).date() and start.hour == 9 for start, _ in busy)
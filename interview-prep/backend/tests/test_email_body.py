@@ -0,0 +1,89 @@
+import base64
+import pytest
+from app.config import settings
+from app.services.email_body import extract_body
+from app.services.gmail_service import GmailService
+
+
+def encode(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode()
+
+
+def leaf(mime_type: str, text: str, **extra) -> dict:
+    """A Gmail message part holding text"""
+    return {'mimeType': mime_type, 'headers': [], 'body': {'data': encode(text)}, **extra}
+
+
+def multipart(mime_type: str, *parts: dict) -> dict:
+    return {'mimeType': mime_type, 'headers': [], 'body': {'size': 0}, 'parts': list(parts)}
+
+
+PDF = {
+    'mimeType': 'application/pdf',
+    'filename': 'offer.pdf',
+    'headers': [{'name': 'Content-Disposition', 'value': 'attachment; filename="offer.pdf"'}],
+    'body': {'attachmentId': 'att-1', 'size': 52000},
+}
+
+
+def test_plain_text_inside_alternative_inside_mixed():
+    payload = multipart(
+        'multipart/mixed',
+        multipart(
+            'multipart/alternative',
+            leaf('text/html', '<p>HTML version</p>'),
+            leaf('text/plain', 'Plain version'),
+        ),
+        PDF,
+    )
+    
+    assert extract_body(payload, 1024) == 'Plain version'
+
+
+@pytest.mark.parametrize('attachment', [
+    leaf('text/plain', 'Attached notes', filename='notes.txt'),
+    leaf('text/plain', 'Attached notes', headers=[{'name': 'Content-Disposition', 'value': 'ATTACHMENT'}]),
+    {'mimeType': 'text/plain', 'headers': [], 'body': {'attachmentId': 'att-2', 'data': encode('Attached notes')}},
+    multipart('multipart/alternative', leaf('text/plain', 'Attached notes'))
+    | {'headers': [{'name': 'Content-Disposition', 'value': 'attachment; filename="forwarded.eml"'}]},
+])
+def test_attachments_are_skipped(attachment):
+    payload = multipart('multipart/mixed', attachment, leaf('text/html', '<div>The invitation</div>'))
+    
+    assert extract_body(payload, 1024) == 'The invitation'
+
+
+def test_html_only_message_falls_back_to_visible_text():
+    html = (
+        '<html><head><title>Invite</title><style>p { color: red }</style></head><body>'
+        '<script>track();</script><p>Hi   Ada,</p><p>Your interview is on <b>Friday</b> &amp; lasts 1&nbsp;hour.'
+        '<br>Zoom link below.</p></body></html>'
+    )
+    payload = multipart('multipart/mixed', multipart('multipart/alternative', leaf('text/html', html)), PDF)
+    
+    assert extract_body(payload, 4096) == 'Hi Ada,\nYour interview is on Friday & lasts 1 hour.\nZoom link below.'
+
+
+def test_message_without_text_parts_has_an_empty_body():
+    assert extract_body(multipart('multipart/mixed', PDF), 1024) == ''
+    assert extract_body({'mimeType': 'text/plain', 'body': {'size': 0}}, 1024) == ''
+
+
+@pytest.mark.parametrize('char', ['é', '€', '😀'])
+@pytest.mark.parametrize('max_bytes', [1, 7, 10, 31])
+def test_truncation_never_splits_a_multibyte_character(char, max_bytes):
+    body = extract_body(leaf('text/plain', char * 50), max_bytes)
+    
+    assert body == char * (max_bytes // len(char.encode('utf-8')))
+    assert len(body.encode('utf-8')) <= max_bytes
+
+
+def test_body_is_capped_at_gmail_body_max_bytes(monkeypatch):
+    monkeypatch.setattr(settings, 'GMAIL_BODY_MAX_BYTES', 100)
+    # Anything past the budget is never decoded, so corrupt base64 there does no harm
+    part = leaf('text/plain', 'é' * 1000)
+    part['body']['data'] = part['body']['data'][:400] + '!!not base64!!'
+    
+    body = GmailService(mock_mode=True)._get_email_body(part)
+    
+    assert body == 'é' * 50
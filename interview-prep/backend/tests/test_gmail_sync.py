@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from app.services.gmail_service import GmailService
+from tests.fake_gmail import FakeGmail, make_message
+
+
+def gmail_with(fake: FakeGmail) -> GmailService:
+    service = GmailService(mock_mode=False)
+    service.service = fake
+    return service
+
+
+def interview_messages(count: int):
+    return [
+        make_message(f"m{i}", f"Interview invitation {i}", "We would like to schedule an interview on 3/14/2030.")
+        for i in range(count)
+    ]
+
+
+def test_incremental_sync_advances_checkpoint():
+    fake = FakeGmail(interview_messages(3), added=["m0", "m1", "m2", "m1"])
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['history_id'] == "200"
+    assert result['full_sync'] is False
+    assert [email['message_id'] for email in result['emails']] == ["m0", "m1", "m2"]
+    assert result['fetch_stats']['failed_fetches'] == 0
+
+
+def test_transient_history_error_keeps_checkpoint():
+    fake = FakeGmail(interview_messages(2), added=["m0", "m1"])
+    fake.history_error = 503
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['history_id'] is None
+    assert result['emails'] == []
+
+
+def test_expired_checkpoint_falls_back_to_full_sync():
+    fake = FakeGmail(interview_messages(2))
+    fake.history_error = 404
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['full_sync'] is True
+    assert result['history_id'] == "200"
+    assert len(result['emails']) == 2
+
+
+def test_failed_message_fetch_keeps_checkpoint():
+    fake = FakeGmail(interview_messages(3), added=["m0", "m1", "m2"])
+    fake.failing_ids = {"m1"}
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['history_id'] is None
+    assert result['fetch_stats']['failed_fetches'] == 1
+    assert [email['message_id'] for email in result['emails']] == ["m0", "m2"]
+
+
+def test_deleted_message_does_not_block_checkpoint():
+    fake = FakeGmail(interview_messages(2), added=["m0", "m1"])
+    fake.deleted_ids = {"m1"}
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['history_id'] == "200"
+    assert [email['message_id'] for email in result['emails']] == ["m0"]
+
+
+def test_failed_batch_request_is_not_raised():
+    fake = FakeGmail(interview_messages(2), added=["m0", "m1"])
+    fake.fail_batches = True
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert result['history_id'] is None
+    assert result['emails'] == []
+    assert result['fetch_stats']['failed_fetches'] == 2
+    
+    assert gmail_with(fake).get_interview_emails() == []
+
+
+def test_search_results_are_fetched_in_full_without_a_metadata_pass():
+    # Gmail's search matched the body past the snippet; the subject says nothing
+    body = "Thanks for your time today. " * 10 + "Next step is a technical interview on 3/14/2030."
+    fake = FakeGmail([make_message("m0", "Following up", body)])
+    result = gmail_with(fake).sync_interview_emails()
+    
+    assert [email['message_id'] for email in result['emails']] == ["m0"]
+    assert fake.fetched == [("m0", "full")]
+    assert result['fetch_stats']['full_fetches_saved'] == 0
+
+
+def test_history_sync_fetches_only_what_the_search_matched():
+    fake = FakeGmail([
+        make_message("invite", "Interview invitation", "We would like to schedule an interview on 3/14/2030."),
+        make_message("buried", "Following up", "Thanks for your time today. " * 10 + "Next is an interview on 3/14/2030."),
+        make_message("short", "Lunch?", "Are you free for lunch on Friday?"),
+        make_message("digest", "Weekly digest", "Here is what happened in your network this week. " * 10),
+        make_message("older", "Interview invitation", "An interview on 1/2/2030, matched but already synced."),
+    ], added=["invite", "buried", "short", "digest"], found=["older", "invite", "buried"])
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100", since=datetime(2030, 1, 10, 12, 0))
+    
+    assert [email['message_id'] for email in result['emails']] == ["invite", "buried"]
+    assert fake.fetched == [("invite", "full"), ("buried", "full")]
+    assert result['fetch_stats'] == {'candidates': 4, 'full_fetches': 2, 'full_fetches_saved': 2, 'failed_fetches': 0}
+    # The search covers the period since the last sync, with some slack for late mail
+    after = int((datetime(2030, 1, 10, 12, 0, tzinfo=timezone.utc) - GmailService.SEARCH_LOOKBACK).timestamp())
+    assert fake.searches == [f"({GmailService.INTERVIEW_QUERY}) after:{after}"]
+
+
+def test_history_search_follows_every_page(monkeypatch):
+    monkeypatch.setattr(GmailService, "SEARCH_PAGE_SIZE", 2)
+    fake = FakeGmail(interview_messages(5), added=["m4", "m0"], found=["m0", "m1", "m2", "m3", "m4"])
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert [email['message_id'] for email in result['emails']] == ["m4", "m0"]
+    assert fake.searches == [f"({GmailService.INTERVIEW_QUERY})"] * 3
+
+
+def test_history_sync_ignores_spam_trash_drafts_and_sent_mail():
+    body = "We would like to schedule an interview on 3/14/2030."
+    fake = FakeGmail([
+        make_message("inbox", "Interview invitation", body),
+        make_message("spam", "Interview invitation", body, labels=('SPAM',)),
+        make_message("trash", "Interview invitation", body, labels=('TRASH',)),
+        make_message("draft", "Re: Interview invitation", body, labels=('DRAFT',)),
+        make_message("sent", "Re: Interview invitation", body, sender="ada@example.com", labels=('SENT',)),
+    ], added=["inbox", "spam", "trash", "draft", "sent"])
+    result = gmail_with(fake).sync_interview_emails(start_history_id="100")
+    
+    assert [email['message_id'] for email in result['emails']] == ["inbox"]
+    assert {message_id for message_id, _ in fake.fetched} == {"inbox"}
+    assert result['history_id'] == "200"
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import models
+from app.query_counter import query_budget
+from app.services import calendar_service
+from app.services.fake_calendar import FakeCalendar
+from app.services.interview_service import InterviewService
+from tests.conftest import client_for
+
+
+@pytest.fixture
+def fake_calendar(monkeypatch):
+    fake = FakeCalendar()
+    monkeypatch.setattr(calendar_service, "mock_calendar", fake)
+    return fake
+
+
+def test_moving_an_interview_skips_prep_sessions_edited_in_the_calendar(
+    session_factory, db_session, user, interview, fake_calendar
+):
+    InterviewService(db_session).schedule_prep(
+        interview, user, days_before=3, preferred_start_hour=8, preferred_end_hour=22
+    )
+    sessions = sorted(interview.prep_sessions, key=lambda session: session.scheduled_start)
+    before = {session.id: (session.scheduled_start, session.calendar_event_id) for session in sessions}
+    user_id, interview_id = user.id, interview.id
+    
+    # Someone renames the second block directly in the calendar, changing its ETag
+    edited_id = sessions[1].id
+    edited_event = before[edited_id][1]
+    fake_calendar.events().patch(calendarId='primary', eventId=edited_event, body={'summary': 'Renamed'}).execute()
+    
+    response = client_for(session_factory, user_id).put(
+        f"/api/interviews/{interview_id}", json={"scheduled_date": "2030-03-15T10:00:00"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["calendar_failures"] == [edited_id]
+    
+    db = session_factory()
+    for session in db.query(models.PrepSession).filter(models.PrepSession.interview_id == interview_id):
+        start, event_id = before[session.id]
+        event = fake_calendar.events_by_id[event_id]
+        if session.id == edited_id:
+            assert session.scheduled_start == start
+            assert event['summary'] == 'Renamed'
+            assert event['start']['dateTime'] == start.isoformat()
+        else:
+            assert session.scheduled_start == start + timedelta(days=1)
+            assert event['start']['dateTime'] == session.scheduled_start.isoformat()
+            assert session.calendar_etag == event['etag']
+    db.close()
+
+
+def test_moving_an_interview_with_an_offset_timestamp_stores_utc(
+    session_factory, db_session, user, interview, fake_calendar
+):
+    InterviewService(db_session).schedule_prep(
+        interview, user, days_before=3, preferred_start_hour=8, preferred_end_hour=22
+    )
+    before = {session.id: session.scheduled_start for session in interview.prep_sessions}
+    user_id, interview_id = user.id, interview.id
+    db_session.close()
+    
+    # 12:00 at UTC+2 is 10:00 UTC, one day after the stored 2030-03-14 10:00
+    response = client_for(session_factory, user_id).put(
+        f"/api/interviews/{interview_id}", json={"scheduled_date": "2030-03-15T12:00:00+02:00"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["calendar_failures"] == []
+    db = session_factory()
+    assert db.get(models.Interview, interview_id).scheduled_date == datetime(2030, 3, 15, 10, 0)
+    for session in db.query(models.PrepSession).filter(models.PrepSession.interview_id == interview_id):
+        event = fake_calendar.events_by_id[session.calendar_event_id]
+        assert session.scheduled_start == before[session.id] + timedelta(days=1)
+        assert event['start']['dateTime'] == session.scheduled_start.isoformat()
+    db.close()
+
+
+def test_failed_commit_moves_the_calendar_back(db_session, user, interview, fake_calendar, monkeypatch):
+    service = InterviewService(db_session)
+    service.schedule_prep(interview, user, days_before=3, preferred_start_hour=8, preferred_end_hour=22)
+    before = {session.calendar_event_id: session.scheduled_start for session in interview.prep_sessions}
+    
+    def failing_commit():
+        raise OperationalError("COMMIT", {}, Exception("server closed the connection"))
+    
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+    with pytest.raises(OperationalError):
+        service.reschedule_prep(interview, user, timedelta(days=1))
+    
+    for event_id, start in before.items():
+        assert fake_calendar.events_by_id[event_id]['start']['dateTime'] == start.isoformat()
+    monkeypatch.undo()
+    assert {session.calendar_event_id: session.scheduled_start for session in interview.prep_sessions} == before
+
+
+def seed_interviews(db, user, count):
+    """count interviews a day apart, each with five questions, three prep sessions and a performance row"""
+    seeded = []
+    for day in range(count):
+        interview = models.Interview(
+            user_id=user.id,
+            company=f"Company {day}",
+            position="Engineer",
+            interview_type=models.InterviewType.TECHNICAL,
+            scheduled_date=datetime(2030, 3, 14, 10, 0) + timedelta(days=day)
+        )
+        db.add(interview)
+        db.flush()
+        db.add_all([models.Question(interview_id=interview.id, question_text=f"Question {i}?") for i in range(5)])
+        db.add_all([
+            models.PrepSession(
+                user_id=user.id,
+                interview_id=interview.id,
+                title=f"Prep {i}",
+                scheduled_start=interview.scheduled_date - timedelta(days=i + 1),
+                scheduled_end=interview.scheduled_date - timedelta(days=i + 1, minutes=-90)
+            )
+            for i in range(3)
+        ])
+        db.add(models.Performance(interview_id=interview.id))
+        seeded.append(interview)
+    db.commit()
+    return seeded
+
+
+def test_interview_detail_loads_its_relationships_in_a_fixed_number_of_queries(session_factory, db_session, user):
+    interview_id = seed_interviews(db_session, user, 1)[0].id
+    client = client_for(session_factory, user.id)
+    
+    # The current user, the interview joined with its performance, then its questions and its prep sessions
+    with query_budget(4):
+        response = client.get(f"/api/interviews/{interview_id}")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["questions"]) == 5
+    assert len(body["prep_sessions"]) == 3
+    assert body["performance"] is not None
+
+
+def test_interview_list_queries_do_not_grow_with_the_page(session_factory, db_session, user):
+    seed_interviews(db_session, user, 20)
+    client = client_for(session_factory, user.id)
+    
+    # The current user and one page query, however many interviews are on the page
+    for limit in (1, 20):
+        with query_budget(2):
+            response = client.get("/api/interviews/", params={"limit": limit})
+        assert response.status_code == 200
+        assert len(response.json()) == limit
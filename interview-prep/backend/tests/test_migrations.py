@@ -0,0 +1,66 @@
+from sqlalchemy import inspect, text
+from app.database import Base
+from app import models  # noqa: F401
+from tests.migrations import upgrade
+
+
+def test_upgrade_adds_gmail_checkpoint_columns(pg_engine):
+    upgrade(pg_engine, "0001")
+    assert "gmail_history_id" not in {column['name'] for column in inspect(pg_engine).get_columns('users')}
+    
+    upgrade(pg_engine)
+    columns = {column['name'] for column in inspect(pg_engine).get_columns('users')}
+    assert {"gmail_history_id", "gmail_last_sync"} <= columns
+
+
+def test_upgrade_after_create_all_is_a_no_op(pg_engine):
+    Base.metadata.create_all(bind=pg_engine)
+    upgrade(pg_engine)
+    upgrade(pg_engine)
+
+
+def test_upgrade_merges_duplicate_gmail_interviews(pg_engine):
+    upgrade(pg_engine, "0002")
+    with pg_engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, email) VALUES (1, 'a@example.com'), (2, 'b@example.com')"))
+        connection.execute(text("""
+            INSERT INTO interviews (id, user_id, company, position, interview_type, scheduled_date, gmail_message_id)
+            VALUES (1, 1, 'Acme', 'Engineer', 'TECHNICAL', now(), 'm1'),
+                   (2, 1, 'Acme', 'Engineer', 'TECHNICAL', now(), 'm1'),
+                   (3, 1, 'Acme', 'Engineer', 'TECHNICAL', now(), 'm1'),
+                   (4, 2, 'Acme', 'Engineer', 'TECHNICAL', now(), 'm1'),
+                   (5, 1, 'Other', 'Engineer', 'TECHNICAL', now(), NULL),
+                   (6, 1, 'Other', 'Engineer', 'TECHNICAL', now(), NULL)
+        """))
+        connection.execute(text("""
+            INSERT INTO questions (interview_id, question_text) VALUES (1, 'q1'), (2, 'q2'), (3, 'q3')
+        """))
+        connection.execute(text("""
+            INSERT INTO prep_sessions (user_id, interview_id, title, scheduled_start, scheduled_end)
+            VALUES (1, 3, 'prep', now(), now())
+        """))
+        # Neither the survivor nor the first duplicate has the oldest performance row
+        connection.execute(text("""
+            INSERT INTO performance (id, interview_id, outcome) VALUES (10, 3, 'passed'), (11, 2, 'failed')
+        """))
+    
+    upgrade(pg_engine)
+    
+    with pg_engine.connect() as connection:
+        assert [row.id for row in connection.execute(text("SELECT id FROM interviews ORDER BY id"))] == [1, 4, 5, 6]
+        assert connection.execute(text("SELECT count(*) FROM questions WHERE interview_id = 1")).scalar() == 3
+        assert connection.execute(text("SELECT interview_id FROM prep_sessions")).scalar() == 1
+        assert connection.execute(text("SELECT id, interview_id FROM performance")).all() == [(10, 1)]
+    
+    indexes = {index['name']: index for index in inspect(pg_engine).get_indexes('interviews')}
+    assert indexes['ix_interviews_user_gmail_message']['unique']
+
+
+def test_upgrade_adds_pagination_indexes(pg_engine):
+    upgrade(pg_engine, "0006")
+    upgrade(pg_engine)
+    
+    interview_indexes = {index['name']: index for index in inspect(pg_engine).get_indexes('interviews')}
+    session_indexes = {index['name']: index for index in inspect(pg_engine).get_indexes('prep_sessions')}
+    assert interview_indexes['ix_interviews_user_date_id']['column_names'] == ['user_id', 'scheduled_date', 'id']
+    assert session_indexes['ix_prep_sessions_user_start_id']['column_names'] == ['user_id', 'scheduled_start', 'id']
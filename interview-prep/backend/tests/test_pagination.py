@@ -0,0 +1,120 @@
+import base64
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from app import models
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from tests.conftest import client_for
+
+# Three interviews share each date, so pages often end in the middle of a tie
+DATES = [datetime(2030, 1, 1, 9, 0) + timedelta(days=i // 3) for i in range(10)]
+
+
+@pytest.fixture
+def seeded(session_factory, db_session, user):
+    """A client for a user with ten interviews on duplicate dates, and the ids in listing order"""
+    other = models.User(email="grace@example.com")
+    db_session.add(other)
+    db_session.flush()
+    # Inserted latest first, so id order does not follow date order
+    interviews = [
+        models.Interview(
+            user_id=user.id,
+            company=f"Company {i}",
+            position="Engineer",
+            interview_type=models.InterviewType.TECHNICAL if i % 2 else models.InterviewType.BEHAVIORAL,
+            scheduled_date=DATES[i]
+        )
+        for i in reversed(range(len(DATES)))
+    ]
+    db_session.add_all(interviews)
+    db_session.add(models.Interview(
+        user_id=other.id,
+        company="Elsewhere",
+        position="Engineer",
+        interview_type=models.InterviewType.TECHNICAL,
+        scheduled_date=DATES[0]
+    ))
+    db_session.commit()
+    ordered = sorted(interviews, key=lambda interview: (interview.scheduled_date, interview.id))
+    return client_for(session_factory, user.id), ordered
+
+
+def all_pages(client, **params):
+    """Follow X-Next-Cursor from the first page to the last"""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get("/api/interviews/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor(datetime(2030, 1, 1, 9, 30, 15, 250), 42)
+    
+    assert decode_cursor(cursor) == (datetime(2030, 1, 1, 9, 30, 15, 250), 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"2030-01-01T09:00:00").decode(),
+    base64.urlsafe_b64encode(b"yesterday|1").decode(),
+    base64.urlsafe_b64encode(b"2030-01-01T09:00:00|one").decode(),
+    base64.urlsafe_b64encode(b"2030-01-01T09:00:00|1|2").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 9, 10])
+def test_pages_cover_every_row_once_across_ties(seeded, limit):
+    client, ordered = seeded
+    
+    pages = all_pages(client, limit=limit)
+    
+    assert all(len(page) == limit for page in pages[:-1])
+    assert [row["id"] for page in pages for row in page] == [interview.id for interview in ordered]
+
+
+def test_filters_apply_to_every_page(seeded):
+    client, ordered = seeded
+    
+    pages = all_pages(client, limit=2, interview_type="technical", date_from=DATES[3].isoformat())
+    
+    assert [row["id"] for page in pages for row in page] == [
+        interview.id for interview in ordered
+        if interview.interview_type == models.InterviewType.TECHNICAL and interview.scheduled_date >= DATES[3]
+    ]
+
+
+def test_fields_projection_returns_only_the_requested_columns(seeded):
+    client, ordered = seeded
+    
+    pages = all_pages(client, limit=4, fields="company")
+    
+    rows = [row for page in pages for row in page]
+    # The sort columns come along so the next cursor can be built
+    assert all(set(row) == {"id", "scheduled_date", "company"} for row in rows)
+    assert [row["company"] for row in rows] == [interview.company for interview in ordered]
+    assert client.get("/api/interviews/", params={"fields": "company,salary"}).status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    base64.urlsafe_b64encode(b"2030-13-45T09:00:00|1").decode(),
+    base64.urlsafe_b64encode(b"2030-01-01T09:00:00+05:00|1").decode(),
+])
+def test_tampered_cursor_returns_400_not_500(seeded, cursor):
+    client, _ = seeded
+    
+    response = client.get("/api/interviews/", params={"cursor": cursor})
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
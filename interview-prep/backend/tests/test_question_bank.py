@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app import models
+from app.services.question_bank_service import AsyncQuestionBankService, QuestionBankService, _candidates_statement
+from tests.conftest import TEST_DATABASE_URL
+
+BANKED = [
+    ("Backend Engineer", "APIs", "How would you design idempotent backend APIs?"),
+    ("Backend Engineer", "Databases", "When would you denormalize a backend database schema?"),
+    ("Frontend Engineer", "React", "How does React reconcile the virtual DOM?"),
+    ("Data Scientist", "Statistics", "Explain the bias-variance tradeoff."),
+]
+
+
+@pytest.fixture
+def bank(pg_engine):
+    """A session on a bank with two backend, one frontend and one data science question"""
+    models.Base.metadata.create_all(pg_engine)
+    db = sessionmaker(bind=pg_engine)()
+    QuestionBankService(db).add_questions(
+        [{"question_text": question, "category": category} for _, category, question in BANKED[:2]],
+        models.InterviewType.TECHNICAL, BANKED[0][0]
+    )
+    for position, category, question in BANKED[2:]:
+        QuestionBankService(db).add_questions(
+            [{"question_text": question, "category": category}], models.InterviewType.TECHNICAL, position
+        )
+    user = models.User(email="bank@example.com")
+    db.add(user)
+    db.flush()
+    interview = models.Interview(
+        user_id=user.id,
+        company="Acme",
+        position="Senior Backend Engineer",
+        interview_type=models.InterviewType.TECHNICAL,
+        scheduled_date=datetime(2030, 1, 1)
+    )
+    db.add(interview)
+    db.flush()
+    # Already attached, with different spacing and case than the banked copy
+    db.add(models.Question(interview_id=interview.id, question_text="how would you design  IDEMPOTENT backend APIs?"))
+    db.commit()
+    yield db, interview.id
+    db.close()
+
+
+def test_find_questions_skips_unrelated_and_attached(bank):
+    db, interview_id = bank
+    
+    found = QuestionBankService(db).find_questions(models.InterviewType.TECHNICAL, "Senior Backend Engineer", 5)
+    texts = {q["question_text"] for q in found}
+    assert {BANKED[0][2], BANKED[1][2]} <= texts
+    assert BANKED[3][2] not in texts
+    
+    found = QuestionBankService(db).find_questions(
+        models.InterviewType.TECHNICAL, "Senior Backend Engineer", 5, interview_id
+    )
+    texts = {q["question_text"] for q in found}
+    assert BANKED[0][2] not in texts
+    assert BANKED[1][2] in texts
+
+
+def test_candidates_come_from_the_search_index(bank, pg_engine):
+    db, _ = bank
+    statement = _candidates_statement(models.InterviewType.TECHNICAL, "Backend Engineer", set())
+    compiled = statement.compile(pg_engine)
+    # Raw driver params skip the Enum type's conversion to the member name
+    params = {**compiled.params, "interview_type_1": models.InterviewType.TECHNICAL.name}
+    
+    # Enough unrelated questions of the same type that reading them all is the expensive plan
+    db.execute(text(
+        "INSERT INTO question_bank (normalized_hash, interview_type, position, question_text, times_served) "
+        "SELECT md5(n::text), 'TECHNICAL', 'Product Designer', 'Walk through design critique ' || n, n "
+        "FROM generate_series(1, 100000) AS n"
+    ))
+    db.execute(text("ANALYZE question_bank"))
+    plan = "\n".join(row[0] for row in db.connection().exec_driver_sql(f"EXPLAIN {compiled}", params))
+    assert "ix_question_bank_search" in plan
+
+
+def test_async_lookup_matches_sync(bank):
+    db, interview_id = bank
+    expected = QuestionBankService(db).find_questions(
+        models.InterviewType.TECHNICAL, "Senior Backend Engineer", 5, interview_id
+    )
+    db.rollback()
+    
+    async def run():
+        engine = create_async_engine(TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1))
+        async with async_sessionmaker(engine)() as session:
+            found = await AsyncQuestionBankService(session).find_questions(
+                models.InterviewType.TECHNICAL, "Senior Backend Engineer", 5, interview_id
+            )
+        await engine.dispose()
+        return found
+    
+    assert asyncio.run(run()) == expected
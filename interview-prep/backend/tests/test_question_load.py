@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+import anyio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app import auth
+from app.database import get_async_db
+from app.routers import interviews
+from app.services.ai_service import ai_service
+from tests.conftest import TEST_DATABASE_URL
+
+CONCURRENT_REQUESTS = 50
+COMPLETION_LATENCY = 0.2
+
+
+class SlowCompletions:
+    """Stands in for chat.completions on the async client, answering after a fixed delay"""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def create(self, **request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(COMPLETION_LATENCY)
+        self.in_flight -= 1
+        content = json.dumps([{"question_text": f"Question {i}?"} for i in range(3)])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_concurrent_generation_runs_on_the_event_loop(db_session, user, interview, monkeypatch):
+    """
+    Many simultaneous requests overlap their LLM waits without holding threads
+    
+    The threadpool is cut to two threads, so any sync dependency or blocking
+    call on the path would serialize the requests and blow the time budget.
+    """
+    user_id, interview_id = user.id, interview.id
+    db_session.close()
+    
+    completions = SlowCompletions()
+    monkeypatch.setattr(ai_service, "async_client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    
+    async_engine = create_async_engine(
+        TEST_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+        pool_size=CONCURRENT_REQUESTS
+    )
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+    
+    app = FastAPI()
+    app.include_router(interviews.router)
+    app.dependency_overrides[get_async_db] = get_test_db
+    token = auth.create_access_token({"sub": str(user_id)})
+    
+    async def run():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 2
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            def request():
+                return client.post(
+                    f"/api/interviews/{interview_id}/questions",
+                    params={"num_questions": 3, "use_cache": False},
+                    headers={"Authorization": f"Bearer {token}"}
+                )
+            
+            # Open the pool's connections first so the timed run measures request handling
+            await asyncio.gather(*[request() for _ in range(CONCURRENT_REQUESTS)])
+            completions.peak = 0
+            started = time.perf_counter()
+            responses = await asyncio.gather(*[request() for _ in range(CONCURRENT_REQUESTS)])
+            elapsed = time.perf_counter() - started
+        await async_engine.dispose()
+        return responses, elapsed
+    
+    responses, elapsed = asyncio.run(run())
+    
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
+    assert completions.peak == CONCURRENT_REQUESTS
+    # Serialized, the completions alone would take CONCURRENT_REQUESTS * COMPLETION_LATENCY (10s)
+    assert elapsed < CONCURRENT_REQUESTS * COMPLETION_LATENCY / 4
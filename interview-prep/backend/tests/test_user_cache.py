@@ -0,0 +1,82 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+from app import auth, models
+from app.query_counter import query_budget
+
+
+def current_user(session_factory, user_id: int) -> models.User:
+    """Resolve a bearer token for user_id the way the sync routes do, in a fresh session"""
+    token = auth.create_access_token({"sub": str(user_id)})
+    db = session_factory()
+    try:
+        return auth.get_current_active_user(auth.get_current_user(token, db))
+    finally:
+        db.close()
+
+
+def test_second_lookup_is_served_from_the_cache(session_factory, user):
+    user_id = user.id
+    
+    with query_budget(1):
+        current_user(session_factory, user_id)
+    with query_budget(0):
+        cached = current_user(session_factory, user_id)
+    
+    assert (cached.id, cached.email, cached.is_active) == (user_id, "ada@example.com", True)
+    assert models.user_cache.stats()["hits"] == 1
+
+
+def test_cached_user_never_holds_secrets(session_factory, db_session, user):
+    user.hashed_password = "secret-hash"
+    user.google_refresh_token = "secret-token"
+    db_session.commit()
+    
+    current_user(session_factory, user.id)
+    
+    assert set(models.user_cache.get(str(user.id))) == set(auth.CACHED_USER_COLUMNS)
+
+
+def test_profile_update_drops_the_cached_user(session_factory, db_session, user):
+    current_user(session_factory, user.id)
+    
+    user.full_name = "Ada King"
+    db_session.commit()
+    
+    assert models.user_cache.get(str(user.id)) is None
+    assert current_user(session_factory, user.id).full_name == "Ada King"
+
+
+def test_deactivated_user_is_refused_straight_away(session_factory, db_session, user):
+    current_user(session_factory, user.id)
+    
+    user.is_active = False
+    db_session.commit()
+    
+    with pytest.raises(HTTPException) as error:
+        current_user(session_factory, user.id)
+    assert error.value.detail == "Inactive user"
+
+
+def test_rolled_back_update_keeps_the_cached_user(session_factory, db_session, user):
+    current_user(session_factory, user.id)
+    
+    user.full_name = "Ada King"
+    db_session.flush()
+    db_session.rollback()
+    
+    assert models.user_cache.get(str(user.id)) is not None
+
+
+def test_worker_registers_the_invalidation_listeners_without_the_api():
+    script = (
+        "import sys; import app.worker; from sqlalchemy import event; from app import models; "
+        "print('app.auth' in sys.modules, event.contains(models.User, 'after_update', models._mark_user_changed))"
+    )
+    
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).parents[1])
+    
+    assert result.stdout.split() == ["False", "True"]
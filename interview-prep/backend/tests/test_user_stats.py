@@ -0,0 +1,117 @@
+import threading
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from app import models
+from app.services.analytics_service import AnalyticsService
+
+
+def _interview(user_id, days, status=models.InterviewStatus.UPCOMING):
+    return models.Interview(
+        user_id=user_id,
+        company="Acme",
+        position="Engineer",
+        interview_type=models.InterviewType.TECHNICAL,
+        status=status,
+        scheduled_date=datetime(2026, 3, 2) + timedelta(days=days)
+    )
+
+
+@pytest.fixture
+def user_id(db_session, user):
+    """A user with three completed interviews that predate the rollup, so there is no user_stats row"""
+    db_session.add_all([_interview(user.id, day, models.InterviewStatus.COMPLETED) for day in range(3)])
+    db_session.commit()
+    db_session.execute(text("DELETE FROM user_stats"))
+    db_session.execute(text("DELETE FROM trend_buckets"))
+    db_session.commit()
+    user_id = user.id
+    db_session.close()
+    return user_id
+
+
+def test_change_for_user_without_rollup_row_leaves_it_to_the_rebuild(session_factory, user_id):
+    
+    db = session_factory()
+    db.add(_interview(user_id, 10))
+    db.commit()
+    assert db.get(models.UserStats, user_id) is None
+    assert db.query(models.TrendBucket).count() == 0
+    
+    stats = AnalyticsService(db).get_dashboard_stats(user_id)
+    assert stats.total_interviews == 4
+    assert stats.completed_interviews == 3
+    assert AnalyticsService(db).check_user_stats(user_id) == {}
+    
+    # Once the row exists, changes are applied as deltas
+    db.add(_interview(user_id, 20))
+    db.commit()
+    assert db.get(models.UserStats, user_id, populate_existing=True).total_interviews == 5
+    assert AnalyticsService(db).check_user_stats(user_id) == {}
+    db.close()
+
+
+def test_concurrent_first_reads_rebuild_without_conflict(session_factory, user_id):
+    barrier = threading.Barrier(2)
+    errors = []
+    
+    def first_read():
+        db = session_factory()
+        try:
+            barrier.wait()
+            AnalyticsService(db).rebuild_user_stats(user_id)
+            db.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+    
+    threads = [threading.Thread(target=first_read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    db = session_factory()
+    assert db.get(models.UserStats, user_id).total_interviews == 3
+    assert AnalyticsService(db).check_user_stats(user_id) == {}
+    db.close()
+
+
+def test_rebuild_waits_for_a_writer_that_skipped_the_missing_row(session_factory, user_id):
+    writer = session_factory()
+    writer.add(_interview(user_id, 10))
+    writer.flush()
+    
+    def first_read():
+        db = session_factory()
+        AnalyticsService(db).rebuild_user_stats(user_id)
+        db.commit()
+        db.close()
+    
+    reader = threading.Thread(target=first_read)
+    reader.start()
+    # Without the lock the rebuild would finish here, before the new interview is visible
+    reader.join(timeout=0.5)
+    writer.commit()
+    writer.close()
+    reader.join()
+    
+    db = session_factory()
+    assert db.get(models.UserStats, user_id).total_interviews == 4
+    assert AnalyticsService(db).check_user_stats(user_id) == {}
+    db.close()
+
+
+def test_trends_rebuild_buckets_for_user_without_rollup_row(session_factory, user_id):
+    db = session_factory()
+    db.add(_interview(user_id, 40))
+    db.commit()
+    
+    trends = AnalyticsService(db).get_trends(user_id)
+    
+    assert sum(point.interviews for point in trends.weekly) == 4
+    assert sum(point.interviews for point in trends.monthly) == 4
+    assert AnalyticsService(db).check_user_stats(user_id) == {}
+    db.close()
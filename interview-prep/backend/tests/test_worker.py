@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from app import models, worker
+from app.cache import MemoryCache
+from app.routers import jobs
+from app.services.interview_service import InterviewService
+
+
+@pytest.fixture
+def worker_sessions(session_factory, monkeypatch):
+    """Point the worker's tasks at the test database"""
+    monkeypatch.setattr(worker, "SessionLocal", session_factory)
+    return session_factory
+
+
+def test_schedule_prep_retry_does_not_recreate_events(worker_sessions, user, interview, monkeypatch):
+    user_id, interview_id = user.id, interview.id
+    create_calls = []
+    save_calls = []
+    create_prep_events = InterviewService.create_prep_events
+    save_prep_sessions = InterviewService.save_prep_sessions
+    
+    def counting_create(self, *args, **kwargs):
+        create_calls.append(args)
+        return create_prep_events(self, *args, **kwargs)
+    
+    def flaky_save(self, *args, **kwargs):
+        save_calls.append(args)
+        if len(save_calls) == 1:
+            raise OperationalError("COMMIT", {}, Exception("server closed the connection"))
+        return save_prep_sessions(self, *args, **kwargs)
+    
+    monkeypatch.setattr(InterviewService, "create_prep_events", counting_create)
+    monkeypatch.setattr(InterviewService, "save_prep_sessions", flaky_save)
+    
+    result = worker.schedule_prep_task.apply(args=(user_id, interview_id, 3, 6, 9)).get()
+    
+    assert len(create_calls) == 1
+    assert len(save_calls) == 2
+    assert result["sessions"] == 3
+    db = worker_sessions()
+    sessions = db.query(models.PrepSession).filter_by(interview_id=interview_id).all()
+    assert len(sessions) == 3
+    assert all(session.calendar_event_id for session in sessions)
+    db.close()
+
+
+def test_deleted_user_fails_without_retrying(worker_sessions, monkeypatch):
+    retries = []
+    monkeypatch.setattr(worker.sync_from_gmail_task, "retry", lambda *args, **kwargs: retries.append(kwargs))
+    
+    job = worker.sync_from_gmail_task.apply(args=(12345,))
+    
+    assert job.failed()
+    assert isinstance(job.result, LookupError)
+    assert retries == []
+
+
+class FakeResult:
+    def __init__(self, state, result=None):
+        self.status = state
+        self.result = result
+    
+    def successful(self):
+        return self.status == "SUCCESS"
+    
+    def failed(self):
+        return self.status == "FAILURE"
+
+
+@pytest.mark.parametrize("state,result", [
+    ("PENDING", None),
+    ("FAILURE", RuntimeError("password authentication failed for user postgres")),
+    ("SUCCESS", {"user_id": 1}),
+])
+def test_job_status_is_only_visible_to_its_owner(monkeypatch, state, result):
+    monkeypatch.setattr(jobs, "AsyncResult", lambda job_id, app: FakeResult(state, result))
+    monkeypatch.setattr(worker, "job_owners", MemoryCache("job_owners"))
+    worker.job_owners.set("job-1", 1)
+    
+    with pytest.raises(HTTPException) as error:
+        jobs.get_job_status("job-1", current_user=SimpleNamespace(id=2))
+    assert error.value.status_code == 404
+    with pytest.raises(HTTPException):
+        jobs.get_job_status("never-enqueued", current_user=SimpleNamespace(id=1))
+    
+    response = jobs.get_job_status("job-1", current_user=SimpleNamespace(id=1))
+    assert response.status == state
+    assert "password" not in (response.error or "")
@@ -29,6 +29,11 @@ class Settings(BaseSettings):
     # Automation
     HEADLESS_BROWSER: bool = True
     MOCK_AUTOMATION: bool = True
+    AUTOMATION_FIXTURES: bool = False  # Serve bundled fixture pages instead of real job boards (no network)
+    AUTOMATION_MAX_CONTEXTS: int = 4  # Browser contexts, and so concurrent applications, per batch
+    AUTOMATION_CONTEXT_MAX_USES: int = 20  # Applications before a context is replaced
+    AUTOMATION_PER_BOARD_CONCURRENCY: int = 2
+    AUTOMATION_WAIT_TIMEOUT_MS: int = 10000  # Longest wait for a form step or submission to settle
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
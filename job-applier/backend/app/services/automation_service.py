@@ -1,17 +1,115 @@
-from playwright.async_api import async_playwright, Browser, Page
-from typing import Dict, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Locator, Page, Route
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+import asyncio
 import logging
+import time
 from app.config import settings
+from app.services.form_fields import DISCOVER_FIELDS_JS, FILL_FIELDS_JS, match_fields
+from app.services.page_state import PAGE_ADVANCED_JS, PAGE_STATE_JS
 
 logger = logging.getLogger(__name__)
 
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def detect_job_board(job_url: str) -> str:
+    """Job board a posting URL belongs to: linkedin, indeed, greenhouse or generic"""
+    if 'linkedin.com' in job_url:
+        return 'linkedin'
+    if 'indeed.com' in job_url:
+        return 'indeed'
+    if 'greenhouse.io' in job_url:
+        return 'greenhouse'
+    return 'generic'
+
+
+class ContextPool:
+    """Bounded pool of isolated browser contexts, each replaced after max_uses applications"""
+    
+    def __init__(self, browser: Browser, size: int, max_uses: int, setup=None):
+        self.browser = browser
+        self.max_uses = max_uses
+        self.setup = setup
+        self._idle: asyncio.Queue = asyncio.Queue()
+        # Contexts are created lazily, so a small batch never opens the whole pool
+        for _ in range(size):
+            self._idle.put_nowait((None, 0))
+    
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Borrow a context, waiting while all of them are in use"""
+        context, uses = await self._idle.get()
+        if context is None:
+            try:
+                context = await self.browser.new_context()
+                if self.setup:
+                    await self.setup(context)
+            except BaseException:
+                # A context whose setup failed may be missing its routes, so never pool it
+                if context is not None:
+                    await self._close(context)
+                self._idle.put_nowait((None, 0))
+                raise
+        try:
+            yield context
+        finally:
+            uses += 1
+            if uses >= self.max_uses:
+                # Fresh contexts keep cookies, storage and leaked pages from piling up
+                await self._close(context)
+                context, uses = None, 0
+            self._idle.put_nowait((context, uses))
+    
+    async def close(self):
+        """Close every idle context"""
+        while not self._idle.empty():
+            context, _ = self._idle.get_nowait()
+            if context is not None:
+                await self._close(context)
+    
+    async def _close(self, context: BrowserContext):
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
+
+
+class StepTrace:
+    """Wall-clock timings of the steps of one application, and of each form filled, in the order they ran"""
+    
+    def __init__(self):
+        self.steps: List[Dict] = []
+        self.form_fills: List[Dict] = []
+    
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time the enclosed block, recording it even if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({'step': name, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+
 
 class AutomationService:
     """Service for browser automation using Playwright"""
     
+    # Buttons that move a LinkedIn Easy Apply form forward; exactly one shows at a time
+    LINKEDIN_STEP_BUTTONS = 'button:has-text("Next"), button:has-text("Review"), button:has-text("Submit application")'
+    MAX_FORM_STEPS = 10
+    
     def __init__(self, headless: bool = None, mock_mode: bool = None):
         self.headless = headless if headless is not None else settings.HEADLESS_BROWSER
         self.mock_mode = mock_mode if mock_mode is not None else settings.MOCK_AUTOMATION
+        # Fixture pages need a real browser, so they take precedence over mock mode
+        self.use_fixtures = settings.AUTOMATION_FIXTURES
+        if self.use_fixtures:
+            self.mock_mode = False
         self.browser: Optional[Browser] = None
         self.playwright = None
     
@@ -20,6 +118,8 @@ class AutomationService:
         if self.mock_mode:
             logger.info("Running in mock automation mode")
             return
+        if self.use_fixtures:
+            logger.info(f"Serving job pages from fixtures in {FIXTURE_DIR}")
         
         try:
             self.playwright = await async_playwright().start()
@@ -51,7 +151,7 @@ class AutomationService:
             user_data: User profile data for form filling
             resume_path: Path to resume file
             cover_letter: Cover letter text
-            
+        
         Returns:
             Dict with success status and details
         """
@@ -59,62 +159,205 @@ class AutomationService:
             return self._mock_apply_to_job(job_url, user_data)
         
         try:
-            page = await self.browser.new_page()
-            await page.goto(job_url, wait_until='networkidle')
+            context = await self.browser.new_context()
+            try:
+                await self._setup_context(context)
+                return await self._apply_in_context(context, job_url, user_data, resume_path, cover_letter)
+            finally:
+                await context.close()
+        
+        except Exception as e:
+            logger.error(f"Automation error for {job_url}: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to apply to job'
+            }
+    
+    async def apply_to_jobs(
+        self,
+        jobs: Iterable,
+        user_data: Dict,
+        resume_path: Optional[str] = None,
+        cover_letters: Optional[Dict[int, str]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Apply to many jobs concurrently, yielding each result as soon as it finishes
+        
+        Applications share one browser through a pool of AUTOMATION_MAX_CONTEXTS
+        isolated contexts, each recycled after AUTOMATION_CONTEXT_MAX_USES jobs. At
+        most AUTOMATION_PER_BOARD_CONCURRENCY applications run against one job board
+        at a time.
+        
+        Args:
+            jobs: Job rows (anything with id, job_url and job_board)
+            user_data: User profile data for form filling
+            resume_path: Path to resume file
+            cover_letters: Cover letter text per job ID
+        
+        Yields:
+            apply_to_job result dicts with their steps and form_fills traces, plus
+            job_id, job_board and duration_ms
+        """
+        cover_letters = cover_letters or {}
+        board_limits = defaultdict(lambda: asyncio.Semaphore(settings.AUTOMATION_PER_BOARD_CONCURRENCY))
+        pool = None
+        if not self.mock_mode:
+            pool = ContextPool(
+                self.browser,
+                settings.AUTOMATION_MAX_CONTEXTS,
+                settings.AUTOMATION_CONTEXT_MAX_USES,
+                setup=self._setup_context
+            )
+        
+        async def run(job) -> Dict:
+            board = (job.job_board or detect_job_board(job.job_url)).lower()
+            # Take the board slot before a context so capped boards don't hold contexts idle
+            async with board_limits[board]:
+                started = time.perf_counter()
+                try:
+                    if pool is None:
+                        result = self._mock_apply_to_job(job.job_url, user_data)
+                    else:
+                        async with pool.context() as context:
+                            result = await self._apply_in_context(
+                                context, job.job_url, user_data, resume_path, cover_letters.get(job.id)
+                            )
+                except Exception as e:
+                    logger.error(f"Automation error for {job.job_url}: {e}")
+                    result = {'success': False, 'error': str(e), 'message': 'Failed to apply to job'}
+                duration_ms = round((time.perf_counter() - started) * 1000)
+            return {**result, 'job_id': job.id, 'job_board': board, 'duration_ms': duration_ms}
+        
+        tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # The consumer may stop early; don't leave applications running in the background
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if pool is not None:
+                await pool.close()
+    
+    async def _apply_in_context(
+        self,
+        context: BrowserContext,
+        job_url: str,
+        user_data: Dict,
+        resume_path: Optional[str] = None,
+        cover_letter: Optional[str] = None
+    ) -> Dict:
+        """Apply to a job posting in a new page of the given context, adding a per-step timing trace"""
+        trace = StepTrace()
+        page = await context.new_page()
+        try:
+            with trace.step('load'):
+                await page.goto(job_url, wait_until='networkidle')
             
             # Detect job board and apply accordingly
-            if 'linkedin.com' in job_url:
-                result = await self._apply_linkedin(page, user_data, resume_path)
-            elif 'indeed.com' in job_url:
-                result = await self._apply_indeed(page, user_data, resume_path)
-            elif 'greenhouse.io' in job_url:
-                result = await self._apply_greenhouse(page, user_data, resume_path, cover_letter)
+            board = detect_job_board(job_url)
+            if board == 'linkedin':
+                result = await self._apply_linkedin(page, user_data, resume_path, trace)
+            elif board == 'indeed':
+                result = await self._apply_indeed(page, user_data, resume_path, trace)
+            elif board == 'greenhouse':
+                result = await self._apply_greenhouse(page, user_data, resume_path, cover_letter, trace)
             else:
-                result = await self._apply_generic(page, user_data, resume_path, cover_letter)
-            
-            await page.close()
-            return result
+                result = await self._apply_generic(page, user_data, resume_path, cover_letter, trace)
         
         except Exception as e:
             logger.error(f"Automation error for {job_url}: {e}")
-            return {
+            result = {
                 'success': False,
                 'error': str(e),
                 'message': 'Failed to apply to job'
             }
+        finally:
+            await page.close()
+        return {**result, 'steps': trace.steps, 'form_fills': trace.form_fills}
+    
+    async def _setup_context(self, context: BrowserContext):
+        """Route every request to local fixture pages when fixtures are enabled"""
+        if self.use_fixtures:
+            await context.route("**/*", self._serve_fixture)
+    
+    async def _serve_fixture(self, route: Route):
+        """Answer documents with the fixture page for their job board and everything else with an empty body"""
+        if route.request.resource_type == 'document':
+            board = detect_job_board(route.request.url)
+            await route.fulfill(path=str(FIXTURE_DIR / f"{board}.html"), content_type='text/html')
+        else:
+            await route.fulfill(status=204, body='')
+    
+    async def _click_and_settle(self, page: Page, locator: Locator) -> bool:
+        """
+        Click an element and wait for the page to move on
+        
+        The page counts as moved on once it navigates, shows a submission
+        confirmation, or shows a heading, button label or form control it did not
+        have before the click: the next step's title, a Next button relabelled to
+        Submit, the next step's fields. The clicked button may stay on the page
+        throughout, as many step forms keep one footer button.
+        
+        Returns:
+            False if nothing changed within AUTOMATION_WAIT_TIMEOUT_MS
+        """
+        timeout = settings.AUTOMATION_WAIT_TIMEOUT_MS
+        before = await page.evaluate(PAGE_STATE_JS)
+        await locator.click(timeout=timeout)
+        try:
+            await page.wait_for_function(PAGE_ADVANCED_JS, arg=before, timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+        except PlaywrightError:
+            # The old document was torn down by a navigation
+            pass
+        # Returns at once unless the click started a navigation
+        await page.wait_for_load_state('domcontentloaded', timeout=timeout)
+        return True
     
-    async def _apply_linkedin(self, page: Page, user_data: Dict, resume_path: Optional[str]) -> Dict:
+    async def _apply_linkedin(self, page: Page, user_data: Dict, resume_path: Optional[str], trace: StepTrace) -> Dict:
         """Apply to LinkedIn job"""
         try:
             # Click Easy Apply button
             easy_apply_button = page.locator('button:has-text("Easy Apply")')
             if await easy_apply_button.count() > 0:
-                await easy_apply_button.click()
-                await page.wait_for_timeout(1000)
+                step_button = page.locator(self.LINKEDIN_STEP_BUTTONS).first
+                with trace.step('open_form'):
+                    await easy_apply_button.click()
+                    await step_button.wait_for(state='visible', timeout=settings.AUTOMATION_WAIT_TIMEOUT_MS)
                 
-                # Fill in form fields
-                await self._fill_common_fields(page, user_data)
-                
-                # Upload resume if available
-                if resume_path:
-                    file_input = page.locator('input[type="file"]')
-                    if await file_input.count() > 0:
-                        await file_input.set_input_files(resume_path)
-                
-                # Click through multi-page forms
+                # Fill each page of the form, then click through until the submit button is showing
+                form_step = 0
                 while True:
-                    next_button = page.locator('button:has-text("Next"), button:has-text("Review")')
-                    if await next_button.count() == 0:
+                    with trace.step('fill_fields'):
+                        await self._fill_common_fields(page, user_data, trace)
+                    
+                    # Upload resume if available
+                    if resume_path:
+                        file_input = page.locator('input[type="file"]')
+                        if await file_input.count() > 0:
+                            with trace.step('upload_resume'):
+                                await file_input.set_input_files(resume_path)
+                    
+                    if 'Submit application' in await step_button.inner_text():
                         break
-                    await next_button.click()
-                    await page.wait_for_timeout(1000)
+                    form_step += 1
+                    if form_step > self.MAX_FORM_STEPS:
+                        return {'success': False, 'message': 'Easy Apply form has too many steps'}
+                    with trace.step(f'form_step_{form_step}'):
+                        if not await self._click_and_settle(page, step_button):
+                            return {'success': False, 'message': 'Easy Apply form did not advance'}
+                        await step_button.wait_for(state='visible', timeout=settings.AUTOMATION_WAIT_TIMEOUT_MS)
                 
                 # Submit application
-                submit_button = page.locator('button:has-text("Submit application")')
-                if await submit_button.count() > 0:
-                    await submit_button.click()
-                    await page.wait_for_timeout(2000)
+                with trace.step('submit'):
+                    submitted = await self._click_and_settle(page, step_button)
+                if submitted:
                     return {'success': True, 'message': 'Applied via LinkedIn Easy Apply'}
+                return {'success': False, 'message': 'Submission was not confirmed'}
             
             return {'success': False, 'message': 'Easy Apply not available'}
         
@@ -122,30 +365,34 @@ class AutomationService:
             logger.error(f"LinkedIn application error: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def _apply_indeed(self, page: Page, user_data: Dict, resume_path: Optional[str]) -> Dict:
+    async def _apply_indeed(self, page: Page, user_data: Dict, resume_path: Optional[str], trace: StepTrace) -> Dict:
         """Apply to Indeed job"""
         try:
             # Click Apply Now button
             apply_button = page.locator('button:has-text("Apply now"), a:has-text("Apply now")')
             if await apply_button.count() > 0:
-                await apply_button.click()
-                await page.wait_for_timeout(1000)
+                submit_button = page.locator('button[type="submit"], button:has-text("Submit")').first
+                with trace.step('open_form'):
+                    await apply_button.click()
+                    await submit_button.wait_for(state='visible', timeout=settings.AUTOMATION_WAIT_TIMEOUT_MS)
                 
                 # Fill form fields
-                await self._fill_common_fields(page, user_data)
+                with trace.step('fill_fields'):
+                    await self._fill_common_fields(page, user_data, trace)
                 
                 # Upload resume
                 if resume_path:
                     file_input = page.locator('input[type="file"]')
                     if await file_input.count() > 0:
-                        await file_input.set_input_files(resume_path)
+                        with trace.step('upload_resume'):
+                            await file_input.set_input_files(resume_path)
                 
                 # Submit
-                submit_button = page.locator('button[type="submit"], button:has-text("Submit")')
-                if await submit_button.count() > 0:
-                    await submit_button.click()
-                    await page.wait_for_timeout(2000)
+                with trace.step('submit'):
+                    submitted = await self._click_and_settle(page, submit_button)
+                if submitted:
                     return {'success': True, 'message': 'Applied via Indeed'}
+                return {'success': False, 'message': 'Submission was not confirmed'}
             
             return {'success': False, 'message': 'Apply button not found'}
         
@@ -153,29 +400,41 @@ class AutomationService:
             logger.error(f"Indeed application error: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def _apply_greenhouse(self, page: Page, user_data: Dict, resume_path: Optional[str], cover_letter: Optional[str]) -> Dict:
+    async def _apply_greenhouse(
+        self,
+        page: Page,
+        user_data: Dict,
+        resume_path: Optional[str],
+        cover_letter: Optional[str],
+        trace: StepTrace
+    ) -> Dict:
         """Apply to Greenhouse ATS job"""
         try:
-            await self._fill_common_fields(page, user_data)
+            with trace.step('fill_fields'):
+                await self._fill_common_fields(page, user_data, trace)
             
             # Upload resume
             if resume_path:
                 resume_input = page.locator('input[name*="resume"], input[id*="resume"]')
                 if await resume_input.count() > 0:
-                    await resume_input.set_input_files(resume_path)
+                    with trace.step('upload_resume'):
+                        await resume_input.set_input_files(resume_path)
             
             # Fill cover letter
             if cover_letter:
                 cover_letter_field = page.locator('textarea[name*="cover"], textarea[id*="cover"]')
                 if await cover_letter_field.count() > 0:
-                    await cover_letter_field.fill(cover_letter)
+                    with trace.step('cover_letter'):
+                        await cover_letter_field.fill(cover_letter)
             
             # Submit
             submit_button = page.locator('input[type="submit"], button[type="submit"]')
             if await submit_button.count() > 0:
-                await submit_button.click()
-                await page.wait_for_timeout(2000)
-                return {'success': True, 'message': 'Applied via Greenhouse'}
+                with trace.step('submit'):
+                    submitted = await self._click_and_settle(page, submit_button.first)
+                if submitted:
+                    return {'success': True, 'message': 'Applied via Greenhouse'}
+                return {'success': False, 'message': 'Submission was not confirmed'}
             
             return {'success': False, 'message': 'Submit button not found'}
         
@@ -183,25 +442,35 @@ class AutomationService:
             logger.error(f"Greenhouse application error: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def _apply_generic(self, page: Page, user_data: Dict, resume_path: Optional[str], cover_letter: Optional[str]) -> Dict:
+    async def _apply_generic(
+        self,
+        page: Page,
+        user_data: Dict,
+        resume_path: Optional[str],
+        cover_letter: Optional[str],
+        trace: StepTrace
+    ) -> Dict:
         """Apply to generic job posting"""
         try:
             # Try to find and fill common form fields
-            await self._fill_common_fields(page, user_data)
+            with trace.step('fill_fields'):
+                await self._fill_common_fields(page, user_data, trace)
             
             # Upload resume if file input exists
             if resume_path:
                 file_inputs = page.locator('input[type="file"]')
                 count = await file_inputs.count()
                 if count > 0:
-                    await file_inputs.first.set_input_files(resume_path)
+                    with trace.step('upload_resume'):
+                        await file_inputs.first.set_input_files(resume_path)
             
             # Fill cover letter if textarea exists
             if cover_letter:
                 textareas = page.locator('textarea')
                 count = await textareas.count()
                 if count > 0:
-                    await textareas.first.fill(cover_letter)
+                    with trace.step('cover_letter'):
+                        await textareas.first.fill(cover_letter)
             
             # Try to find and click submit button
             submit_selectors = [
@@ -215,9 +484,11 @@ class AutomationService:
             for selector in submit_selectors:
                 button = page.locator(selector)
                 if await button.count() > 0:
-                    await button.first.click()
-                    await page.wait_for_timeout(2000)
-                    return {'success': True, 'message': 'Applied to job'}
+                    with trace.step('submit'):
+                        submitted = await self._click_and_settle(page, button.first)
+                    if submitted:
+                        return {'success': True, 'message': 'Applied to job'}
+                    return {'success': False, 'message': 'Submission was not confirmed'}
             
             return {'success': False, 'message': 'Could not find submit button'}
         
@@ -225,36 +496,27 @@ class AutomationService:
             logger.error(f"Generic application error: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def _fill_common_fields(self, page: Page, user_data: Dict):
-        """Fill common application form fields"""
-        field_mappings = {
-            'name': ['name', 'full name', 'fullname'],
-            'email': ['email', 'e-mail'],
-            'phone': ['phone', 'telephone', 'mobile'],
-            'location': ['location', 'city', 'address'],
-            'linkedin': ['linkedin', 'linkedin url'],
-            'github': ['github', 'github url'],
-            'portfolio': ['portfolio', 'website', 'personal website'],
-        }
+    async def _fill_common_fields(self, page: Page, user_data: Dict, trace: StepTrace):
+        """
+        Fill common application form fields in two browser round trips
         
-        for data_key, field_names in field_mappings.items():
-            value = user_data.get(data_key)
-            if not value:
-                continue
-            
-            for field_name in field_names:
-                # Try various selector strategies
-                selectors = [
-                    f'input[name*="{field_name}" i]',
-                    f'input[id*="{field_name}" i]',
-                    f'input[placeholder*="{field_name}" i]',
-                ]
-                
-                for selector in selectors:
-                    field = page.locator(selector)
-                    if await field.count() > 0:
-                        await field.first.fill(str(value))
-                        break
+        One evaluate() lists the page's inputs, textareas and selects with their
+        name, id, placeholder and label text, match_fields picks a control for
+        each profile value, and a second evaluate() fills them all. Pages without
+        controls are not recorded in trace.form_fills.
+        """
+        started = time.perf_counter()
+        fields = await page.evaluate(DISCOVER_FIELDS_JS)
+        if not fields:
+            return
+        
+        fills = match_fields(fields, user_data)
+        filled = await page.evaluate(FILL_FIELDS_JS, fills) if fills else 0
+        trace.form_fills.append({
+            'fields': len(fields),
+            'filled': filled,
+            'ms': round((time.perf_counter() - started) * 1000, 1)
+        })
     
     def _mock_apply_to_job(self, job_url: str, user_data: Dict) -> Dict:
         """Mock application for testing"""
@@ -0,0 +1,214 @@
+import re
+from typing import Dict, List, Tuple
+
+# Runs in the page: returns every visible, editable control with the text that describes it
+DISCOVER_FIELDS_JS = """
+() => {
+  const SKIP_TYPES = new Set(['hidden', 'file', 'submit', 'button', 'reset', 'image', 'checkbox', 'radio']);
+  const text = (el) => (el ? el.textContent : '').replace(/\\s+/g, ' ').trim();
+  const fields = [];
+  document.querySelectorAll('input, textarea, select').forEach((el, index) => {
+    const type = (el.getAttribute('type') || '').toLowerCase();
+    if (el.tagName === 'INPUT' && SKIP_TYPES.has(type)) return;
+    if (el.disabled || el.readOnly) return;
+    // Invisible controls include honeypots that flag bots, so never fill them
+    if (!el.getClientRects().length || window.getComputedStyle(el).visibility === 'hidden') return;
+    const labels = Array.from(el.labels || []).map(text);
+    for (const id of (el.getAttribute('aria-labelledby') || '').split(/\\s+/).filter(Boolean)) {
+      labels.push(text(document.getElementById(id)));
+    }
+    labels.push(el.getAttribute('aria-label') || '');
+    fields.push({
+      index,
+      tag: el.tagName.toLowerCase(),
+      type,
+      name: el.getAttribute('name') || '',
+      id: el.id || '',
+      placeholder: el.getAttribute('placeholder') || '',
+      autocomplete: (el.getAttribute('autocomplete') || '').toLowerCase(),
+      label: labels.join(' ')
+    });
+  });
+  return fields;
+}
+"""
+
+# Runs in the page: sets each [index, value] pair the way typing would and returns how many were set
+FILL_FIELDS_JS = """
+(fills) => {
+  const PROTOTYPES = {INPUT: HTMLInputElement, TEXTAREA: HTMLTextAreaElement, SELECT: HTMLSelectElement};
+  const elements = document.querySelectorAll('input, textarea, select');
+  let filled = 0;
+  for (const [index, value] of fills) {
+    const el = elements[index];
+    if (!el || !PROTOTYPES[el.tagName]) continue;
+    let newValue = value;
+    if (el.tagName === 'SELECT') {
+      const wanted = value.trim().toLowerCase();
+      const option = Array.from(el.options).find(
+        (option) => option.value.toLowerCase() === wanted || option.text.trim().toLowerCase() === wanted
+      );
+      if (!option) continue;
+      newValue = option.value;
+    }
+    // Go through the native setter so frameworks that track the value (React) see the change
+    Object.getOwnPropertyDescriptor(PROTOTYPES[el.tagName].prototype, 'value').set.call(el, newValue);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    filled++;
+  }
+  return filled;
+}
+"""
+
+# Profile field -> phrases that identify its control; longer phrases score higher. A phrase
+# only counts when it makes up the whole attribute, give or take FILLER_WORDS, so
+# "Company name" is not a name and "Referrer email" is not the applicant's email.
+FIELD_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'first_name': ('first name', 'firstname', 'given name', 'fname'),
+    'last_name': ('last name', 'lastname', 'family name', 'surname', 'lname'),
+    'name': ('full name', 'fullname', 'name'),
+    'email': ('email', 'e mail'),
+    'phone': ('phone', 'telephone', 'mobile', 'tel'),
+    'location': ('location', 'city', 'address'),
+    # Labels spell these in camel case, which tokenize splits into two words
+    'linkedin': ('linkedin', 'LinkedIn', 'linkedin url'),
+    'github': ('github', 'GitHub', 'github url'),
+    'portfolio': ('portfolio', 'website', 'personal website'),
+}
+# Words that may surround a phrase without changing what the control asks for
+FILLER_WORDS = frozenset((
+    'a', 'an', 'the', 'your', 'my', 'please', 'enter', 'optional', 'required', 'applicant', 'candidate',
+    'contact', 'current', 'personal', 'primary', 'job', 'application', 'address', 'number', 'url', 'link',
+    'profile', 'state',
+))
+# How much a phrase match counts in each descriptive attribute
+SOURCE_WEIGHTS = (('label', 3), ('name', 2), ('id', 2), ('placeholder', 2))
+# autocomplete tokens and input types that name the field outright
+AUTOCOMPLETE_FIELDS = {
+    'name': 'name',
+    'given-name': 'first_name',
+    'family-name': 'last_name',
+    'email': 'email',
+    'tel': 'phone',
+    'address-level2': 'location',
+    'url': 'portfolio',
+}
+AUTOCOMPLETE_WEIGHT = 10
+INPUT_TYPE_FIELDS = {'email': 'email', 'tel': 'phone'}
+INPUT_TYPE_WEIGHT = 4
+# Input types that only take some profile fields; other types (number, date, password...) take none
+TEXT_INPUT_TYPES = frozenset(('', 'text'))
+TYPED_INPUT_FIELDS = {'email': {'email'}, 'tel': {'phone'}, 'url': {'linkedin', 'github', 'portfolio'}}
+# Lowest score a control needs to be filled with a profile field. A bare "name" is
+# common in non-profile fields, so it needs a label and an attribute to agree.
+DEFAULT_MIN_SCORE = 2
+MIN_SCORES = {'name': 5}
+# Textareas are free-text questions far more often than profile fields
+TEXTAREA_MIN_SCORE = 8
+
+_CAMEL_BOUNDARY = re.compile(r'([a-z0-9])([A-Z])')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Split an attribute such as 'applicant.phoneNumber' or 'job_application[email]' into lowercase words"""
+    return tuple(token for token in _NON_ALNUM.split(_CAMEL_BOUNDARY.sub(r'\1 \2', text).lower()) if token)
+
+
+KEYWORD_TOKENS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    key: tuple(tokenize(phrase) for phrase in phrases) for key, phrases in FIELD_KEYWORDS.items()
+}
+
+
+def _phrase_length(tokens: Tuple[str, ...], phrases: Tuple[Tuple[str, ...], ...]) -> int:
+    """
+    Word count of the longest phrase appearing in tokens
+    
+    Returns:
+        0 if no phrase appears, or if a word other than the phrases and FILLER_WORDS does
+    """
+    best = 0
+    covered = set()
+    for phrase in phrases:
+        size = len(phrase)
+        for i in range(len(tokens) - size + 1):
+            if tokens[i:i + size] == phrase:
+                covered.update(range(i, i + size))
+                best = max(best, size)
+    if any(i not in covered and token not in FILLER_WORDS for i, token in enumerate(tokens)):
+        return 0
+    return best
+
+
+def accepts(field: Dict, key: str) -> bool:
+    """Whether a control's tag and input type can hold a profile field at all"""
+    if field.get('tag') != 'input':
+        return True
+    input_type = field.get('type', '')
+    return input_type in TEXT_INPUT_TYPES or key in TYPED_INPUT_FIELDS.get(input_type, ())
+
+
+def score_field(field: Dict, key: str) -> int:
+    """How strongly a discovered control looks like the input for a profile field, 0 if it can't be"""
+    if not accepts(field, key):
+        return 0
+    score = 0
+    for source, weight in SOURCE_WEIGHTS:
+        score += weight * _phrase_length(tokenize(field.get(source, '')), KEYWORD_TOKENS[key])
+    autocomplete = field.get('autocomplete', '').split()
+    if autocomplete and AUTOCOMPLETE_FIELDS.get(autocomplete[-1]) == key:
+        score += AUTOCOMPLETE_WEIGHT
+    # The input type backs up a description; on its own it can't tell whose email is asked for
+    if score and INPUT_TYPE_FIELDS.get(field.get('type', '')) == key:
+        score += INPUT_TYPE_WEIGHT
+    return score
+
+
+def min_score(field: Dict, key: str) -> int:
+    """Lowest score at which a control is filled with a profile field"""
+    required = MIN_SCORES.get(key, DEFAULT_MIN_SCORE)
+    if field.get('tag') == 'textarea':
+        required = max(required, TEXTAREA_MIN_SCORE)
+    return required
+
+
+def profile_values(user_data: Dict) -> Dict[str, str]:
+    """Fillable profile values, with first and last name derived from the full name"""
+    values = {key: str(user_data[key]) for key in FIELD_KEYWORDS if user_data.get(key)}
+    if 'name' in values:
+        first, _, last = values['name'].partition(' ')
+        values.setdefault('first_name', first)
+        if last:
+            values.setdefault('last_name', last)
+    return values
+
+
+def match_fields(fields: List[Dict], user_data: Dict) -> List[Tuple[int, str]]:
+    """
+    Assign profile values to discovered controls
+    
+    Every (control, profile field) pair is scored and the best pairs are taken
+    greedily, so each control and each profile field is used at most once.
+    Pairs scoring under min_score are never taken: an unfilled control is
+    better than a profile value in a field that asked for something else.
+    
+    Returns:
+        (control index, value) pairs, in page order
+    """
+    values = profile_values(user_data)
+    candidates = []
+    for field in fields:
+        for key in values:
+            score = score_field(field, key)
+            if score >= min_score(field, key):
+                candidates.append((-score, field['index'], key))
+    candidates.sort()
+    
+    assigned: Dict[int, str] = {}
+    used_keys = set()
+    for _, index, key in candidates:
+        if index not in assigned and key not in used_keys:
+            assigned[index] = values[key]
+            used_keys.add(key)
+    return sorted(assigned.items())
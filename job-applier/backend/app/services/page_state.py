@@ -0,0 +1,34 @@
+"""Page probes that tell whether a click moved an application forward"""
+
+# Runs in the page: the visible headings, button labels and control names of the
+# current form step, and whether a submission confirmation is showing
+PAGE_STATE_JS = """
+() => {
+  const CONFIRMATION_SELECTOR = '[id*="confirmation" i], [class*="confirmation" i], [data-test*="confirmation" i]';
+  const CONFIRMATION_TEXT = /application (has been |was )?(submitted|received|sent)|thank(s| you)[^.]{0,40}(appl|submi)/i;
+  const visible = (el) => el.getClientRects().length > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+  const texts = (selector) => Array.from(document.querySelectorAll(selector)).filter(visible)
+    .map((el) => (el.innerText || el.value || '').replace(/\\s+/g, ' ').trim()).filter(Boolean);
+  return {
+    url: location.href,
+    confirmed: Array.from(document.querySelectorAll(CONFIRMATION_SELECTOR)).some(visible)
+      || CONFIRMATION_TEXT.test(document.body ? document.body.innerText : ''),
+    headings: texts('h1, h2, h3, h4, legend, [role="heading"], [aria-current="step"], [role="progressbar"]'),
+    buttons: texts('button, input[type="submit"], input[type="button"], [role="button"]'),
+    controls: Array.from(document.querySelectorAll('input, textarea, select')).filter(visible)
+      .map((el) => el.name || el.id).filter(Boolean)
+  };
+}
+"""
+
+# Runs in the page: true once the page has moved on from the state captured before a click.
+# Only additions count, so the empty moment while a step re-renders, or a
+# validation error on the same step, is not mistaken for progress.
+PAGE_ADVANCED_JS = """
+(before) => {
+  const now = (""" + PAGE_STATE_JS.strip() + """)();
+  if (now.url !== before.url || (now.confirmed && !before.confirmed)) return true;
+  const added = (key) => now[key].some((text) => !before[key].includes(text));
+  return added('headings') || added('buttons') || added('controls');
+}
+"""
@@ -0,0 +1,91 @@
+"""
+Fixture apply benchmark: event-driven waits vs the fixed sleeps they replaced
+
+Applies to each bundled fixture board (app/fixtures) in a local Chromium and
+reports the wall time per board and per step, once with
+AutomationService._click_and_settle as it is and once with it swapped for a
+click followed by the fixed sleep the flows used before: 1 s after a step
+button, 2 s after a submit.
+
+Needs Playwright's Chromium (playwright install chromium); no network access.
+
+Usage:
+    python -m benchmarks.apply_fixtures [--runs 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List
+from playwright.async_api import Locator, Page
+from app.config import settings
+from app.services.automation_service import AutomationService
+
+JOB_URLS = {
+    'linkedin': "https://www.linkedin.com/jobs/view/1",
+    'indeed': "https://www.indeed.com/viewjob?jk=2",
+    'greenhouse': "https://boards.greenhouse.io/acme/jobs/3",
+    'generic': "https://careers.example.com/jobs/4",
+}
+USER_DATA = {'full_name': 'Ada Lovelace', 'email': 'ada@example.com', 'phone': '555-0100'}
+
+
+async def fixed_sleep_click(self, page: Page, locator: Locator) -> bool:
+    """The click-then-sleep every flow used before _click_and_settle"""
+    label = await locator.inner_text()
+    await locator.click()
+    await page.wait_for_timeout(2000 if 'submit' in label.lower() else 1000)
+    return True
+
+
+async def measure(runs: int) -> Dict[str, List[Dict]]:
+    """apply_to_job results per board, runs times each, one application at a time"""
+    service = AutomationService(headless=True)
+    await service.initialize()
+    if service.mock_mode:
+        raise SystemExit("Chromium did not start; run `playwright install chromium` first")
+    results = defaultdict(list)
+    try:
+        for _ in range(runs):
+            for board, url in JOB_URLS.items():
+                started = time.perf_counter()
+                result = await service.apply_to_job(url, USER_DATA)
+                results[board].append({**result, 'duration_ms': (time.perf_counter() - started) * 1000})
+    finally:
+        await service.close()
+    return results
+
+
+def report(name: str, results: Dict[str, List[Dict]]):
+    print(f"{name}")
+    for board, runs in results.items():
+        failures = sum(not run['success'] for run in runs)
+        steps = defaultdict(list)
+        for run in runs:
+            for step in run['steps']:
+                steps[step['step']].append(step['ms'])
+        breakdown = ", ".join(f"{step} {statistics.median(ms):.0f}" for step, ms in steps.items())
+        print(
+            f"  {board:<11} {statistics.median(run['duration_ms'] for run in runs):>7.0f} ms"
+            f"  ({failures} failed)  {breakdown}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Applications per board and mode; medians are reported")
+    args = parser.parse_args(argv)
+    settings.AUTOMATION_FIXTURES = True
+    
+    report("event-driven waits", asyncio.run(measure(args.runs)))
+    original = AutomationService._click_and_settle
+    AutomationService._click_and_settle = fixed_sleep_click
+    try:
+        report("fixed sleeps", asyncio.run(measure(args.runs)))
+    finally:
+        AutomationService._click_and_settle = original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import asyncio
+import os
+import pytest
+from playwright.async_api import async_playwright
+
+# Settings requires these; the tests never reach the database or the AI API
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+
+
+def chromium_available() -> bool:
+    """Whether Playwright can launch its Chromium here; browser tests skip otherwise"""
+    async def probe():
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch()
+            await browser.close()
+    
+    try:
+        asyncio.run(probe())
+        return True
+    except Exception:
+        return False
+
+
+requires_browser = pytest.mark.skipif(not chromium_available(), reason="Playwright Chromium is not installed")
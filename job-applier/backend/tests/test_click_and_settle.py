@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from playwright.async_api import async_playwright
+from app.config import settings
+from app.services.automation_service import AutomationService
+from tests.conftest import requires_browser
+
+pytestmark = requires_browser
+
+RELABELLED_BUTTON = """
+<h3 id="title">Contact info</h3><input name="email">
+<button id="go">Next</button>
+<script>
+  document.getElementById('go').addEventListener('click', (event) => {
+    event.target.disabled = true;
+    setTimeout(() => { event.target.textContent = 'Submit application'; event.target.disabled = false; }, 100);
+  });
+</script>
+"""
+
+VALIDATION_ERROR = """
+<h3>Contact info</h3><input name="email">
+<button id="go">Next</button>
+<script>
+  document.getElementById('go').addEventListener('click', () => {
+    const error = document.createElement('p');
+    error.textContent = 'Please enter a valid email';
+    document.body.appendChild(error);
+  });
+</script>
+"""
+
+RE_RENDERED_STEP = """
+<div id="modal"><h3>Contact info</h3><input name="email"><button id="go">Next</button></div>
+<script>
+  document.getElementById('go').addEventListener('click', () => {
+    const modal = document.getElementById('modal');
+    modal.innerHTML = '';
+    setTimeout(() => { modal.innerHTML = '<h3>Work experience</h3><input name="years"><button>Next</button>'; }, 300);
+  });
+</script>
+"""
+
+
+def click_and_settle(content: str, probe: str = "() => null"):
+    """Whether _click_and_settle reported progress, and what probe saw in the page right after"""
+    async def run():
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch()
+            page = await browser.new_page()
+            await page.set_content(content)
+            settled = await AutomationService(headless=True)._click_and_settle(page, page.locator('#go'))
+            seen = await page.evaluate(probe)
+            await browser.close()
+            return settled, seen
+    
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def short_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "AUTOMATION_WAIT_TIMEOUT_MS", 1000)
+
+
+def test_button_relabelled_in_place_counts_as_progress():
+    assert click_and_settle(RELABELLED_BUTTON)[0]
+
+
+def test_validation_error_on_the_same_step_does_not():
+    assert not click_and_settle(VALIDATION_ERROR)[0]
+
+
+def test_waits_past_the_empty_moment_of_a_re_render():
+    # Settling on the emptied modal would leave the next step's fields unfilled
+    settled, fields = click_and_settle(RE_RENDERED_STEP, "() => document.querySelectorAll('input[name=years]').length")
+    assert settled
+    assert fields == 1
+
+
+def test_linkedin_fixture_applies_through_every_step(monkeypatch):
+    monkeypatch.setattr(settings, "AUTOMATION_FIXTURES", True)
+    monkeypatch.setattr(settings, "AUTOMATION_WAIT_TIMEOUT_MS", 5000)
+    user_data = {'full_name': 'Ada Lovelace', 'email': 'ada@example.com', 'phone': '555-0100'}
+    
+    async def run():
+        service = AutomationService(headless=True)
+        await service.initialize()
+        try:
+            context = await service.browser.new_context()
+            await service._setup_context(context)
+            return await service._apply_in_context(context, "https://www.linkedin.com/jobs/view/1", user_data)
+        finally:
+            await service.close()
+    
+    result = asyncio.run(run())
+    
+    assert result['success'], result
+    assert [step['step'] for step in result['steps'] if step['step'].startswith('form_step')] == [
+        'form_step_1', 'form_step_2', 'form_step_3'
+    ]
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.config import settings
+from app.services.automation_service import AutomationService, ContextPool
+from tests.conftest import requires_browser
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+    
+    async def new_context(self):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+def test_failed_setup_closes_the_context_and_frees_its_slot():
+    browser = FakeBrowser()
+    
+    async def setup(context):
+        if len(browser.contexts) == 1:
+            raise RuntimeError("route registration failed")
+    
+    async def run():
+        pool = ContextPool(browser, size=1, max_uses=5, setup=setup)
+        with pytest.raises(RuntimeError):
+            async with pool.context():
+                pass
+        # The only slot must be free again, holding a fresh context rather than the broken one
+        async with pool.context() as context:
+            return context
+    
+    context = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    
+    assert browser.contexts[0].closed
+    assert context is browser.contexts[1]
+
+
+def test_contexts_are_reused_then_replaced_after_max_uses():
+    browser = FakeBrowser()
+    
+    async def run():
+        pool = ContextPool(browser, size=1, max_uses=2)
+        used = []
+        for _ in range(3):
+            async with pool.context() as context:
+                used.append(context)
+        await pool.close()
+        return used
+    
+    used = asyncio.run(run())
+    
+    assert used == [browser.contexts[0], browser.contexts[0], browser.contexts[1]]
+    assert all(context.closed for context in browser.contexts)
+
+
+def test_pool_bounds_concurrent_borrowers():
+    browser = FakeBrowser()
+    
+    async def run():
+        pool = ContextPool(browser, size=2, max_uses=10)
+        in_use = peak = 0
+        
+        async def borrow():
+            nonlocal in_use, peak
+            async with pool.context():
+                in_use += 1
+                peak = max(peak, in_use)
+                await asyncio.sleep(0.01)
+                in_use -= 1
+        
+        await asyncio.gather(*(borrow() for _ in range(6)))
+        return peak
+    
+    assert asyncio.run(run()) == 2
+    assert len(browser.contexts) == 2
+
+
+@requires_browser
+def test_fixture_batch_applies_on_every_board(monkeypatch):
+    monkeypatch.setattr(settings, "AUTOMATION_FIXTURES", True)
+    monkeypatch.setattr(settings, "AUTOMATION_CONTEXT_MAX_USES", 2)
+    urls = [
+        "https://www.linkedin.com/jobs/view/1",
+        "https://www.indeed.com/viewjob?jk=2",
+        "https://boards.greenhouse.io/acme/jobs/3",
+        "https://careers.example.com/jobs/4",
+    ]
+    jobs = [SimpleNamespace(id=i, job_url=urls[i % len(urls)], job_board=None) for i in range(8)]
+    user_data = {'full_name': 'Ada Lovelace', 'email': 'ada@example.com', 'phone': '555-0100'}
+    
+    async def run():
+        service = AutomationService(headless=True)
+        await service.initialize()
+        try:
+            return [result async for result in service.apply_to_jobs(jobs, user_data)]
+        finally:
+            await service.close()
+    
+    results = asyncio.run(run())
+    
+    assert sorted(result['job_id'] for result in results) == list(range(8))
+    assert all(result['success'] for result in results), results
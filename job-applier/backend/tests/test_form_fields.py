@@ -0,0 +1,111 @@
+from app.services.form_fields import match_fields, score_field
+
+USER_DATA = {
+    'name': 'Ada Lovelace',
+    'email': 'ada@example.com',
+    'phone': '555-0100',
+    'location': 'London',
+    'linkedin': 'https://linkedin.com/in/ada',
+    'github': 'https://github.com/ada',
+    'portfolio': 'https://ada.dev',
+}
+
+
+def field(index: int, label: str = '', name: str = '', tag: str = 'input', **attributes) -> dict:
+    """A control as DISCOVER_FIELDS_JS reports it"""
+    return {
+        'index': index,
+        'tag': tag,
+        'type': attributes.get('type', ''),
+        'name': name,
+        'id': attributes.get('id', ''),
+        'placeholder': attributes.get('placeholder', ''),
+        'autocomplete': attributes.get('autocomplete', ''),
+        'label': label,
+    }
+
+
+def test_non_profile_fields_that_share_a_word_stay_empty():
+    fields = [
+        field(0, "Company name", name="company_name"),
+        field(1, "First name", name="first_name"),
+        field(2, "Last name", name="last_name"),
+        field(3, "Email", name="email", type='email'),
+        field(4, "Referrer email", name="referrer_email", type='email'),
+        field(5, "Why do you want to work here? Link your portfolio or GitHub if you like", name="why", tag='textarea'),
+    ]
+    user_data = {'name': 'Ada Lovelace', 'email': 'a@b.c', 'github': 'gh'}
+    
+    assert match_fields(fields, user_data) == [(1, 'Ada'), (2, 'Lovelace'), (3, 'a@b.c')]
+
+
+def test_profile_values_go_nowhere_rather_than_into_the_wrong_field():
+    fields = [
+        field(0, "Company name"),
+        field(1, "Referrer email", type='email'),
+        field(2, "Hiring manager phone", type='tel'),
+        field(3, "Company website"),
+        field(4, "Years of experience", name="experienceYears", type='number'),
+    ]
+    
+    assert match_fields(fields, USER_DATA) == []
+
+
+def test_input_types_only_take_matching_profile_fields():
+    # A typed input is never filled with a value of another kind, whatever its label says
+    assert score_field(field(0, "Phone", type='email'), 'phone') == 0
+    assert score_field(field(0, "Name", type='password'), 'name') == 0
+    assert score_field(field(0, "GitHub", type='url'), 'github') > 0
+    # and the type alone is not evidence
+    assert score_field(field(0, type='email'), 'email') == 0
+
+
+def test_textareas_need_a_strong_match():
+    assert match_fields([field(0, "GitHub", tag='textarea')], USER_DATA) == []
+    assert match_fields(
+        [field(0, "GitHub profile URL", name="github_url", id="github", tag='textarea')], USER_DATA
+    ) == [(0, 'https://github.com/ada')]
+
+
+def test_a_bare_name_needs_more_than_one_attribute():
+    assert match_fields([field(0, name="name")], {'name': 'Ada Lovelace'}) == []
+    assert match_fields([field(0, "Your name", name="name")], {'name': 'Ada Lovelace'}) == [(0, 'Ada Lovelace')]
+
+
+def test_fixture_boards_fill_their_profile_fields():
+    greenhouse = [
+        field(0, "First Name", name="job_application[first_name]", id="first_name"),
+        field(1, "Last Name", name="job_application[last_name]", id="last_name"),
+        field(2, "Email", name="job_application[email]", id="email", type='email'),
+        field(3, "Phone", name="job_application[phone]", id="phone", type='tel'),
+        field(4, "Location (City)", name="job_application[location]", id="job_application_location"),
+        field(6, "Cover Letter", name="job_application[cover_letter_text]", id="cover_letter_text", tag='textarea'),
+        field(7, "LinkedIn Profile", name="job_application[answers][0][text_value]", id="linkedin_profile"),
+        field(8, "Website", name="job_application[answers][1][text_value]", id="website"),
+        field(9, "How did you hear about this job?", name="job_application[answers][2][answer_selected_options]",
+              id="source", tag='select'),
+    ]
+    generic = [
+        field(0, "Your name", name="name", id="f-name"),
+        field(1, "E-mail", name="contact_email", id="f-mail", type='email'),
+        field(2, name="tel", id="f-phone", placeholder="Phone", type='tel'),
+        field(3, "Where are you based?", name="city", id="f-city"),
+        field(4, "GitHub URL", name="github", id="f-github"),
+        field(5, "Portfolio", name="portfolio_url", id="f-site"),
+        field(7, name="message", placeholder="Tell us about yourself", tag='textarea'),
+    ]
+    linkedin = [
+        field(0, "Full name", name="fullName", id="full-name"),
+        field(1, "Email address", name="email", id="email", type='email'),
+        field(2, "Mobile phone number", name="phoneNumber", id="phone", type='tel'),
+    ]
+    
+    assert match_fields(greenhouse, USER_DATA) == [
+        (0, 'Ada'), (1, 'Lovelace'), (2, 'ada@example.com'), (3, '555-0100'), (4, 'London'),
+        (7, 'https://linkedin.com/in/ada'), (8, 'https://ada.dev'),
+    ]
+    assert match_fields(generic, USER_DATA) == [
+        (0, 'Ada Lovelace'), (1, 'ada@example.com'), (2, '555-0100'), (3, 'London'),
+        (4, 'https://github.com/ada'), (5, 'https://ada.dev'),
+    ]
+    assert match_fields(linkedin, USER_DATA) == [(0, 'Ada Lovelace'), (1, 'ada@example.com'), (2, '555-0100')]